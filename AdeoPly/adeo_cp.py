@@ -1,14 +1,44 @@
 import sys
-from grammar import get_data_to_compiler, parser
+from grammar import get_data_to_compiler, optimize_program, parser
+from profile_data import ProfileData
 from program_error import ProgramError
 from pathlib import Path
 
 if __name__ == '__main__':
+    # Separate the compiler options from the file name
+    optimization_level = 2
+    time_passes = False
+    dump_ir = False
+    profile = None
+    file_names = []
+    args = iter(sys.argv[1:])
+    for arg in args:
+        if arg == "--profile-use":
+            profile_file_name = next(args, None)
+            if profile_file_name is None:
+                print("ERROR: The option --profile-use needs the name of the profile file.")
+                sys.exit(1)
+            try:
+                profile = ProfileData.load(profile_file_name)
+            except (OSError, ValueError, KeyError):
+                print(f"ERROR: Cannot read the profile '{profile_file_name}'.")
+                sys.exit(1)
+        elif arg in ["-O0", "-O1", "-O2"]:
+            optimization_level = int(arg[2])
+        elif arg == "--time-passes":
+            time_passes = True
+        elif arg == "--dump-ir":
+            dump_ir = True
+        elif arg.startswith("-"):
+            print(f"ERROR: Unknown option '{arg}'. Valid options are -O0, -O1, -O2, --time-passes, --dump-ir and --profile-use FILE.")
+            sys.exit(1)
+        else:
+            file_names.append(arg)
     # Check if the correct number of arguments were provided
-    if len(sys.argv) != 2:
+    if len(file_names) != 1:
         print("ERROR: Filename not added correctly.")
         sys.exit(1)
-    file_name = sys.argv[1]
+    file_name = file_names[0]
     # Check if the file has the correct extension
     if not file_name.endswith('.adeo'):
         print("ERROR: Please provide a .adeo file as input.")
@@ -21,6 +51,8 @@ if __name__ == '__main__':
             file_content = "".join(file_lines)
         # Parse file content
         if parser.parse(file_content, tracking=True) == "END":
+            # Optimize the quadruples before writing them
+            optimize_program(optimization_level, time_passes, dump_ir, profile)
             # Get data to add to the adeoobj file
             data = get_data_to_compiler()
             result = "".join(data)
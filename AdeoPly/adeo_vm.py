@@ -1,14 +1,44 @@
-import sys
+import os, sys
+from input_reader import InputReader
 from program_error import ProgramError
 from virtual_machine import VirtualMachine
 from pathlib import Path
 
 if __name__ == '__main__':
+    # Separate the virtual machine options from the file name
+    memo_size = 1024
+    workers = os.cpu_count() or 1
+    profile_file_name = None
+    input_file_name = None
+    file_names = []
+    args = iter(sys.argv[1:])
+    for arg in args:
+        if arg == "--profile-out":
+            profile_file_name = next(args, None)
+            if profile_file_name is None:
+                print("ERROR: The option --profile-out needs the name of the profile file.")
+                sys.exit(1)
+        elif arg == "--input":
+            input_file_name = next(args, None)
+            if input_file_name is None:
+                print("ERROR: The option --input needs the name of the input file.")
+                sys.exit(1)
+        elif arg == "--no-memo":
+            memo_size = 0
+        elif arg.startswith("--memo-size=") and arg.removeprefix("--memo-size=").isdigit():
+            memo_size = int(arg.removeprefix("--memo-size="))
+        elif arg.startswith("--workers=") and arg.removeprefix("--workers=").isdigit() and int(arg.removeprefix("--workers=")) > 0:
+            workers = int(arg.removeprefix("--workers="))
+        elif arg.startswith("-"):
+            print(f"ERROR: Unknown option '{arg}'. Valid options are --memo-size=N, --no-memo, --workers=N, --profile-out FILE and --input FILE.")
+            sys.exit(1)
+        else:
+            file_names.append(arg)
     # Check if the correct number of arguments were provided
-    if len(sys.argv) != 2:
+    if len(file_names) != 1:
         print("ERROR: Filename not added correctly.")
         sys.exit(1)
-    file_name = sys.argv[1]
+    file_name = file_names[0]
     # Check if the file has the correct extension
     if not file_name.endswith('.adeoobj'):
         print("ERROR: Please provide a .adeoobj file as input.")
@@ -21,8 +51,9 @@ if __name__ == '__main__':
                 print("ADEO EXECUTION ERROR")
                 print(f"{Path(file_name).name} COMPILATION_ERROR_PRESENT: Cannot perform execution because there are compilation errors that need to be fixed.")
             else:
-                virtual_machine = VirtualMachine()
-                sections = ["--Global Memory--", "--Constants--", "--Functions--", "--Quadruples--"]
+                # The input starts being read while the program runs, before its first READ
+                virtual_machine = VirtualMachine(memo_size, profile_file_name is not None, InputReader(input_file_name), workers)
+                sections = ["--Global Memory--", "--Constants--", "--Functions--", "--Data--", "--Quadruples--"]
                 section_data = {}
                 current_section = None
                 # Save all the data from the object file
@@ -42,6 +73,9 @@ if __name__ == '__main__':
                     # Display execution error
                     print("ADEO EXECUTION ERROR")
                     print(f"{Path(file_name).name} {e.error_type}: {e.description}.")
+                # Save the counts of the execution, even if it stopped with an error
+                if profile_file_name is not None:
+                    virtual_machine.get_profile().save(profile_file_name)
     except (EOFError, FileNotFoundError) as e:
         print("ERROR: Cannot find the file or directory.")
         sys.exit(1)
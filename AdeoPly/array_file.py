@@ -0,0 +1,192 @@
+import codecs, mmap, struct
+from data_helper import DataHelper
+from program_error import ProgramErrorType, raise_program_error
+
+class ArrayFile:
+    """
+    The ArrayFile class reads and writes all the elements of an array with a file in one operation.
+
+    The format depends on the extension of the file. A .bin file stores the elements in raw binary with the native
+    byte order, as 8-byte integers, 8-byte floats or 1-byte booleans, and it is read by mapping the file into memory.
+    A .npy file is read and written with NumPy when it is installed. Any other file is text, where the numbers and
+    booleans are separated by spaces or newlines and each string is on its own line with its escape sequences. The
+    elements of a 2-D array are stored row by row, and the file must have exactly as many values as the array.
+
+    Attributes:
+        binary_codes (dict): The struct format code of the elements of each type in a binary file.
+
+    Methods:
+        read(file_name: str, v_type: str, size: int) -> list:
+            Read the values of an array from a file.
+        write(file_name: str, v_type: str, values: list):
+            Write the values of an array to a file.
+        read_binary(file_name: str, v_type: str) -> list:
+            Read the values of a raw binary file by mapping it into memory.
+        read_numpy(file_name: str, v_type: str) -> list:
+            Read the values of a .npy file with NumPy.
+        read_text(file_name: str, v_type: str) -> list:
+            Read the values of a text file.
+        write_numpy(file_name: str, v_type: str, values: list):
+            Write the values to a .npy file with NumPy.
+        get_numpy() -> module:
+            Import NumPy, which is only needed for .npy files.
+    """
+
+    binary_codes = {"int": "q", "float": "d", "bool": "?"}
+
+    @staticmethod
+    def read(file_name: str, v_type: str, size: int) -> list:
+        """
+        Read the values of an array from a file.
+
+        Parameters:
+            file_name (str): The name of the file.
+            v_type (str): The type of the elements of the array.
+            size (int): The number of elements of the array.
+
+        Returns:
+            list: The values of the elements, in the order they are stored in memory.
+        """
+        try:
+            if file_name.endswith(".bin"):
+                values = ArrayFile.read_binary(file_name, v_type)
+            elif file_name.endswith(".npy"):
+                values = ArrayFile.read_numpy(file_name, v_type)
+            else:
+                values = ArrayFile.read_text(file_name, v_type)
+        except OSError:
+            raise_program_error(ProgramErrorType.FILE_ACCESS_ERROR, None, f"The file '{file_name}' cannot be read")
+        except (TypeError, ValueError):
+            raise_program_error(ProgramErrorType.INPUT_TYPE_MISMATCH, None, f"The values in the file '{file_name}' are not of type {v_type}")
+        if len(values) != size:
+            raise_program_error(ProgramErrorType.INPUT_TYPE_MISMATCH, None, f"The file '{file_name}' has {len(values)} values but the array has {size} elements")
+        return values
+
+    @staticmethod
+    def write(file_name: str, v_type: str, values: list):
+        """
+        Write the values of an array to a file.
+
+        Parameters:
+            file_name (str): The name of the file.
+            v_type (str): The type of the elements of the array.
+            values (list): The values of the elements, in the order they are stored in memory.
+        """
+        try:
+            if file_name.endswith(".bin"):
+                if v_type not in ArrayFile.binary_codes:
+                    raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, None, "An array of strings can only be written to a text file")
+                with open(file_name, "wb") as file:
+                    file.write(struct.pack(f"{len(values)}{ArrayFile.binary_codes[v_type]}", *values))
+            elif file_name.endswith(".npy"):
+                ArrayFile.write_numpy(file_name, v_type, values)
+            else:
+                if v_type == "string":
+                    lines = [DataHelper.encode_string(value) for value in values]
+                elif v_type == "bool":
+                    lines = ["true" if value else "false" for value in values]
+                else:
+                    lines = [str(value) for value in values]
+                with open(file_name, "w") as file:
+                    file.write("".join(f"{line}\n" for line in lines))
+        except OSError:
+            raise_program_error(ProgramErrorType.FILE_ACCESS_ERROR, None, f"The file '{file_name}' cannot be written")
+        except struct.error:
+            raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, None, f"The values of the array do not fit in the binary file '{file_name}'")
+
+    @staticmethod
+    def read_binary(file_name: str, v_type: str) -> list:
+        """
+        Read the values of a raw binary file by mapping it into memory.
+
+        Parameters:
+            file_name (str): The name of the file.
+            v_type (str): The type of the elements of the array.
+
+        Returns:
+            list: The values stored in the file.
+        """
+        if v_type not in ArrayFile.binary_codes:
+            raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, None, "An array of strings can only be read from a text file")
+        with open(file_name, "rb") as file:
+            # An empty file cannot be mapped
+            if file.seek(0, 2) == 0:
+                return []
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data, memoryview(data) as view:
+                return view.cast(ArrayFile.binary_codes[v_type]).tolist()
+
+    @staticmethod
+    def read_numpy(file_name: str, v_type: str) -> list:
+        """
+        Read the values of a .npy file with NumPy.
+
+        Parameters:
+            file_name (str): The name of the file.
+            v_type (str): The type of the elements of the array.
+
+        Returns:
+            list: The values stored in the file.
+        """
+        numpy = ArrayFile.get_numpy()
+        data = numpy.load(file_name, mmap_mode="r", allow_pickle=False)
+        kinds = {"int": "iu", "float": "iuf", "bool": "b", "string": "U"}
+        if data.dtype.kind not in kinds[v_type]:
+            raise ValueError(f"The file stores values of type {data.dtype}.")
+        values = data.ravel().tolist()
+        return [float(value) for value in values] if v_type == "float" else values
+
+    @staticmethod
+    def read_text(file_name: str, v_type: str) -> list:
+        """
+        Read the values of a text file.
+
+        Parameters:
+            file_name (str): The name of the file.
+            v_type (str): The type of the elements of the array.
+
+        Returns:
+            list: The values stored in the file.
+        """
+        with open(file_name, "r") as file:
+            text = file.read()
+        if v_type == "string":
+            lines = text.split("\n")
+            if lines[-1] == "":
+                lines.pop()
+            return [codecs.decode(line, "unicode_escape") for line in lines]
+        tokens = text.split()
+        if v_type == "int":
+            return [int(token) for token in tokens]
+        elif v_type == "float":
+            return [float(token) for token in tokens]
+        if any(token not in ["true", "false"] for token in tokens):
+            raise ValueError("The file stores values that are not booleans.")
+        return [token == "true" for token in tokens]
+
+    @staticmethod
+    def write_numpy(file_name: str, v_type: str, values: list):
+        """
+        Write the values to a .npy file with NumPy.
+
+        Parameters:
+            file_name (str): The name of the file.
+            v_type (str): The type of the elements of the array.
+            values (list): The values of the elements.
+        """
+        numpy = ArrayFile.get_numpy()
+        dtypes = {"int": numpy.int64, "float": numpy.float64, "bool": numpy.bool_, "string": numpy.str_}
+        numpy.save(file_name, numpy.array(values, dtype=dtypes[v_type]), allow_pickle=False)
+
+    @staticmethod
+    def get_numpy():
+        """
+        Import NumPy, which is only needed for .npy files.
+
+        Returns:
+            module: The numpy module.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, None, "NumPy must be installed to use .npy files")
+        return numpy
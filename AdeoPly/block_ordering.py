@@ -0,0 +1,91 @@
+from control_flow_graph import BasicBlock, ControlFlowGraph, ProgramFlowGraph
+from quadruples import Quad
+
+class BlockOrdering:
+    """
+    The BlockOrdering class lays out the branch of each if and else that ran more often right after the condition.
+
+    An if with an else falls into the first branch when the GOTOF does not jump, and that branch ends with a GOTO over
+    the else branch, so the path of the first branch runs one more quadruple. When the profile shows that the first
+    branch ran more often, the two branches are swapped and the jump is inverted, so the GOTO moves to the end of the
+    branch that ran less often, or disappears when that branch already ends in a jump. The blocks are only reordered,
+    so the program does the same work with fewer jumps on its common path. Without a profile nothing changes.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Swap the branches of the conditions whose first branch ran more often.
+        swap_branches(graph: ControlFlowGraph, index: int) -> bool:
+            Swap the two branches after the condition at the end of a block.
+    """
+
+    name = "layout"
+    level = 2
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Swap the branches of the conditions whose first branch ran more often.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        if not program.branch_counts:
+            return
+        for graph in program.graphs:
+            for index, block in enumerate(graph.blocks):
+                counts = program.branch_counts.get(block)
+                last_quad = block.get_last_quad()
+                # The counts only describe the jump the block had in the profiled program
+                if counts is None or last_quad is None or last_quad.operator != counts[0]:
+                    continue
+                operator, taken, executed = counts
+                if executed - taken > taken and self.swap_branches(graph, index):
+                    program.branch_counts[block] = ("GOTOT" if operator == "GOTOF" else "GOTOF", executed - taken, executed)
+            graph.compute_edges()
+
+    def swap_branches(self, graph: ControlFlowGraph, index: int) -> bool:
+        """
+        Swap the two branches after the condition at the end of a block.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+            index (int): The position of the block with the condition.
+
+        Returns:
+            bool: True or False depending on if the branches were swapped.
+        """
+        block = graph.blocks[index]
+        if block.jump_target not in graph.blocks:
+            return False
+        else_index = graph.blocks.index(block.jump_target)
+        if else_index <= index + 1:
+            return False
+        # The first branch must end with a GOTO over the else branch to the block where both branches meet
+        last_then = graph.blocks[else_index - 1]
+        table_blocks = {entry for other in graph.blocks for entry in other.switch_table}
+        if not last_then.ends_in_jump() or last_then.get_last_quad().operator != "GOTO" or last_then in table_blocks or last_then.jump_target not in graph.blocks:
+            return False
+        join_index = graph.blocks.index(last_then.jump_target)
+        if join_index <= else_index:
+            return False
+        then_blocks = graph.blocks[index + 1:else_index]
+        else_blocks = graph.blocks[else_index:join_index]
+        # The else branch now needs a GOTO to reach the block where both branches meet
+        last_else = else_blocks[-1]
+        if last_else.falls_through():
+            if last_else.ends_in_jump():
+                last_else = BasicBlock()
+                else_blocks.append(last_else)
+            last_else.quads.append(Quad("GOTO", None, None, None))
+            last_else.jump_target = graph.blocks[join_index]
+        # The first branch now falls into the block where both branches meet
+        last_then.quads.pop()
+        last_then.jump_target = None
+        jump = block.get_last_quad()
+        block.quads[-1] = Quad("GOTOT" if jump.operator == "GOTOF" else "GOTOF", jump.left_address, None, None)
+        block.jump_target = then_blocks[0]
+        graph.blocks[index + 1:join_index] = else_blocks + then_blocks
+        return True
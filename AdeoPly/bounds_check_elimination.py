@@ -0,0 +1,210 @@
+from control_flow_graph import BasicBlock, ControlFlowGraph, Loop, ProgramFlowGraph
+from induction_variable import InductionVariable
+from quad_helper import QuadHelper
+from quadruples import Quad
+
+class BoundsCheckElimination:
+    """
+    The BoundsCheckElimination class removes the VER quadruples that can never fail.
+
+    Checks on constant indexes are removed when the index is within bounds. Checks on the variable of a for loop are
+    replaced by a single range check before the loop, which chooses between a copy of the loop without those checks
+    and the original loop, so an index that goes out of bounds still raises the same error at the same point.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Remove the unnecessary bounds checks of every function.
+        remove_constant_checks(program: ProgramFlowGraph, graph: ControlFlowGraph):
+            Remove the checks on constant indexes that are within bounds.
+        find_checks(program: ProgramFlowGraph, loop: Loop, variable: InductionVariable) -> list:
+            Find the checks in a loop whose index is the loop variable plus a constant.
+        find_initial_value(program: ProgramFlowGraph, loop: Loop, variable: InductionVariable) -> int | None:
+            Find the constant value the loop variable has when the loop is entered.
+        version_loop(graph: ControlFlowGraph, loop: Loop, removed: set) -> BasicBlock:
+            Add a copy of a loop without some of its quadruples right before the original loop.
+    """
+
+    name = "bce"
+    level = 2
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Remove the unnecessary bounds checks of every function.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            self.remove_constant_checks(program, graph)
+            processed = set()
+            original = set()
+            while True:
+                # Work from the outermost loop so inner loops are only copied inside the fast versions
+                loops = [loop for loop in reversed(graph.find_loops()) if loop.header not in processed and loop.header not in original]
+                if not loops:
+                    break
+                loop = loops[0]
+                processed.add(loop.header)
+                variable = InductionVariable.find_in_loop(program, graph, loop)
+                if variable is None or [block for block in graph.blocks if block in loop.blocks][0] is not loop.header:
+                    continue
+                checks = self.find_checks(program, loop, variable)
+                if not checks:
+                    continue
+                # The loop variable goes from its initial value to one less than its end value
+                lower_lim = max(lower - offset for _, lower, _, offset in checks)
+                upper_lim = min(upper - offset for _, _, upper, offset in checks)
+                conditions = []
+                initial_value = self.find_initial_value(program, loop, variable)
+                if initial_value is None:
+                    conditions.append((">=", variable.address, lower_lim))
+                elif initial_value < lower_lim:
+                    continue
+                if QuadHelper.is_constant_address(variable.end_address):
+                    if program.constant_memory_manager[variable.end_address] > upper_lim:
+                        continue
+                else:
+                    conditions.append(("<=", variable.end_address, upper_lim))
+                removed = {quad for quad, _, _, _ in checks}
+                if not conditions:
+                    for block in loop.blocks:
+                        block.quads = [quad for quad in block.quads if quad not in removed]
+                    continue
+                # Add the range check to the preheader and jump to the original loop if it fails
+                preheader = loop.preheader
+                addresses = []
+                for operator, address, limit in conditions:
+                    result_address = program.reserve_temporal(graph, "bool")
+                    preheader.add_quad_before_exit(Quad(operator, address, program.constant_memory_manager.find_memory_address(limit), result_address))
+                    addresses.append(result_address)
+                if len(addresses) == 2:
+                    result_address = program.reserve_temporal(graph, "bool")
+                    preheader.add_quad_before_exit(Quad("&&", addresses[0], addresses[1], result_address))
+                    addresses = [result_address]
+                preheader.quads.append(Quad("GOTOF", addresses[0], None, None))
+                preheader.jump_target = loop.header
+                fast_header = self.version_loop(graph, loop, removed)
+                processed.add(fast_header)
+                original |= loop.blocks
+
+    def remove_constant_checks(self, program: ProgramFlowGraph, graph: ControlFlowGraph):
+        """
+        Remove the checks on constant indexes that are within bounds.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+        """
+        constants = program.constant_memory_manager
+        for block in graph.blocks:
+            quads = []
+            for quad in block.quads:
+                if quad.operator == "VER" and QuadHelper.is_constant_address(quad.left_address):
+                    if constants[quad.right_address] <= constants[quad.left_address] < constants[quad.return_address]:
+                        continue
+                quads.append(quad)
+            block.quads = quads
+
+    def find_checks(self, program: ProgramFlowGraph, loop: Loop, variable: InductionVariable) -> list:
+        """
+        Find the checks in a loop whose index is the loop variable plus a constant.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            loop (Loop): The loop to inspect.
+            variable (InductionVariable): The variable of the loop.
+
+        Returns:
+            list: The VER quadruples with their lower limit, upper limit and the constant added to the loop variable.
+        """
+        constants = program.constant_memory_manager
+        checks = []
+        for block in loop.blocks:
+            if block is loop.header:
+                continue
+            offsets = {variable.address: 0}
+            for quad in block.quads:
+                if quad is variable.increment_quad:
+                    break
+                if quad.operator == "VER" and quad.left_address in offsets:
+                    checks.append((quad, constants[quad.right_address], constants[quad.return_address], offsets[quad.left_address]))
+                    continue
+                address = QuadHelper.get_defined_address(quad)
+                if address is None:
+                    continue
+                offsets.pop(address, None)
+                # Indexes like i + 1 or i - 1 are computed right before the check
+                if quad.operator == "=" and quad.left_address in offsets:
+                    offsets[address] = offsets[quad.left_address]
+                elif quad.operator in ["+", "-"] and quad.left_address == variable.address and QuadHelper.is_constant_address(quad.right_address):
+                    value = constants[quad.right_address]
+                    if type(value) == int:
+                        offsets[address] = value if quad.operator == "+" else -value
+                elif quad.operator == "+" and quad.right_address == variable.address and QuadHelper.is_constant_address(quad.left_address):
+                    value = constants[quad.left_address]
+                    if type(value) == int:
+                        offsets[address] = value
+        return checks
+
+    def find_initial_value(self, program: ProgramFlowGraph, loop: Loop, variable: InductionVariable) -> int | None:
+        """
+        Find the constant value the loop variable has when the loop is entered.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            loop (Loop): The loop to inspect.
+            variable (InductionVariable): The variable of the loop.
+
+        Returns:
+            int | None: The initial value, or None if it is not a constant assigned right before the loop.
+        """
+        block = loop.preheader
+        while block is not None:
+            for quad in reversed(block.quads):
+                if QuadHelper.get_defined_address(quad) == variable.address or quad.operator == "GOSUB":
+                    if quad.operator == "=" and QuadHelper.is_constant_address(quad.left_address):
+                        return program.constant_memory_manager[quad.left_address]
+                    return None
+            # Keep looking in the block before if it can only continue into this one
+            if len(block.predecessors) != 1 or len(block.predecessors[0].successors) != 1:
+                return None
+            block = block.predecessors[0]
+            if block is loop.preheader:
+                return None
+        return None
+
+    def version_loop(self, graph: ControlFlowGraph, loop: Loop, removed: set) -> BasicBlock:
+        """
+        Add a copy of a loop without some of its quadruples right before the original loop.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+            loop (Loop): The loop to copy.
+            removed (set): The quadruples that are left out of the copy.
+
+        Returns:
+            BasicBlock: The header of the copy.
+        """
+        originals = [block for block in graph.blocks if block in loop.blocks]
+        copies = {block: BasicBlock() for block in originals}
+        layout = []
+        for block in originals:
+            copy = copies[block]
+            copy.quads = [Quad(quad.operator, quad.left_address, quad.right_address, quad.return_address) for quad in block.quads if quad not in removed]
+            if block.jump_target is not None:
+                copy.jump_target = copies.get(block.jump_target, block.jump_target)
+            layout.append(copy)
+            # The copies are laid out together, so falling into a block outside of the loop needs a jump
+            next_block = graph.get_next_block(block)
+            if block.falls_through() and next_block is not None and next_block not in loop.blocks:
+                trampoline = BasicBlock([Quad("GOTO", None, None, None)])
+                trampoline.jump_target = next_block
+                layout.append(trampoline)
+        index = graph.blocks.index(loop.preheader) + 1
+        graph.blocks[index:index] = layout
+        graph.compute_edges()
+        return copies[loop.header]
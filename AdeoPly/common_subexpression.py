@@ -0,0 +1,90 @@
+from control_flow_graph import BasicBlock, ProgramFlowGraph
+from quad_helper import QuadHelper
+from quadruples import Quad
+
+class CommonSubexpressionElimination:
+    """
+    The CommonSubexpressionElimination class reuses the result of an operation that was already computed in a block.
+
+    An operation with the same operator and operands as a previous one in the same block is replaced by an assignment
+    of the previous result, as long as none of the operands or that result were written in between.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+        commutative_operators (list): The operators whose operands can be swapped when both are numbers.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Remove the common subexpressions of every block in the program.
+        eliminate_block(program: ProgramFlowGraph, block: BasicBlock):
+            Remove the common subexpressions of a block.
+        get_key(quad: Quad) -> tuple:
+            Get the operator and operands that identify the value computed by a quadruple.
+    """
+
+    name = "cse"
+    level = 1
+    commutative_operators = ["+", "*", "==", "!="]
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Remove the common subexpressions of every block in the program.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            for block in graph.blocks:
+                self.eliminate_block(program, block)
+
+    def eliminate_block(self, program: ProgramFlowGraph, block: BasicBlock):
+        """
+        Remove the common subexpressions of a block.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            block (BasicBlock): The block to optimize.
+        """
+        operators = QuadHelper.arithmetic_operators + QuadHelper.relational_operators + QuadHelper.logical_operators
+        available = {}
+        quads = []
+        for quad in block.quads:
+            key = self.get_key(quad)
+            if quad.operator in operators and key in available and not QuadHelper.is_ptr_address(quad.return_address):
+                # The result is only the same if it is converted to the same type
+                if QuadHelper.get_type_from_address(available[key]) == QuadHelper.get_type_from_address(quad.return_address):
+                    quad = Quad("=", available[key], None, quad.return_address)
+            quads.append(quad)
+            # Forget the values whose operands or result change
+            address = QuadHelper.get_defined_address(quad)
+            # A pointer and an array element can refer to the same value
+            if QuadHelper.writes_array(quad):
+                available = {k: v for k, v in available.items() if not any(QuadHelper.is_ptr_address(a) or program.is_array_address(a) for a in k[1:] + (v,))}
+            elif program.is_array_address(address):
+                available = {k: v for k, v in available.items() if not any(QuadHelper.is_ptr_address(a) for a in k[1:])}
+            elif quad.operator == "GOSUB":
+                available = {k: v for k, v in available.items() if not any(QuadHelper.is_global_address(a) for a in k[1:] + (v,))}
+            if address is not None:
+                available = {k: v for k, v in available.items() if address not in k[1:] and address != v}
+                if quad.operator in operators and not QuadHelper.is_ptr_address(address) and address not in key[1:]:
+                    available.setdefault(key, address)
+        block.quads = quads
+
+    def get_key(self, quad: Quad) -> tuple:
+        """
+        Get the operator and operands that identify the value computed by a quadruple.
+
+        Parameters:
+            quad (Quad): The quadruple to be inspected.
+
+        Returns:
+            tuple: The operator followed by the addresses of the operands.
+        """
+        left_address = quad.left_address
+        right_address = quad.right_address
+        numbers = ["int", "float"]
+        if quad.operator in self.commutative_operators and left_address is not None and right_address is not None:
+            if QuadHelper.get_type_from_address(left_address) in numbers and QuadHelper.get_type_from_address(right_address) in numbers:
+                left_address, right_address = sorted([left_address, right_address])
+        return (quad.operator, left_address, right_address)
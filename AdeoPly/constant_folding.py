@@ -0,0 +1,259 @@
+from control_flow_graph import BasicBlock, ProgramFlowGraph
+from quad_helper import QuadHelper
+from quadruples import Quad
+
+class ConstantFolding:
+    """
+    The ConstantFolding class computes at compile time the quadruples whose operands are known constants.
+
+    Inside each block, the values assigned from constants are propagated to the quadruples that read them, operations
+    on constants are replaced by an assignment of their result and conditional jumps with a known condition become a
+    GOTO or are removed. The values are computed exactly like the virtual machine does, including the conversion to the
+    type of the address that stores them, and operations that would raise an error are left for the execution. An array
+    access whose index becomes known is read and written directly in the address of its element, without its bounds
+    check when the index is inside the array.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Fold the constants of every block in the program.
+        fold_block(program: ProgramFlowGraph, block: BasicBlock):
+            Propagate and fold the constants of a block.
+        resolve_pointers(quad: Quad, pointers: dict) -> Quad:
+            Replace the pointers whose element is known with the address of the element.
+        simplify(program: ProgramFlowGraph, quad: Quad) -> Quad:
+            Replace an operation that adds zero or multiplies by one with an assignment.
+        get_known_value(program: ProgramFlowGraph, address: int | None, known: dict) -> tuple:
+            Get the value that is stored at an address if it is known.
+        propagate(program: ProgramFlowGraph, address: int | None, known: dict) -> int | None:
+            Get the constant address that can be read instead of an address.
+        compute_value(operator: str, left_value, right_value):
+            Compute the result of an operation like the virtual machine does.
+        convert_value(value, v_type: str):
+            Convert a value to the type of the address that stores it like the virtual machine does.
+    """
+
+    name = "fold"
+    level = 1
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Fold the constants of every block in the program.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            for block in graph.blocks:
+                self.fold_block(program, block)
+            graph.compute_edges()
+
+    def fold_block(self, program: ProgramFlowGraph, block: BasicBlock):
+        """
+        Propagate and fold the constants of a block.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            block (BasicBlock): The block to fold.
+        """
+        operators = QuadHelper.arithmetic_operators + QuadHelper.relational_operators + QuadHelper.logical_operators
+        known = {}
+        pointers = {}
+        quads = []
+        for quad in block.quads:
+            quad = self.resolve_pointers(quad, pointers)
+            operator = quad.operator
+            if operator in operators:
+                quad = Quad(operator, self.propagate(program, quad.left_address, known), self.propagate(program, quad.right_address, known), quad.return_address)
+            elif operator in ["=", "PARAM", "VER"]:
+                quad = Quad(operator, self.propagate(program, quad.left_address, known), quad.right_address, quad.return_address)
+            elif operator in ["PRINT", "VARG"]:
+                quad = Quad(operator, *[self.propagate(program, address, known) for address in [quad.left_address, quad.right_address, quad.return_address]])
+            # Replace the operation with its result
+            if operator in operators and not QuadHelper.is_ptr_address(quad.return_address):
+                left_found, left_value = self.get_known_value(program, quad.left_address, known)
+                right_found, right_value = self.get_known_value(program, quad.right_address, known)
+                if left_found and right_found:
+                    try:
+                        value = self.convert_value(self.compute_value(operator, left_value, right_value), QuadHelper.get_type_from_address(quad.return_address))
+                        if value in ["true", "false"]:
+                            raise ValueError("A string with a boolean value cannot be stored as a constant")
+                        constant = ("true" if value else "false") if type(value) == bool else value
+                        quad = Quad("=", program.constant_memory_manager.find_memory_address(constant), None, quad.return_address)
+                    except (ArithmeticError, TypeError, ValueError):
+                        pass
+                else:
+                    quad = self.simplify(program, quad)
+            # Remove the bounds check of a known index inside the array
+            if operator == "VER":
+                found, value = self.get_known_value(program, quad.left_address, known)
+                lower = program.constant_memory_manager[quad.right_address]
+                upper = program.constant_memory_manager[quad.return_address]
+                if found and type(value) == int and lower <= value < upper:
+                    continue
+            # Decide the jump when its condition is known
+            if operator in ["GOTOF", "GOTOT"]:
+                found, value = self.get_known_value(program, quad.left_address, known)
+                if found:
+                    if (not value) == (operator == "GOTOF"):
+                        quads.append(Quad("GOTO", None, None, quad.return_address))
+                    else:
+                        block.jump_target = None
+                    continue
+            quads.append(quad)
+            # Update the values known after the quadruple
+            if QuadHelper.writes_array(quad):
+                known.clear()
+            elif operator == "GOSUB":
+                known = {address: value for address, value in known.items() if not QuadHelper.is_global_address(address)}
+            address = QuadHelper.get_defined_address(quad)
+            if operator == "PTR":
+                found, value = self.get_known_value(program, quad.left_address, known)
+                if found and type(value) == int:
+                    pointers[address] = value
+                else:
+                    pointers.pop(address, None)
+            elif address is not None:
+                known.pop(address, None)
+                if quad.operator == "=" and QuadHelper.is_constant_address(quad.left_address) and not QuadHelper.is_ptr_address(address):
+                    try:
+                        known[address] = self.convert_value(program.constant_memory_manager[quad.left_address], QuadHelper.get_type_from_address(address))
+                    except (TypeError, ValueError):
+                        pass
+        block.quads = quads
+
+    def resolve_pointers(self, quad: Quad, pointers: dict) -> Quad:
+        """
+        Replace the pointers whose element is known with the address of the element.
+
+        Parameters:
+            quad (Quad): The quadruple to be changed.
+            pointers (dict): A dictionary with the address of the element each pointer of the block points to.
+
+        Returns:
+            Quad: The quadruple that reads and writes the elements directly.
+        """
+        resolved = QuadHelper.replace_used_addresses(quad, pointers)
+        if QuadHelper.writes_through_ptr(quad) and quad.return_address in pointers:
+            resolved = Quad(resolved.operator, resolved.left_address, resolved.right_address, pointers[quad.return_address])
+        return resolved
+
+    def simplify(self, program: ProgramFlowGraph, quad: Quad) -> Quad:
+        """
+        Replace an operation that adds zero or multiplies by one with an assignment.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            quad (Quad): The quadruple to be simplified.
+
+        Returns:
+            Quad: The assignment of the operand that keeps its value, or the original quadruple.
+        """
+        identities = {"+": [(0, "left"), (0, "right")], "-": [(0, "right")], "*": [(1, "left"), (1, "right")]}
+        for identity, side in identities.get(quad.operator, []):
+            constant_address, address = (quad.left_address, quad.right_address) if side == "left" else (quad.right_address, quad.left_address)
+            if not QuadHelper.is_constant_address(constant_address) or QuadHelper.is_constant_address(address):
+                continue
+            value = program.constant_memory_manager[constant_address]
+            if type(value) == int and value == identity and QuadHelper.get_type_from_address(address) in ["int", "float"]:
+                return Quad("=", address, None, quad.return_address)
+        return quad
+
+    def get_known_value(self, program: ProgramFlowGraph, address: int | None, known: dict) -> tuple:
+        """
+        Get the value that is stored at an address if it is known.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            address (int | None): The address to be read.
+            known (dict): A dictionary with the values known for the addresses assigned in the block.
+
+        Returns:
+            tuple: A boolean that tells if the value is known and the value.
+        """
+        if QuadHelper.is_constant_address(address):
+            return (True, program.constant_memory_manager[address])
+        if address in known:
+            return (True, known[address])
+        return (False, None)
+
+    def propagate(self, program: ProgramFlowGraph, address: int | None, known: dict) -> int | None:
+        """
+        Get the constant address that can be read instead of an address.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            address (int | None): The address to be read.
+            known (dict): A dictionary with the values known for the addresses assigned in the block.
+
+        Returns:
+            int | None: The address of a constant with the same value, or the original address.
+        """
+        # Booleans are stored as text in constant memory, so they cannot replace a boolean address
+        if address not in known or type(known[address]) not in [int, float, str] or known[address] in ["true", "false"]:
+            return address
+        return program.constant_memory_manager.find_memory_address(known[address])
+
+    def compute_value(self, operator: str, left_value, right_value):
+        """
+        Compute the result of an operation like the virtual machine does.
+
+        Parameters:
+            operator (str): The operator of the quadruple.
+            left_value: The value of the left operand.
+            right_value: The value of the right operand.
+
+        Returns:
+            The result of the operation.
+        """
+        if left_value is None or right_value is None:
+            raise ValueError("The operands are not initialized")
+        if operator == "+":
+            return left_value + right_value
+        elif operator == "-":
+            return left_value - right_value
+        elif operator == "*":
+            return left_value * right_value
+        elif operator == "/":
+            return left_value / right_value
+        elif operator == ">":
+            return left_value > right_value
+        elif operator == ">=":
+            return left_value >= right_value
+        elif operator == "<":
+            return left_value < right_value
+        elif operator == "<=":
+            return left_value <= right_value
+        elif operator == "==":
+            return left_value == right_value
+        elif operator == "!=":
+            return left_value != right_value
+        elif operator == "||":
+            return left_value or right_value
+        elif operator == "&&":
+            return left_value and right_value
+        raise ValueError(f"The operator '{operator}' cannot be folded")
+
+    def convert_value(self, value, v_type: str):
+        """
+        Convert a value to the type of the address that stores it like the virtual machine does.
+
+        Parameters:
+            value: The value to be stored.
+            v_type (str): The type of the address.
+
+        Returns:
+            The value that ends up stored at the address.
+        """
+        if v_type == "bool":
+            return value if isinstance(value, bool) else value == "true"
+        elif v_type == "int":
+            return int(value)
+        elif v_type == "float":
+            return float(value)
+        elif v_type == "string":
+            return str(value)
+        raise ValueError(f"A value of type '{v_type}' cannot be folded")
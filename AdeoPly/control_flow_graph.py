@@ -0,0 +1,719 @@
+from function_directory import FunctionDirectory
+from memory_manager import MemoryManager, SIZE
+from profile_data import ProfileData
+from quad_helper import QuadHelper, START_FUNCTION_MEMORY
+from quadruples import Quad, Quadruples
+from typing import Callable
+
+class BasicBlock:
+    """
+    The BasicBlock class represents a sequence of quadruples that always executes from the first one to the last one.
+
+    Attributes:
+        quads (list[Quad]): The quadruples of the block.
+        jump_target (BasicBlock | None): The block the final GOTO, GOTOF or GOTOT jumps to, or None if the block does not end in a jump.
+        switch_table (list[BasicBlock]): The GOTO blocks that follow a final SWITCH, starting with the default one.
+        successors (list[BasicBlock]): The blocks that can execute right after this block.
+        predecessors (list[BasicBlock]): The blocks that can execute right before this block.
+
+    Methods:
+        __init__(quads: list[Quad] | None = None):
+            Initialize a new instance of the BasicBlock class.
+        get_last_quad() -> Quad | None:
+            Get the last quadruple of the block.
+        ends_in_jump() -> bool:
+            Check if the block ends in a GOTO, GOTOF or GOTOT.
+        falls_through() -> bool:
+            Check if execution can continue into the next block of the layout.
+        add_quad_before_exit(quad: Quad):
+            Add a quadruple at the end of the block, before its final jump.
+    """
+
+    def __init__(self, quads: list[Quad] | None = None):
+        self.quads = quads or []
+        self.jump_target = None
+        self.switch_table = []
+        self.successors = []
+        self.predecessors = []
+
+    def get_last_quad(self) -> Quad | None:
+        """
+        Get the last quadruple of the block.
+
+        Returns:
+            Quad | None: The last quadruple, or None if the block is empty.
+        """
+        return self.quads[-1] if self.quads else None
+
+    def ends_in_jump(self) -> bool:
+        """
+        Check if the block ends in a GOTO, GOTOF or GOTOT.
+
+        Returns:
+            bool: True or False depending on if the last quadruple is a jump.
+        """
+        last_quad = self.get_last_quad()
+        return last_quad is not None and QuadHelper.is_jump(last_quad)
+
+    def falls_through(self) -> bool:
+        """
+        Check if execution can continue into the next block of the layout.
+
+        Returns:
+            bool: True or False depending on if the block does not end in a GOTO, ENDFUNC or ENDPROG.
+        """
+        last_quad = self.get_last_quad()
+        return last_quad is None or (last_quad.operator != "GOTO" and not QuadHelper.is_exit(last_quad))
+
+    def add_quad_before_exit(self, quad: Quad):
+        """
+        Add a quadruple at the end of the block, before its final jump.
+
+        Parameters:
+            quad (Quad): The quadruple to add.
+        """
+        if self.ends_in_jump():
+            self.quads.insert(len(self.quads) - 1, quad)
+        else:
+            self.quads.append(quad)
+
+class Loop:
+    """
+    The Loop class represents a natural loop found from a back edge of the control flow graph.
+
+    Attributes:
+        header (BasicBlock): The block every iteration of the loop starts at.
+        blocks (set[BasicBlock]): The blocks that belong to the loop, including the header.
+        latches (list[BasicBlock]): The blocks that jump back to the header.
+        preheader (BasicBlock | None): The block that runs right before entering the loop, or None if it has not been inserted.
+
+    Methods:
+        __init__(header: BasicBlock):
+            Initialize a new instance of the Loop class.
+        get_exit_blocks() -> list[BasicBlock]:
+            Get the blocks of the loop that can jump outside of it.
+    """
+
+    def __init__(self, header: BasicBlock):
+        self.header = header
+        self.blocks = {header}
+        self.latches = []
+        self.preheader = None
+
+    def get_exit_blocks(self) -> list[BasicBlock]:
+        """
+        Get the blocks of the loop that can jump outside of it.
+
+        Returns:
+            list[BasicBlock]: The blocks with at least one successor outside of the loop.
+        """
+        return [block for block in self.blocks if any(successor not in self.blocks for successor in block.successors)]
+
+class ControlFlowGraph:
+    """
+    The ControlFlowGraph class represents the basic blocks of a function and the edges between them.
+
+    Attributes:
+        name (str): The name of the function.
+        blocks (list[BasicBlock]): The blocks of the function in layout order, starting with the entry block.
+        dominators (dict): A dictionary with the set of blocks that dominate each reachable block.
+
+    Methods:
+        __init__(name: str, blocks: list[BasicBlock]):
+            Initialize a new instance of the ControlFlowGraph class.
+        get_entry_block() -> BasicBlock:
+            Get the block where the function starts.
+        get_next_block(block: BasicBlock) -> BasicBlock | None:
+            Get the block that follows another one in the layout.
+        compute_edges():
+            Compute the successors and predecessors of every block.
+        get_reachable_blocks() -> list[BasicBlock]:
+            Get the blocks that can be reached from the entry block, in layout order.
+        compute_dominators():
+            Compute the set of dominators of every reachable block.
+        dominates(dominator: BasicBlock, block: BasicBlock) -> bool:
+            Check if every path from the entry block to a block goes through another block.
+        find_loops() -> list[Loop]:
+            Find the natural loops of the function, ordered from the innermost to the outermost.
+        insert_preheader(loop: Loop) -> BasicBlock:
+            Make sure the loop has a single block that runs right before entering it.
+        compute_initialized_addresses(initial_addresses: set[int], get_assigned_address: Callable) -> dict:
+            Compute the addresses that are assigned on every path to the start of each block.
+        compute_live_addresses() -> dict:
+            Compute the addresses whose value can still be read after each block.
+    """
+
+    def __init__(self, name: str, blocks: list[BasicBlock]):
+        self.name = name
+        self.blocks = blocks
+        self.dominators = {}
+        self.compute_edges()
+
+    def get_entry_block(self) -> BasicBlock:
+        """
+        Get the block where the function starts.
+
+        Returns:
+            BasicBlock: The first block in the layout.
+        """
+        return self.blocks[0]
+
+    def get_next_block(self, block: BasicBlock) -> BasicBlock | None:
+        """
+        Get the block that follows another one in the layout.
+
+        Parameters:
+            block (BasicBlock): The block to look after.
+
+        Returns:
+            BasicBlock | None: The next block, or None if the block is the last one of the function.
+        """
+        index = self.blocks.index(block)
+        return self.blocks[index + 1] if index + 1 < len(self.blocks) else None
+
+    def compute_edges(self):
+        """
+        Compute the successors and predecessors of every block.
+        """
+        for block in self.blocks:
+            block.successors = []
+            block.predecessors = []
+        for i, block in enumerate(self.blocks):
+            successors = []
+            # A SWITCH continues into one of the GOTO blocks of its table
+            if block.switch_table:
+                successors.extend(block.switch_table)
+            elif block.falls_through() and i + 1 < len(self.blocks):
+                successors.append(self.blocks[i + 1])
+            # Jumps into another function are left out of the graph
+            if block.jump_target is not None and block.jump_target in self.blocks and block.jump_target not in successors:
+                successors.append(block.jump_target)
+            block.successors = successors
+            for successor in successors:
+                successor.predecessors.append(block)
+
+    def get_reachable_blocks(self) -> list[BasicBlock]:
+        """
+        Get the blocks that can be reached from the entry block, in layout order.
+
+        Returns:
+            list[BasicBlock]: The reachable blocks.
+        """
+        visited = set()
+        pending = [self.get_entry_block()]
+        while pending:
+            block = pending.pop()
+            if block not in visited:
+                visited.add(block)
+                pending.extend(block.successors)
+        return [block for block in self.blocks if block in visited]
+
+    def compute_dominators(self):
+        """
+        Compute the set of dominators of every reachable block.
+        """
+        reachable = self.get_reachable_blocks()
+        entry = self.get_entry_block()
+        self.dominators = {block: set(reachable) for block in reachable}
+        self.dominators[entry] = {entry}
+        changed = True
+        while changed:
+            changed = False
+            for block in reachable:
+                if block == entry:
+                    continue
+                predecessors = [self.dominators[p] for p in block.predecessors if p in self.dominators]
+                new_dominators = set.intersection(*predecessors) | {block} if predecessors else {block}
+                if new_dominators != self.dominators[block]:
+                    self.dominators[block] = new_dominators
+                    changed = True
+
+    def dominates(self, dominator: BasicBlock, block: BasicBlock) -> bool:
+        """
+        Check if every path from the entry block to a block goes through another block.
+
+        Parameters:
+            dominator (BasicBlock): The block that might dominate.
+            block (BasicBlock): The block that might be dominated.
+
+        Returns:
+            bool: True or False depending on if the first block dominates the second one.
+        """
+        return dominator in self.dominators.get(block, set())
+
+    def find_loops(self) -> list[Loop]:
+        """
+        Find the natural loops of the function, ordered from the innermost to the outermost.
+
+        Returns:
+            list[Loop]: The loops of the function, where back edges to the same header share a loop.
+        """
+        self.compute_dominators()
+        loops = {}
+        for block in self.dominators:
+            for successor in block.successors:
+                # A back edge goes to a block that dominates its source
+                if not self.dominates(successor, block):
+                    continue
+                loop = loops.setdefault(successor, Loop(successor))
+                loop.latches.append(block)
+                pending = [block]
+                while pending:
+                    member = pending.pop()
+                    if member not in loop.blocks:
+                        loop.blocks.add(member)
+                        pending.extend(p for p in member.predecessors if p in self.dominators)
+        return sorted(loops.values(), key=lambda loop: len(loop.blocks))
+
+    def insert_preheader(self, loop: Loop) -> BasicBlock:
+        """
+        Make sure the loop has a single block that runs right before entering it.
+
+        Parameters:
+            loop (Loop): The loop that needs a preheader.
+
+        Returns:
+            BasicBlock: The preheader of the loop.
+        """
+        header = loop.header
+        entries = [p for p in header.predecessors if p not in loop.blocks]
+        index = self.blocks.index(header)
+        previous = self.blocks[index - 1] if index > 0 else None
+        # Reuse the block before the loop if it can only continue into the header
+        if len(entries) == 1 and entries[0] is previous and previous.successors == [header] and not previous.ends_in_jump():
+            loop.preheader = previous
+            return previous
+        preheader = BasicBlock()
+        # A block of the loop that fell into the header now needs to jump to it
+        if previous is not None and previous in loop.blocks and previous.falls_through():
+            trampoline = BasicBlock([Quad("GOTO", None, None, None)])
+            trampoline.jump_target = header
+            self.blocks.insert(index, trampoline)
+            index += 1
+        self.blocks.insert(index, preheader)
+        for entry in entries:
+            if entry.jump_target is header:
+                entry.jump_target = preheader
+        self.compute_edges()
+        loop.preheader = preheader
+        return preheader
+
+    def compute_initialized_addresses(self, initial_addresses: set[int], get_assigned_address: Callable = QuadHelper.get_defined_address) -> dict:
+        """
+        Compute the addresses that are assigned on every path to the start of each block.
+
+        Parameters:
+            initial_addresses (set[int]): The addresses that already have a value when the function starts.
+            get_assigned_address (Callable): A function that gets the address a quadruple leaves with a value.
+
+        Returns:
+            dict: A dictionary with the set of initialized addresses at the start of each reachable block.
+        """
+        reachable = self.get_reachable_blocks()
+        entry = self.get_entry_block()
+        block_defs = {}
+        for block in reachable:
+            block_defs[block] = {get_assigned_address(quad) for quad in block.quads} - {None}
+        initialized_in = {block: None for block in reachable}
+        initialized_in[entry] = set(initial_addresses)
+        changed = True
+        while changed:
+            changed = False
+            for block in reachable:
+                if block == entry:
+                    continue
+                # Only predecessors that were already visited restrict the set
+                outs = [initialized_in[p] | block_defs[p] for p in block.predecessors if p in initialized_in and initialized_in[p] is not None]
+                new_in = set.intersection(*outs) if outs else None
+                if new_in != initialized_in[block]:
+                    initialized_in[block] = new_in
+                    changed = True
+        return {block: addresses or set() for block, addresses in initialized_in.items()}
+
+    def compute_live_addresses(self) -> dict:
+        """
+        Compute the addresses whose value can still be read after each block.
+
+        Returns:
+            dict: A dictionary with the set of live addresses at the end of each block.
+        """
+        block_uses = {}
+        block_defs = {}
+        for block in self.blocks:
+            uses = set()
+            defs = set()
+            for quad in block.quads:
+                uses |= set(QuadHelper.get_used_addresses(quad)) - defs
+                address = QuadHelper.get_defined_address(quad)
+                if address is not None:
+                    defs.add(address)
+            block_uses[block] = uses
+            block_defs[block] = defs
+        live_in = {block: set() for block in self.blocks}
+        live_out = {block: set() for block in self.blocks}
+        changed = True
+        while changed:
+            changed = False
+            for block in reversed(self.blocks):
+                live_out[block] = set().union(*(live_in[successor] for successor in block.successors))
+                new_in = block_uses[block] | (live_out[block] - block_defs[block])
+                if new_in != live_in[block]:
+                    live_in[block] = new_in
+                    changed = True
+        return live_out
+
+class ProgramFlowGraph:
+    """
+    The ProgramFlowGraph class holds the control flow graph of every function of a compiled program.
+
+    Attributes:
+        prologue (list[Quad]): The quadruples that run before main is called.
+        graphs (list[ControlFlowGraph]): The control flow graphs of the functions in layout order.
+        function_directory (FunctionDirectory): The function directory of the program.
+        global_memory_manager (MemoryManager): The memory manager for the global memory, which stores the names of the functions.
+        constant_memory_manager (MemoryManager): The memory manager for the constants, which stores the jump targets.
+        written_globals (dict | None): A dictionary with the global addresses each function can write, or None if it has not been computed.
+        returned_globals (dict | None): A dictionary with the return address of each function that assigns it on every path, or None if it has not been computed.
+        array_addresses (set[int]): The addresses of the elements of every array, which can also be reached through a pointer.
+        profile (ProfileData | None): The execution counts of a previous run of the program, or None if there are none.
+        branch_counts (dict): A dictionary with the operator, number of jumps and number of executions of the final jump of the blocks the profile matches.
+
+    Methods:
+        __init__(quadruples: Quadruples, function_directory: FunctionDirectory, global_memory_manager: MemoryManager, constant_memory_manager: MemoryManager, profile: ProfileData | None):
+            Initialize a new instance of the ProgramFlowGraph class by splitting the quadruples into basic blocks.
+        get_graph(f_name: str) -> ControlFlowGraph:
+            Get the control flow graph of a function.
+        get_initial_addresses(graph: ControlFlowGraph) -> set[int]:
+            Get the addresses that already have a value when a function starts.
+        get_function_name(address: int) -> str | None:
+            Get the name of the function whose name is stored at an address.
+        is_array_address(address: int | None) -> bool:
+            Check if an address is an element of an array that a pointer can also reach.
+        get_written_globals(f_name: str) -> set[int]:
+            Get the global addresses that a function or the functions it calls can write.
+        get_returned_globals() -> dict:
+            Get the return address of each function that assigns it on every path to its end.
+        get_assigned_address(quad: Quad) -> int | None:
+            Get the address a quadruple leaves with a value, including the return value of a call.
+        compute_initialized_addresses(graph: ControlFlowGraph) -> dict:
+            Compute the addresses that are assigned on every path to the start of each block of a function.
+        get_loop_call_writes(loop: Loop) -> set[int]:
+            Get the global addresses that the functions called inside a loop can write.
+        get_loop_writes(loop: Loop) -> set[int]:
+            Get the addresses that can be written while a loop runs.
+        reserve_temporal(graph: ControlFlowGraph, v_type: str) -> int:
+            Reserve a new temporal address in a function and update its resources.
+        copy_branch_counts(originals: list[BasicBlock], copies: list[BasicBlock]):
+            Give the copies of some blocks the branch counts of the blocks they were copied from.
+        to_quadruples() -> list[Quad]:
+            Lay out the blocks of every function and update the jump targets and function start quadruples.
+        print(title: str):
+            Print the basic blocks of every function with their successors.
+    """
+
+    def __init__(self, quadruples: Quadruples, function_directory: FunctionDirectory, global_memory_manager: MemoryManager, constant_memory_manager: MemoryManager, profile: ProfileData | None = None):
+        self.function_directory = function_directory
+        self.global_memory_manager = global_memory_manager
+        self.constant_memory_manager = constant_memory_manager
+        self.written_globals = None
+        self.returned_globals = None
+        self.array_addresses = {address for start, size in function_directory.arrays for address in range(start, start + size)}
+        self.profile = profile
+        self.branch_counts = {}
+        quads = quadruples.quadruples
+        functions = sorted(function_directory.functions.values(), key=lambda function: function.initial_quad_address)
+        starts = [function.initial_quad_address for function in functions]
+        self.prologue = quads[:starts[0]] if starts else list(quads)
+        # Find the quadruples where a block starts
+        leaders = set(starts)
+        for i, quad in enumerate(quads):
+            if QuadHelper.is_jump(quad):
+                leaders.add(self.constant_memory_manager[quad.return_address])
+            if QuadHelper.is_jump(quad) or QuadHelper.is_exit(quad):
+                leaders.add(i + 1)
+        block_at = {}
+        self.graphs = []
+        for function, start, end in zip(functions, starts, starts[1:] + [len(quads)]):
+            blocks = []
+            for i in range(start, end):
+                if i in leaders or not blocks:
+                    blocks.append(BasicBlock())
+                    block_at[i] = blocks[-1]
+                blocks[-1].quads.append(quads[i])
+            self.graphs.append((function.name, blocks))
+        # Link the jumps to the blocks they go to
+        for _, blocks in self.graphs:
+            for block in blocks:
+                if block.ends_in_jump():
+                    target = self.constant_memory_manager[block.get_last_quad().return_address]
+                    block.jump_target = block_at.get(target)
+        # The counts of the conditional jumps belong to the blocks that end in them, in the same order
+        if profile is not None:
+            for function, start, end in zip(functions, starts, starts[1:] + [len(quads)]):
+                signature = ProfileData.get_signature(quads[start:end], start, lambda quad: self.constant_memory_manager[quad.return_address])
+                branches = profile.get_branches(function.name, signature)
+                if branches is not None:
+                    blocks = [block for name, blocks in self.graphs if name == function.name for block in blocks if block.get_last_quad().operator in ["GOTOF", "GOTOT"]]
+                    self.branch_counts.update({block: tuple(branch) for block, branch in zip(blocks, branches)})
+        self.graphs = [ControlFlowGraph(name, blocks) for name, blocks in self.graphs]
+
+    def get_graph(self, f_name: str) -> ControlFlowGraph:
+        """
+        Get the control flow graph of a function.
+
+        Parameters:
+            f_name (str): The name of the function.
+
+        Returns:
+            ControlFlowGraph: The control flow graph of the function.
+        """
+        for graph in self.graphs:
+            if graph.name == f_name:
+                return graph
+        raise Exception(f"The control flow graph for function '{f_name}' does not exist.")
+
+    def get_initial_addresses(self, graph: ControlFlowGraph) -> set[int]:
+        """
+        Get the addresses that already have a value when a function starts.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+
+        Returns:
+            set[int]: The addresses of the parameters of the function and of the array elements it declares with an initial value.
+        """
+        function = self.function_directory.get_function_from_directory(graph.name)
+        return {param.address for param in function.parameters} | set(function.data)
+
+    def get_function_name(self, address: int) -> str | None:
+        """
+        Get the name of the function whose name is stored at an address.
+
+        Parameters:
+            address (int): The address used by the ERA and GOSUB quadruples.
+
+        Returns:
+            str | None: The name of the function, or None if no function uses that address.
+        """
+        for function in self.function_directory.functions.values():
+            if function.address == address:
+                return function.name
+        return None
+
+    def is_array_address(self, address: int | None) -> bool:
+        """
+        Check if an address is an element of an array that a pointer can also reach.
+
+        Parameters:
+            address (int | None): The address to be checked.
+
+        Returns:
+            bool: True or False depending on if the address belongs to an array of any function or to a global array.
+        """
+        return address in self.array_addresses
+
+    def get_written_globals(self, f_name: str) -> set[int]:
+        """
+        Get the global addresses that a function or the functions it calls can write.
+
+        Parameters:
+            f_name (str): The name of the function.
+
+        Returns:
+            set[int]: The global addresses the function can write, including return values.
+        """
+        if self.written_globals is None:
+            direct = {}
+            calls = {}
+            for graph in self.graphs:
+                direct[graph.name] = set()
+                calls[graph.name] = set()
+                for block in graph.blocks:
+                    for quad in block.quads:
+                        address = QuadHelper.get_defined_address(quad)
+                        if QuadHelper.is_global_address(address):
+                            direct[graph.name].add(address)
+                        # A pointer or a file can store a value in any element of a global array
+                        if QuadHelper.writes_array(quad):
+                            direct[graph.name] |= {element for element in self.array_addresses if QuadHelper.is_global_address(element)}
+                        if quad.operator in ["GOSUB", "TAILCALL"]:
+                            calls[graph.name].add(self.get_function_name(quad.return_address))
+            # Add the writes of the called functions until nothing changes
+            changed = True
+            while changed:
+                changed = False
+                for name in direct:
+                    for callee in calls[name]:
+                        if callee in direct and not direct[callee] <= direct[name]:
+                            direct[name] |= direct[callee]
+                            changed = True
+            self.written_globals = direct
+        return self.written_globals.get(f_name, set())
+
+    def get_returned_globals(self) -> dict:
+        """
+        Get the return address of each function that assigns it on every path to its end.
+
+        Returns:
+            dict: A dictionary with the return address for the name of each function that always returns a value.
+        """
+        if self.returned_globals is None:
+            self.returned_globals = {}
+            # A function can rely on the calls that were already found to return a value
+            changed = True
+            while changed:
+                changed = False
+                for graph in self.graphs:
+                    function = self.function_directory.get_function_from_directory(graph.name)
+                    if graph.name in self.returned_globals or function.return_type == "void":
+                        continue
+                    initialized_in = self.compute_initialized_addresses(graph)
+                    returns = True
+                    for block in graph.get_reachable_blocks():
+                        last_quad = block.get_last_quad()
+                        if last_quad is not None and QuadHelper.is_exit(last_quad):
+                            assigned = initialized_in[block] | {self.get_assigned_address(quad) for quad in block.quads}
+                            returns = returns and function.return_address in assigned
+                    if returns:
+                        self.returned_globals[graph.name] = function.return_address
+                        changed = True
+        return self.returned_globals
+
+    def get_assigned_address(self, quad: Quad) -> int | None:
+        """
+        Get the address a quadruple leaves with a value, including the return value of a call.
+
+        Parameters:
+            quad (Quad): The quadruple to be inspected.
+
+        Returns:
+            int | None: The address written by the quadruple or the return address of the called function, or None if there is none.
+        """
+        if quad.operator in ["GOSUB", "TAILCALL"]:
+            return self.get_returned_globals().get(self.get_function_name(quad.return_address))
+        return QuadHelper.get_defined_address(quad)
+
+    def compute_initialized_addresses(self, graph: ControlFlowGraph) -> dict:
+        """
+        Compute the addresses that are assigned on every path to the start of each block of a function.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+
+        Returns:
+            dict: A dictionary with the set of initialized addresses at the start of each reachable block.
+        """
+        return graph.compute_initialized_addresses(self.get_initial_addresses(graph), self.get_assigned_address)
+
+    def get_loop_call_writes(self, loop: Loop) -> set[int]:
+        """
+        Get the global addresses that the functions called inside a loop can write.
+
+        Parameters:
+            loop (Loop): The loop to inspect.
+
+        Returns:
+            set[int]: The global addresses written by the called functions.
+        """
+        written = set()
+        for block in loop.blocks:
+            for quad in block.quads:
+                if quad.operator == "GOSUB":
+                    written |= self.get_written_globals(self.get_function_name(quad.return_address))
+        return written
+
+    def get_loop_writes(self, loop: Loop) -> set[int]:
+        """
+        Get the addresses that can be written while a loop runs.
+
+        Parameters:
+            loop (Loop): The loop to inspect.
+
+        Returns:
+            set[int]: The addresses written by the quadruples of the loop or by the functions it calls.
+        """
+        written = {QuadHelper.get_defined_address(quad) for block in loop.blocks for quad in block.quads} - {None}
+        if any(QuadHelper.writes_array(quad) for block in loop.blocks for quad in block.quads):
+            written |= self.array_addresses
+        return written | self.get_loop_call_writes(loop)
+
+    def reserve_temporal(self, graph: ControlFlowGraph, v_type: str) -> int:
+        """
+        Reserve a new temporal address in a function and update its resources.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+            v_type (str): The type of the temporal.
+
+        Returns:
+            int: The address of the new temporal.
+        """
+        function = self.function_directory.get_function_from_directory(graph.name)
+        index = ["int", "float", "string", "bool", "ptr"].index(v_type)
+        resources = list(function.resources)
+        if resources[index] >= SIZE:
+            raise Exception("Maximum space for this type was exceeded.")
+        address = START_FUNCTION_MEMORY + SIZE * index + resources[index]
+        resources[index] += 1
+        function.resources = tuple(resources)
+        return address
+
+    def copy_branch_counts(self, originals: list[BasicBlock], copies: list[BasicBlock]):
+        """
+        Give the copies of some blocks the branch counts of the blocks they were copied from.
+
+        Parameters:
+            originals (list[BasicBlock]): The blocks that were copied.
+            copies (list[BasicBlock]): The copy of each block, in the same order.
+        """
+        for original, copy in zip(originals, copies):
+            if original in self.branch_counts:
+                self.branch_counts[copy] = self.branch_counts[original]
+
+    def to_quadruples(self) -> list[Quad]:
+        """
+        Lay out the blocks of every function and update the jump targets and function start quadruples.
+
+        Returns:
+            list[Quad]: The quadruples of the whole program.
+        """
+        block_start = {}
+        instr_ptr = len(self.prologue)
+        for graph in self.graphs:
+            function = self.function_directory.get_function_from_directory(graph.name)
+            function.initial_quad_address = instr_ptr
+            for block in graph.blocks:
+                block_start[block] = instr_ptr
+                instr_ptr += len(block.quads)
+        quads = list(self.prologue)
+        for graph in self.graphs:
+            for block in graph.blocks:
+                # Point the jump to the new position of its target block
+                if block.ends_in_jump() and block.jump_target is not None:
+                    quad = block.get_last_quad()
+                    instr_address = self.constant_memory_manager.find_memory_address(block_start[block.jump_target])
+                    block.quads[-1] = Quad(quad.operator, quad.left_address, None, instr_address)
+                quads.extend(block.quads)
+        return quads
+
+    def print(self, title: str):
+        """
+        Print the basic blocks of every function with their successors.
+
+        Parameters:
+            title (str): The title printed before the blocks.
+        """
+        print(f"\n--{title}--")
+        for graph in self.graphs:
+            print(f"Function: {graph.name}")
+            names = {block: f"B{i}" for i, block in enumerate(graph.blocks)}
+            for block in graph.blocks:
+                successors = ",".join(names[successor] for successor in block.successors if successor in names)
+                print(f"  {names[block]} -> [{successors}]")
+                for quad in block.quads:
+                    # Jumps show the block they go to, since the final quadruple numbers are not known yet
+                    if quad is block.get_last_quad() and block.jump_target in names:
+                        print(f"    ({quad.operator},{quad.left_address},{quad.right_address},{names[block.jump_target]})")
+                    else:
+                        print(f"    {quad}")
+        print()
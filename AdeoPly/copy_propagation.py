@@ -0,0 +1,153 @@
+from control_flow_graph import BasicBlock, ControlFlowGraph, ProgramFlowGraph
+from quad_helper import QuadHelper
+from quadruples import Quad
+
+class CopyPropagation:
+    """
+    The CopyPropagation class removes the assignments that only copy a value from one address to another.
+
+    Inside each block, the quadruples that read the copy of a value read the original address instead, while neither
+    of them changes. A value that is computed into a temporal and then only copied to its final address, like the
+    return value of a call or the result of an expression assigned to a variable, is computed in that address instead.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Propagate and coalesce the copies of every function.
+        propagate_block(program: ProgramFlowGraph, block: BasicBlock):
+            Make the quadruples of a block read the original address of the copies.
+        coalesce_block(program: ProgramFlowGraph, graph: ControlFlowGraph, block: BasicBlock, live_out: set[int], use_count: dict) -> bool:
+            Compute a value in its final address instead of a temporal that is copied.
+        check_can_coalesce(program: ProgramFlowGraph, quads: list[Quad], definition: int, copy: int, live_out: set[int], use_count: dict) -> bool:
+            Check if a quadruple can write its result in the address its result is copied to.
+    """
+
+    name = "copy"
+    level = 1
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Propagate and coalesce the copies of every function.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            for block in graph.blocks:
+                self.propagate_block(program, block)
+        # Count the reads of every address in the program to know which global temporals are only copied
+        use_count = {}
+        for graph in program.graphs:
+            for quad in [quad for block in graph.blocks for quad in block.quads] + program.prologue:
+                for address in QuadHelper.get_used_addresses(quad):
+                    use_count[address] = use_count.get(address, 0) + 1
+        for graph in program.graphs:
+            live_out = graph.compute_live_addresses()
+            for block in graph.blocks:
+                while self.coalesce_block(program, graph, block, live_out.get(block, set()), use_count):
+                    pass
+
+    def propagate_block(self, program: ProgramFlowGraph, block: BasicBlock):
+        """
+        Make the quadruples of a block read the original address of the copies.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            block (BasicBlock): The block to optimize.
+        """
+        copies = {}
+        quads = []
+        for quad in block.quads:
+            quad = QuadHelper.replace_used_addresses(quad, copies)
+            quads.append(quad)
+            # Forget the copies whose original or copy changes
+            address = QuadHelper.get_defined_address(quad)
+            if quad.operator == "GOSUB":
+                copies = {copy: original for copy, original in copies.items() if not QuadHelper.is_global_address(copy) and not QuadHelper.is_global_address(original)}
+            elif QuadHelper.writes_array(quad):
+                copies = {copy: original for copy, original in copies.items() if not program.is_array_address(copy) and not program.is_array_address(original)}
+            if address is not None:
+                copies = {copy: original for copy, original in copies.items() if address not in [copy, original]}
+                # Reading the original is only the same when both addresses store the same type
+                left_address = quad.left_address
+                if (quad.operator == "=" and left_address != address and not QuadHelper.is_constant_address(left_address) and
+                        not QuadHelper.is_ptr_address(left_address) and not QuadHelper.is_ptr_address(address) and
+                        QuadHelper.get_type_from_address(left_address) == QuadHelper.get_type_from_address(address)):
+                    copies[address] = left_address
+        block.quads = quads
+
+    def coalesce_block(self, program: ProgramFlowGraph, graph: ControlFlowGraph, block: BasicBlock, live_out: set[int], use_count: dict) -> bool:
+        """
+        Compute a value in its final address instead of a temporal that is copied.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+            block (BasicBlock): The block to optimize.
+            live_out (set[int]): The addresses that can be read after the block.
+            use_count (dict): A dictionary with the number of quadruples that read each address in the program.
+
+        Returns:
+            bool: True or False depending on if a copy was removed.
+        """
+        quads = block.quads
+        for copy, quad in enumerate(quads):
+            if quad.operator != "=":
+                continue
+            for definition in range(copy - 1, -1, -1):
+                if QuadHelper.get_defined_address(quads[definition]) == quad.left_address:
+                    if self.check_can_coalesce(program, quads, definition, copy, live_out, use_count):
+                        original = quads[definition]
+                        quads[definition] = Quad(original.operator, original.left_address, original.right_address, quad.return_address)
+                        del quads[copy]
+                        return True
+                    break
+        return False
+
+    def check_can_coalesce(self, program: ProgramFlowGraph, quads: list[Quad], definition: int, copy: int, live_out: set[int], use_count: dict) -> bool:
+        """
+        Check if a quadruple can write its result in the address its result is copied to.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            quads (list[Quad]): The quadruples of the block.
+            definition (int): The position of the quadruple that computes the value.
+            copy (int): The position of the assignment that copies the value.
+            live_out (set[int]): The addresses that can be read after the block.
+            use_count (dict): A dictionary with the number of quadruples that read each address in the program.
+
+        Returns:
+            bool: True or False depending on if the temporal is only read by the copy and the final address is not used in between.
+        """
+        operators = QuadHelper.arithmetic_operators + QuadHelper.relational_operators + QuadHelper.logical_operators + ["="]
+        original = quads[definition]
+        temporal = original.return_address
+        target = quads[copy].return_address
+        if original.operator not in operators or temporal == target or QuadHelper.is_ptr_address(temporal) or program.is_array_address(temporal):
+            return False
+        # The temporal must not be read anywhere else
+        if QuadHelper.is_global_address(temporal):
+            if use_count.get(temporal, 0) != 1:
+                return False
+        elif not QuadHelper.is_local_address(temporal) or temporal in live_out or any(temporal in QuadHelper.get_used_addresses(quad) for quad in quads[copy + 1:]):
+            return False
+        # Storing the value directly must convert it to the same type
+        if QuadHelper.is_ptr_address(target):
+            source = original.left_address
+            if original.operator != "=" or QuadHelper.is_ptr_address(source) or QuadHelper.get_type_from_address(source) != QuadHelper.get_type_from_address(temporal):
+                return False
+        elif QuadHelper.get_type_from_address(target) != QuadHelper.get_type_from_address(temporal):
+            return False
+        for quad in quads[definition + 1:copy]:
+            used = QuadHelper.get_used_addresses(quad)
+            if temporal in used or target in used or QuadHelper.get_defined_address(quad) == target:
+                return False
+            if quad.operator == "GOSUB" and QuadHelper.is_global_address(target):
+                return False
+            # An array element can be read or written through any pointer or by an operation on the whole array
+            if (QuadHelper.is_ptr_address(target) or program.is_array_address(target)) and (QuadHelper.writes_through_ptr(quad) or quad.operator in QuadHelper.array_operators + QuadHelper.vector_operators or any(QuadHelper.is_ptr_address(address) for address in used)):
+                return False
+        return True
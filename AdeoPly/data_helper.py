@@ -1,3 +1,4 @@
+import codecs
 from variable_table import Variable
 from typing import Tuple
 
@@ -14,6 +15,8 @@ class DataHelper:
             Get the simple type string representation of a value.
         change_to_type(v_type: str, value: str):
             Convert the value to the specified data type.
+        encode_string(value: str) -> str:
+            Get the text of a string with its special characters written as escape sequences.
     """
 
     @staticmethod
@@ -89,11 +92,25 @@ class DataHelper:
         elif v_type == 'string':
             if value.startswith('"') and value.endswith('"'):
                 value = value[1:-1]
-            return value if value != 'None' else None
+            # The escape sequences are decoded once, when the object file is read
+            return codecs.decode(value, "unicode_escape") if value != 'None' else None
         else:
             if value == "true":
                 return "true"
             elif value == "false":
                 return "false"
             else:
-                return None
\ No newline at end of file
+                return None
+
+    @staticmethod
+    def encode_string(value: str) -> str:
+        """
+        Get the text of a string with its special characters written as escape sequences.
+
+        Parameters:
+            value (str): The string as the virtual machine stores it.
+
+        Returns:
+            str: The string as it is written in the source and the object file.
+        """
+        return value.encode("unicode_escape").decode("ascii")
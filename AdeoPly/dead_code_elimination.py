@@ -0,0 +1,123 @@
+from control_flow_graph import ControlFlowGraph, ProgramFlowGraph
+from quad_helper import QuadHelper
+
+class DeadCodeElimination:
+    """
+    The DeadCodeElimination class removes the quadruples that have no effect on the execution of a program.
+
+    Blocks that can never be reached, jumps to the block that follows them and quadruples whose result is never read
+    are removed. A quadruple is only removed when it cannot raise an error, so reading an uninitialized variable or
+    dividing by zero still stops the program.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Remove the dead code of every function.
+        remove_unreachable_blocks(graph: ControlFlowGraph) -> bool:
+            Remove the blocks that cannot be reached from the start of a function.
+        remove_useless_jumps(graph: ControlFlowGraph) -> bool:
+            Remove the GOTO quadruples that jump to the next block.
+        remove_dead_quads(program: ProgramFlowGraph, graph: ControlFlowGraph) -> bool:
+            Remove the quadruples whose result is never read.
+    """
+
+    name = "dce"
+    level = 1
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Remove the dead code of every function.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            changed = True
+            while changed:
+                changed = self.remove_unreachable_blocks(graph)
+                changed = self.remove_useless_jumps(graph) or changed
+                changed = self.remove_dead_quads(program, graph) or changed
+
+    def remove_unreachable_blocks(self, graph: ControlFlowGraph) -> bool:
+        """
+        Remove the blocks that cannot be reached from the start of a function.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+
+        Returns:
+            bool: True or False depending on if any block was removed.
+        """
+        reachable = graph.get_reachable_blocks()
+        blocks = [block for block in graph.blocks if block in reachable]
+        if len(blocks) == len(graph.blocks):
+            return False
+        graph.blocks = blocks
+        graph.compute_edges()
+        return True
+
+    def remove_useless_jumps(self, graph: ControlFlowGraph) -> bool:
+        """
+        Remove the GOTO quadruples that jump to the next block.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+
+        Returns:
+            bool: True or False depending on if any jump was removed.
+        """
+        changed = False
+        for block in graph.blocks:
+            if block.ends_in_jump() and block.get_last_quad().operator == "GOTO" and block.jump_target is graph.get_next_block(block):
+                block.quads.pop()
+                block.jump_target = None
+                changed = True
+        if changed:
+            graph.compute_edges()
+        return changed
+
+    def remove_dead_quads(self, program: ProgramFlowGraph, graph: ControlFlowGraph) -> bool:
+        """
+        Remove the quadruples whose result is never read.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+
+        Returns:
+            bool: True or False depending on if any quadruple was removed.
+        """
+        changed = False
+        initialized_in = program.compute_initialized_addresses(graph)
+        live_out = graph.compute_live_addresses()
+        for block in graph.get_reachable_blocks():
+            # Find the addresses initialized before each quadruple
+            initialized = set(initialized_in[block])
+            initialized_before = []
+            for quad in block.quads:
+                initialized_before.append(set(initialized))
+                initialized.add(program.get_assigned_address(quad))
+            live = set(live_out[block])
+            kept = []
+            for quad, initialized in zip(reversed(block.quads), reversed(initialized_before)):
+                address = QuadHelper.get_defined_address(quad)
+                used = QuadHelper.get_used_addresses(quad)
+                # Only a local that is never read again can be left without a value, and array elements can be read through a pointer
+                if QuadHelper.is_pure(quad) and QuadHelper.is_local_address(address) and address not in live and not program.is_array_address(address):
+                    can_fault = quad.operator == "/" and (not QuadHelper.is_constant_address(quad.right_address) or program.constant_memory_manager[quad.right_address] == 0)
+                    for used_address in used:
+                        if QuadHelper.is_ptr_address(used_address):
+                            can_fault = True
+                        elif not QuadHelper.is_constant_address(used_address) and used_address not in initialized:
+                            can_fault = True
+                    if not can_fault:
+                        changed = True
+                        continue
+                live.discard(address)
+                live |= set(used)
+                kept.append(quad)
+            block.quads = list(reversed(kept))
+        return changed
@@ -0,0 +1,262 @@
+from data_helper import DataHelper
+from function_directory import FunctionDirectory
+from memory_manager import MemoryManager
+from program_error import ProgramErrorType, raise_program_error
+from quad_helper import QuadHelper
+from quadruples import Quad, Quadruples
+from variable_table import Variable
+
+class DependenceAnalysis:
+    """
+    The DependenceAnalysis class checks that the iterations of a parallel for loop do not depend on each other.
+
+    The quadruples of the body of the loop are checked when the loop is compiled, together with the quadruples of the
+    functions it calls, so the iterations can run in any order and at the same time. A variable that an iteration
+    writes must be assigned on every path before the iteration reads it, and the loop variable and the variables the
+    end of the loop is computed from must not change. An array that an iteration writes must only be accessed with the
+    loop variable as the index of its first dimension, so every iteration uses its own elements, and the functions
+    called from the loop cannot write global arrays or read the arrays the loop writes. The loop cannot print or read
+    values, in its body or in the functions it calls, since their order would change, and it cannot return.
+
+    Attributes:
+        quadruples (Quadruples): The quadruples of the program compiled so far.
+        constant_memory_manager (MemoryManager): The memory manager for the constant memory.
+        function_directory (FunctionDirectory): The function directory.
+        array_accesses (dict): A dictionary with the base address of the array and the address of its first index for the position of each PTR quadruple.
+        arrays (list[Variable]): The arrays that the loop can access.
+        names (dict): A dictionary with the name of each variable that the loop can access for its address.
+        f_name (str): The name of the function that contains the loop.
+        line_num (int): The line number of the loop.
+        summaries (dict): A dictionary with the effects of each function called from the loop, or None while they are computed.
+        recursive (set[str]): The functions that were called while their effects were computed.
+
+    Methods:
+        __init__(quadruples: Quadruples, constant_memory_manager: MemoryManager, function_directory: FunctionDirectory, array_accesses: dict, variables: list[Variable], f_name: str, line_num: int):
+            Initialize a new instance of the DependenceAnalysis class.
+        check_loop(header: int, body: int, increment: int, variable: int):
+            Check that the iterations of a parallel loop can run at the same time.
+        summarize(start: int, end: int, f_name: str | None) -> tuple:
+            Get the effects of running the quadruples between two positions.
+        summarize_function(f_name: str) -> tuple:
+            Get the effects on global memory of a call to a function.
+        get_effects(quad: Quad, pointers: dict, f_name: str | None) -> tuple:
+            Get the addresses a quadruple reads and writes and the array elements it accesses.
+        find_array(address: int, f_name: str | None) -> Variable | None:
+            Find the array that an address belongs to.
+        get_name(address: int) -> str:
+            Get the name of a variable to show in an error.
+    """
+
+    def __init__(self, quadruples: Quadruples, constant_memory_manager: MemoryManager, function_directory: FunctionDirectory, array_accesses: dict, variables: list[Variable], f_name: str, line_num: int):
+        self.quadruples = quadruples
+        self.constant_memory_manager = constant_memory_manager
+        self.function_directory = function_directory
+        self.array_accesses = array_accesses
+        self.arrays = [variable for variable in variables if variable.array_manager is not None]
+        self.names = {variable.address: variable.name for variable in variables if variable.array_manager is None and DataHelper.check_type_simple(variable.type)}
+        self.f_name = f_name
+        self.line_num = line_num
+        self.summaries = {}
+        self.recursive = set()
+
+    def check_loop(self, header: int, body: int, increment: int, variable: int):
+        """
+        Check that the iterations of a parallel loop can run at the same time.
+
+        Parameters:
+            header (int): The position of the first quadruple that computes the end of the loop.
+            body (int): The position of the first quadruple of the body of the loop, after the condition.
+            increment (int): The position after the last quadruple of the body of the loop.
+            variable (int): The address of the loop variable.
+        """
+        exposed, written, _, accesses = self.summarize(body, increment, None)
+        if variable in written:
+            raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, self.line_num, f"The parallel for loop cannot change its loop variable {self.get_name(variable)}")
+        for address in sorted(exposed & written):
+            raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, self.line_num, f"The iterations of the parallel for loop depend on each other through the variable {self.get_name(address)}, which is read before it is assigned")
+        # The end of the loop is computed again before every iteration, up to the condition before the PARALLEL and the GOTOF
+        end_reads, _, _, end_accesses = self.summarize(header, body - 2, None)
+        for address in sorted((end_reads - {variable}) & written):
+            raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, self.line_num, f"The parallel for loop cannot change the variable {self.get_name(address)}, since the end of the loop is computed from it")
+        accesses += end_accesses
+        written_arrays = {array.address for array, _, write in accesses if write}
+        for array, index, _ in accesses:
+            if array.address in written_arrays and index != variable:
+                raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, self.line_num, f"The iterations of the parallel for loop can access the same elements of the array '{array.name}', which must be indexed by the loop variable in its first dimension")
+
+    def summarize(self, start: int, end: int, f_name: str | None) -> tuple:
+        """
+        Get the effects of running the quadruples between two positions.
+
+        Parameters:
+            start (int): The position of the first quadruple.
+            end (int): The position after the last quadruple.
+            f_name (str | None): The name of the called function the quadruples belong to, or None for the quadruples of the loop.
+
+        Returns:
+            tuple: The addresses that can be read before they are assigned, the addresses that can be written, the addresses that are written on every path and the array accesses.
+        """
+        quads = self.quadruples
+        # The pointers of a function are never reused, so each one accesses the array of the only PTR quadruple that sets it
+        pointers = {quads[position].return_address: self.array_accesses[position] for position in range(start, end) if position in self.array_accesses}
+        effects = {}
+        # The addresses that are assigned on every path to each position
+        states = {start: set()}
+        exits = []
+        pending = [start]
+        while pending:
+            position = pending.pop()
+            if not start <= position < end:
+                continue
+            quad = quads[position]
+            if position not in effects:
+                effects[position] = self.get_effects(quad, pointers, f_name)
+            out = states[position] | set(effects[position][1])
+            if quad.operator == "GOTO":
+                successors = [int(self.constant_memory_manager[quad.return_address])]
+            elif quad.operator in ["GOTOF", "GOTOT"]:
+                successors = [position + 1, int(self.constant_memory_manager[quad.return_address])]
+            elif QuadHelper.is_exit(quad):
+                successors = []
+                exits.append(out)
+            else:
+                successors = [position + 1]
+            for successor in successors:
+                if successor not in states:
+                    states[successor] = set(out)
+                    pending.append(successor)
+                elif not states[successor] <= out:
+                    states[successor] &= out
+                    pending.append(successor)
+        exposed = set()
+        written = set()
+        accesses = []
+        for position, (reads, _, writes, quad_accesses) in effects.items():
+            exposed |= set(reads) - states[position]
+            written |= set(writes)
+            accesses += quad_accesses
+        exits += [state for position, state in states.items() if not start <= position < end]
+        assigned = set.intersection(*exits) if exits else set()
+        # A recursive call can read any address the function reads before the call assigns it
+        if f_name in self.recursive:
+            exposed |= {address for reads, _, _, _ in effects.values() for address in reads}
+        return (exposed, written, assigned, accesses)
+
+    def summarize_function(self, f_name: str) -> tuple:
+        """
+        Get the effects on global memory of a call to a function.
+
+        Parameters:
+            f_name (str): The name of the called function.
+
+        Returns:
+            tuple: The global addresses that can be read before they are assigned, the ones that can be written, the ones that are written on every path and the accesses to global arrays.
+        """
+        if f_name == self.f_name:
+            raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, self.line_num, f"The parallel for loop cannot call the function '{f_name}' that contains it")
+        if f_name in self.summaries:
+            if self.summaries[f_name] is None:
+                self.recursive.add(f_name)
+                return (set(), set(), set(), [])
+            return self.summaries[f_name]
+        self.summaries[f_name] = None
+        function = self.function_directory.get_function_from_directory(f_name)
+        # The quadruples of a function end where the next function starts
+        start = function.initial_quad_address
+        end = min([other.initial_quad_address for other in self.function_directory.functions.values() if other.initial_quad_address > start] + [self.quadruples.instr_ptr])
+        exposed, written, assigned, accesses = self.summarize(start, end, f_name)
+        # The return value is read right after the call that assigns it
+        if function.return_address is not None:
+            assigned.add(function.return_address)
+        self.summaries[f_name] = (exposed, written, assigned, accesses)
+        return self.summaries[f_name]
+
+    def get_effects(self, quad: Quad, pointers: dict, f_name: str | None) -> tuple:
+        """
+        Get the addresses a quadruple reads and writes and the array elements it accesses.
+
+        Parameters:
+            quad (Quad): The quadruple to be inspected.
+            pointers (dict): A dictionary with the base address of the array and the address of the first index of each pointer.
+            f_name (str | None): The name of the called function the quadruple belongs to, or None for a quadruple of the loop.
+
+        Returns:
+            tuple: The addresses read, the addresses written, the addresses that can be written and the accessed arrays with their first index and if they are written.
+        """
+        operator = quad.operator
+        if operator in ["PRINT", "READ", "READARRAY", "WRITEARRAY"]:
+            if f_name is None:
+                raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, self.line_num, "A parallel for loop cannot print or read values")
+            raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, self.line_num, f"The parallel for loop cannot call the function '{f_name}', since it prints or reads values")
+        if QuadHelper.is_exit(quad) and f_name is None:
+            raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, self.line_num, "A parallel for loop cannot contain a return statement")
+        if operator == "GOSUB":
+            f_name = next(name for name, function in self.function_directory.functions.items() if function.address == quad.return_address)
+            exposed, written, assigned, accesses = self.summarize_function(f_name)
+            return (list(exposed), list(assigned), list(written), [(array, None, write) for array, _, write in accesses])
+        reads = []
+        writes = []
+        accesses = []
+        # The operations on whole arrays get the base address of the arrays as constants
+        operands = {"SORT": [(quad.return_address, True)], "FILL": [(quad.return_address, True)], "COPY": [(quad.left_address, False), (quad.return_address, True)],
+                    "SUM": [(quad.left_address, False)], "MIN": [(quad.left_address, False)], "MAX": [(quad.left_address, False)], "BSEARCH": [(quad.right_address, False)]}
+        for address, write in operands.get(operator, []):
+            array = self.find_array(int(self.constant_memory_manager[address]), f_name)
+            if array is not None:
+                accesses.append((array, None, write))
+        used = QuadHelper.get_used_addresses(quad)
+        defined = QuadHelper.get_defined_address(quad)
+        # The pointer a value is stored through is the last address the quadruple uses
+        stores = QuadHelper.writes_through_ptr(quad)
+        for position, address in enumerate(used):
+            if QuadHelper.is_constant_address(address):
+                continue
+            if address in pointers:
+                base, index = pointers[address]
+                array = self.find_array(base, f_name)
+                if array is not None:
+                    # The loop variable is not visible in a called function
+                    accesses.append((array, index if f_name is None else None, stores and position == len(used) - 1))
+            array = self.find_array(address, f_name)
+            if array is not None:
+                accesses.append((array, None, False))
+            elif f_name is None or QuadHelper.is_global_address(address):
+                reads.append(address)
+        if defined is not None:
+            array = self.find_array(defined, f_name)
+            if array is not None:
+                accesses.append((array, None, True))
+            elif f_name is None or QuadHelper.is_global_address(defined):
+                writes.append(defined)
+        return (reads, writes, writes, accesses)
+
+    def find_array(self, address: int, f_name: str | None) -> Variable | None:
+        """
+        Find the array that an address belongs to.
+
+        Parameters:
+            address (int): The address to be checked.
+            f_name (str | None): The name of the called function the address is used in, or None for an address used in the loop.
+
+        Returns:
+            Variable | None: The array whose elements include the address, or None if it is not an element of an array the loop can reach.
+        """
+        # The local arrays of a called function get a new memory in every call
+        if f_name is not None and not QuadHelper.is_global_address(address):
+            return None
+        for array in self.arrays:
+            if array.address <= address < array.address + array.array_manager.size:
+                return array
+        return None
+
+    def get_name(self, address: int) -> str:
+        """
+        Get the name of a variable to show in an error.
+
+        Parameters:
+            address (int): The address of the variable.
+
+        Returns:
+            str: The name of the variable in quotes, or its address when it is a temporal.
+        """
+        return f"'{self.names[address]}'" if address in self.names else f"at address '{address}'"
@@ -13,6 +13,8 @@ class Function:
         return_address (int): The address where the return value of the function will be stored.
         return_present (bool): Indicates if the function has a return statement.
         parameters (list): The list of parameters of the function.
+        pure (bool): Indicates if the result of the function only depends on its parameters and it has no other effects.
+        data (dict): The initial value of each element of the local arrays declared with an initializer, by address.
 
     Methods:
         __init__(name: str, address: int, return_type: str, return_address: int):
@@ -28,6 +30,8 @@ class Function:
         self.return_address = return_address
         self.return_present = False
         self.parameters = []
+        self.pure = False
+        self.data = {}
 
 class FunctionVM:
     """
@@ -37,16 +41,22 @@ class FunctionVM:
         name (str): The name of the function.
         initial_quad_address (int): The initial quadruple address of the function.
         resources (Tuple[int, int, int, int]): The resources required by the function. (ints, floats, bools, strings)
+        return_address (int | None): The address where the return value of the function is stored, or None if it is void.
+        pure (bool): Indicates if the results of the calls to the function can be reused for the same arguments.
+        data (Tuple | None): The values every new memory of the function starts with, in the order of the resources, or None if it starts empty.
 
     Methods:
-        __init__(name: str, initial_quad_address: int, resources: Tuple[int, int, int, int]):
+        __init__(name: str, initial_quad_address: int, resources: Tuple[int, int, int, int], return_address: int | None, pure: bool):
             Initialize a new instance of the FunctionVM class.
     """
 
-    def __init__(self, name: str, initial_quad_address: int, resources: Tuple[int, int, int, int]):
+    def __init__(self, name: str, initial_quad_address: int, resources: Tuple[int, int, int, int], return_address: int | None = None, pure: bool = False):
         self.name = name
         self.initial_quad_address = initial_quad_address
         self.resources = resources
+        self.return_address = return_address
+        self.pure = pure
+        self.data = None
 
 class FunctionDirectory:
     """
@@ -54,6 +64,7 @@ class FunctionDirectory:
     
     Attributes:
         functions (dict): A dictionary of functions with their names as keys.
+        arrays (list): The start address and size of every array declared in the program.
 
     Methods:
         __init__():
@@ -66,12 +77,15 @@ class FunctionDirectory:
             Check if a function exists in the directory.
         __str__() -> str:
             Get a string representation of the FunctionDirectory object.
+        get_data() -> str:
+            Get a string representation of the initial values of the local arrays.
         print():
             Print the functions in the function directory.
     """
 
     def __init__(self):
         self.functions = {}
+        self.arrays = []
 
     def add_function_to_directory(self, f_name: str, address: int, return_type: str, return_address: int) -> Function:
         """
@@ -131,7 +145,22 @@ class FunctionDirectory:
             output += f"{f_name},"
             output += f"{function.return_type},"
             output += f"({','.join(str(resources) for resources in function.resources)}),"
-            output += f"{function.initial_quad_address}"
+            output += f"{function.initial_quad_address},"
+            output += f"{function.return_address},"
+            output += f"{function.pure}"
+        return output
+
+    def get_data(self) -> str:
+        """
+        Get a string representation of the initial values of the local arrays.
+
+        Returns:
+            str: A line with the function name, address and value of each initialized element.
+        """
+        output = ""
+        for f_name, function in self.functions.items():
+            for address, value in sorted(function.data.items()):
+                output += f"\n{f_name},{address}-{value}"
         return output
 
     def print(self):
@@ -158,7 +187,7 @@ class FunctionDirectoryVM:
     Methods:
         __init__():
             Initialize a new instance of the FunctionDirectoryVM class.
-        add_function_to_directory(f_name: str, initial_quad_address: int, resources: Tuple[int, int, int, int]) -> FunctionVM:
+        add_function_to_directory(f_name: str, initial_quad_address: int, resources: Tuple[int, int, int, int], return_address: int | None, pure: bool) -> FunctionVM:
             Add a function to the function directory.
         get_function_from_directory(f_name: str) -> FunctionVM:
             Get the information for a function in the directory.
@@ -198,7 +227,7 @@ class FunctionDirectoryVM:
         """
         return f_name in self.functions
 
-    def add_function_to_directory(self, f_name: str, initial_quad_address: int, resources: Tuple[int, int, int, int]) -> FunctionVM:
+    def add_function_to_directory(self, f_name: str, initial_quad_address: int, resources: Tuple[int, int, int, int], return_address: int | None = None, pure: bool = False) -> FunctionVM:
         """
         Add a function to the function directory.
 
@@ -206,11 +235,13 @@ class FunctionDirectoryVM:
             name (str): The name of the function.
             initial_quad_address (int): The initial quadruple address of the function.
             resources (Tuple[int, int, int, int]): The resources required by the function. (ints, floats, bools, strings)
+            return_address (int | None): The address where the return value of the function is stored, or None if it is void.
+            pure (bool): Indicates if the results of the calls to the function can be reused for the same arguments.
 
         Returns:
             FunctionVM: The FunctionVM object representing the added function.
         """
-        function = FunctionVM(f_name, initial_quad_address, resources)
+        function = FunctionVM(f_name, initial_quad_address, resources, return_address, pure)
         self.functions[f_name] = function
         return function
     
@@ -0,0 +1,254 @@
+from control_flow_graph import BasicBlock, ControlFlowGraph, ProgramFlowGraph
+from memory_manager import SIZE
+from quad_helper import QuadHelper, START_FUNCTION_MEMORY
+from quadruples import Quad
+
+class FunctionInlining:
+    """
+    The FunctionInlining class replaces the calls to small functions with a copy of their quadruples.
+
+    The locals of an inlined function are moved to unused addresses of the caller, its parameters are assigned with
+    the values that were sent with PARAM and every ENDFUNC jumps back to the quadruple after the GOSUB. The return
+    value is still written to the global address of the function, so the assignment after the call does not change.
+    When there is a profile, the functions that executed a large share of the program can be larger and still be
+    inlined.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+        max_size (int): The largest number of quadruples a function can have to be inlined.
+        hot_factor (int): The number of times the size limit is multiplied for the functions the profile shows as hot.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Inline the calls to small functions in every function.
+        find_calls(program: ProgramFlowGraph) -> dict:
+            Find the functions each function calls.
+        find_reachable(calls: dict, f_name: str) -> set[str]:
+            Find the functions that can be reached by following the calls of a function.
+        find_recursive_functions(calls: dict) -> set[str]:
+            Find the functions that can call themselves.
+        check_can_inline(program: ProgramFlowGraph, graph: ControlFlowGraph) -> bool:
+            Check if the quadruples of a function can be copied into another function.
+        inline_calls(program: ProgramFlowGraph, graph: ControlFlowGraph, inlined: set[str]):
+            Replace the calls from a function to the given functions.
+        inline_call(graph: ControlFlowGraph, callee: ControlFlowGraph, block: BasicBlock, index: int, addresses: dict) -> dict:
+            Replace a single call with a copy of the called function.
+    """
+
+    name = "inline"
+    level = 2
+    max_size = 16
+    hot_factor = 2
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Inline the calls to small functions in every function.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        calls = self.find_calls(program)
+        recursive = self.find_recursive_functions(calls)
+        # Visit the called functions first so their own calls are already inlined
+        order = []
+        visited = set()
+        def visit(f_name: str):
+            if f_name in visited or f_name not in calls:
+                return
+            visited.add(f_name)
+            for callee in sorted(calls[f_name]):
+                visit(callee)
+            order.append(f_name)
+        for graph in program.graphs:
+            visit(graph.name)
+        inlined = set()
+        for f_name in order:
+            graph = program.get_graph(f_name)
+            self.inline_calls(program, graph, inlined)
+            if f_name not in recursive and self.check_can_inline(program, graph):
+                inlined.add(f_name)
+        program.written_globals = None
+        program.returned_globals = None
+
+    def find_calls(self, program: ProgramFlowGraph) -> dict:
+        """
+        Find the functions each function calls.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+
+        Returns:
+            dict: A dictionary with the set of names of the called functions for each function name.
+        """
+        calls = {}
+        for graph in program.graphs:
+            calls[graph.name] = set()
+            for block in graph.blocks:
+                for quad in block.quads:
+                    if quad.operator == "GOSUB":
+                        calls[graph.name].add(program.get_function_name(quad.return_address))
+        return calls
+
+    def find_reachable(self, calls: dict, f_name: str) -> set[str]:
+        """
+        Find the functions that can be reached by following the calls of a function.
+
+        Parameters:
+            calls (dict): A dictionary with the set of names of the called functions for each function name.
+            f_name (str): The name of the function.
+
+        Returns:
+            set[str]: The names of the functions that are called directly or indirectly.
+        """
+        reachable = set()
+        pending = list(calls.get(f_name, set()))
+        while pending:
+            callee = pending.pop()
+            if callee not in reachable:
+                reachable.add(callee)
+                pending.extend(calls.get(callee, set()))
+        return reachable
+
+    def find_recursive_functions(self, calls: dict) -> set[str]:
+        """
+        Find the functions that can call themselves.
+
+        Parameters:
+            calls (dict): A dictionary with the set of names of the called functions for each function name.
+
+        Returns:
+            set[str]: The names of the functions that call themselves directly or indirectly.
+        """
+        return {f_name for f_name in calls if f_name in self.find_reachable(calls, f_name)}
+
+    def check_can_inline(self, program: ProgramFlowGraph, graph: ControlFlowGraph) -> bool:
+        """
+        Check if the quadruples of a function can be copied into another function.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+
+        Returns:
+            bool: True or False depending on if the function is small and does not depend on getting a new memory.
+        """
+        quads = [quad for block in graph.get_reachable_blocks() for quad in block.quads]
+        max_size = self.max_size * self.hot_factor if program.profile is not None and program.profile.is_hot(graph.name) else self.max_size
+        if len(quads) > max_size:
+            return False
+        # The initial values of local arrays are loaded into the new memory of each call
+        if program.function_directory.get_function_from_directory(graph.name).data:
+            return False
+        # The base addresses of local arrays are stored as constants and cannot be moved
+        for quad in quads:
+            addresses = [quad.left_address, quad.right_address] + ([quad.return_address] if quad.operator in QuadHelper.array_operators else [])
+            for address in addresses:
+                if QuadHelper.is_constant_address(address):
+                    value = program.constant_memory_manager[address]
+                    if type(value) == int and START_FUNCTION_MEMORY <= value < START_FUNCTION_MEMORY + SIZE * 5:
+                        return False
+        # A local read before it is assigned raises an error that must not depend on a previous call
+        initialized_in = program.compute_initialized_addresses(graph)
+        for block in graph.get_reachable_blocks():
+            initialized = set(initialized_in[block])
+            for quad in block.quads:
+                for address in QuadHelper.get_used_addresses(quad):
+                    if QuadHelper.is_local_address(address) and address not in initialized:
+                        return False
+                initialized.add(program.get_assigned_address(quad))
+        return True
+
+    def inline_calls(self, program: ProgramFlowGraph, graph: ControlFlowGraph, inlined: set[str]):
+        """
+        Replace the calls from a function to the given functions.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the calling function.
+            inlined (set[str]): The names of the functions that can be inlined.
+        """
+        function = program.function_directory.get_function_from_directory(graph.name)
+        moved = {}
+        changed = True
+        while changed:
+            changed = False
+            for block in list(graph.blocks):
+                for index, quad in enumerate(block.quads):
+                    if quad.operator != "GOSUB":
+                        continue
+                    f_name = program.get_function_name(quad.return_address)
+                    if f_name not in inlined:
+                        continue
+                    callee = program.function_directory.get_function_from_directory(f_name)
+                    # Every call to the same function reuses the same addresses in the caller
+                    if f_name not in moved:
+                        resources = list(function.resources)
+                        if any(used + size > SIZE for used, size in zip(resources, callee.resources)):
+                            continue
+                        moved[f_name] = {}
+                        for type_index, size in enumerate(callee.resources):
+                            for offset in range(size):
+                                address = START_FUNCTION_MEMORY + SIZE * type_index + offset
+                                moved[f_name][address] = START_FUNCTION_MEMORY + SIZE * type_index + resources[type_index] + offset
+                            resources[type_index] += size
+                        function.resources = tuple(resources)
+                    copies = self.inline_call(graph, program.get_graph(f_name), block, index, moved[f_name])
+                    program.copy_branch_counts(list(copies), list(copies.values()))
+                    changed = True
+                    break
+                if changed:
+                    break
+        graph.compute_edges()
+
+    def inline_call(self, graph: ControlFlowGraph, callee: ControlFlowGraph, block: BasicBlock, index: int, addresses: dict) -> dict:
+        """
+        Replace a single call with a copy of the called function.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the calling function.
+            callee (ControlFlowGraph): The control flow graph of the called function.
+            block (BasicBlock): The block with the GOSUB quadruple.
+            index (int): The position of the GOSUB quadruple in the block.
+            addresses (dict): A dictionary with the caller address for each local address of the called function.
+
+        Returns:
+            dict: A dictionary with the copy of each reachable block of the called function.
+        """
+        def move(address: int | None) -> int | None:
+            return addresses.get(address, address)
+
+        # The quadruples after the call continue in a new block
+        after = BasicBlock(block.quads[index + 1:])
+        after.jump_target = block.jump_target
+        start = index
+        while block.quads[start - 1].operator == "PARAM":
+            start -= 1
+        if block.quads[start - 1].operator != "ERA":
+            raise Exception("The call to an inlined function does not start with ERA.")
+        params = [Quad("=", quad.left_address, None, move(quad.return_address)) for quad in block.quads[start:index]]
+        block.quads = block.quads[:start - 1] + params
+        block.jump_target = None
+        # Unreachable blocks, like the jumps after a return, are left out
+        originals = [original for original in callee.blocks if original in callee.get_reachable_blocks()]
+        copies = {original: BasicBlock() for original in originals}
+        for original, copy in copies.items():
+            for quad in original.quads:
+                if QuadHelper.is_exit(quad):
+                    copy.quads.append(Quad("GOTO", None, None, None))
+                    copy.jump_target = after
+                elif quad.operator == "PARAM":
+                    # The parameter belongs to the memory of the function being called
+                    copy.quads.append(Quad("PARAM", move(quad.left_address), None, quad.return_address))
+                else:
+                    copy.quads.append(Quad(quad.operator, move(quad.left_address), move(quad.right_address), move(quad.return_address)))
+            if original.jump_target is not None:
+                copy.jump_target = copies[original.jump_target]
+        layout = [copies[original] for original in originals]
+        # The last block can fall into the quadruples after the call
+        if layout[-1].jump_target is after:
+            layout[-1].quads.pop()
+            layout[-1].jump_target = None
+        position = graph.blocks.index(block) + 1
+        graph.blocks[position:position] = layout + [after]
+        return copies
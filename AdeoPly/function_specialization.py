@@ -0,0 +1,169 @@
+from control_flow_graph import BasicBlock, ControlFlowGraph, ProgramFlowGraph
+from quad_helper import QuadHelper
+from quadruples import Quad
+
+class FunctionSpecialization:
+    """
+    The FunctionSpecialization class makes copies of functions for the constant arguments their calls send.
+
+    The calls that send constants to parameters the function computes with but never assigns are grouped by function
+    and constants. For each group, starting with the most frequent one, the function is copied into a new function
+    that reads the constants instead of those parameters, and the calls of the group are changed to the copy without
+    sending those arguments. The later optimizations can then fold the conditions on the constants and remove the
+    branches that are not taken, or inline the smaller copy. Copies are made while they fit in the size budget, and
+    each one is added to the function directory with the name of the function followed by a number.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+        max_size (int): The largest number of quadruples a function can have to be copied.
+        max_total_size (int): The maximum number of quadruples all the copies can add up to.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Specialize the functions for the constant arguments of their calls.
+        find_calls(program: ProgramFlowGraph) -> dict:
+            Find the calls that send constants to parameters that are never assigned.
+        get_call_start(block: BasicBlock, index: int) -> int | None:
+            Get the position of the ERA quadruple of a call.
+        specialize(program: ProgramFlowGraph, f_name: str, constants: tuple) -> str:
+            Make a copy of a function that reads constants instead of some of its parameters.
+        redirect_call(program: ProgramFlowGraph, block: BasicBlock, index: int, f_name: str, constants: tuple):
+            Make a call go to the copy of the function and stop sending the constant arguments.
+    """
+
+    name = "specialize"
+    level = 2
+    max_size = 64
+    max_total_size = 256
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Specialize the functions for the constant arguments of their calls.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        calls = self.find_calls(program)
+        budget = self.max_total_size
+        redirected = []
+        for (f_name, constants), sites in sorted(calls.items(), key=lambda item: -len(item[1])):
+            size = sum(len(block.quads) for block in program.get_graph(f_name).blocks)
+            if size > self.max_size or size > budget:
+                continue
+            budget -= size
+            clone_name = self.specialize(program, f_name, constants)
+            redirected.extend((block, index, clone_name, constants) for block, index in sites)
+        # Removing the arguments moves the quadruples after them, so the last calls of each block are changed first
+        for block, index, clone_name, constants in sorted(redirected, key=lambda call: -call[1]):
+            self.redirect_call(program, block, index, clone_name, constants)
+        program.written_globals = None
+        program.returned_globals = None
+
+    def find_calls(self, program: ProgramFlowGraph) -> dict:
+        """
+        Find the calls that send constants to parameters that are never assigned.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+
+        Returns:
+            dict: A dictionary with the block and position of the GOSUB quadruples for each function name and constant parameters.
+        """
+        # Only the parameters that are never assigned and are computed with can be replaced by a constant
+        operators = QuadHelper.arithmetic_operators + QuadHelper.relational_operators + QuadHelper.logical_operators + ["GOTOF", "GOTOT", "VER"]
+        assigned = {}
+        computed = {}
+        for graph in program.graphs:
+            quads = [quad for block in graph.blocks for quad in block.quads]
+            assigned[graph.name] = {QuadHelper.get_defined_address(quad) for quad in quads}
+            computed[graph.name] = {address for quad in quads if quad.operator in operators for address in QuadHelper.get_used_addresses(quad)}
+        calls = {}
+        for graph in program.graphs:
+            for block in graph.blocks:
+                for index, quad in enumerate(block.quads):
+                    start = self.get_call_start(block, index) if quad.operator == "GOSUB" else None
+                    if start is None:
+                        continue
+                    f_name = program.get_function_name(quad.return_address)
+                    if f_name not in assigned:
+                        continue
+                    constants = []
+                    for param in block.quads[start + 1:index]:
+                        # Booleans are stored as text in constant memory and cannot be read in place of a boolean
+                        p_type = QuadHelper.get_type_from_address(param.return_address)
+                        if (QuadHelper.is_constant_address(param.left_address) and param.return_address not in assigned[f_name] and
+                                param.return_address in computed[f_name] and p_type != "bool" and QuadHelper.get_type_from_address(param.left_address) == p_type):
+                            constants.append((param.return_address, param.left_address))
+                    if constants:
+                        calls.setdefault((f_name, tuple(constants)), []).append((block, index))
+        return calls
+
+    def get_call_start(self, block: BasicBlock, index: int) -> int | None:
+        """
+        Get the position of the ERA quadruple of a call.
+
+        Parameters:
+            block (BasicBlock): The block with the GOSUB quadruple.
+            index (int): The position of the GOSUB quadruple in the block.
+
+        Returns:
+            int | None: The position of the ERA quadruple, or None if the call does not only send arguments between them.
+        """
+        start = index - 1
+        while start >= 0 and block.quads[start].operator == "PARAM":
+            start -= 1
+        if start < 0 or block.quads[start].operator != "ERA" or block.quads[start].return_address != block.quads[index].return_address:
+            return None
+        return start
+
+    def specialize(self, program: ProgramFlowGraph, f_name: str, constants: tuple) -> str:
+        """
+        Make a copy of a function that reads constants instead of some of its parameters.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            f_name (str): The name of the function to copy.
+            constants (tuple): The address of each replaced parameter and the address of its constant.
+
+        Returns:
+            str: The name of the copy.
+        """
+        function = program.function_directory.get_function_from_directory(f_name)
+        number = 1
+        while program.function_directory.check_function_exists(f"{f_name}.{number}"):
+            number += 1
+        clone_name = f"{f_name}.{number}"
+        # The copy has its own name in global memory but shares the return value of the function
+        clone = program.function_directory.add_function_to_directory(clone_name, program.global_memory_manager.find_memory_address(clone_name), function.return_type, function.return_address)
+        clone.resources = function.resources
+        clone.parameters = list(function.parameters)
+        clone.return_present = function.return_present
+        clone.data = function.data
+        graph = program.get_graph(f_name)
+        addresses = dict(constants)
+        copies = {block: BasicBlock([QuadHelper.replace_used_addresses(quad, addresses) for quad in block.quads]) for block in graph.blocks}
+        for block, copy in copies.items():
+            copy.jump_target = copies.get(block.jump_target)
+        program.copy_branch_counts(list(copies), list(copies.values()))
+        # The copies are laid out after the function and its previous copies
+        position = max(i for i, other in enumerate(program.graphs) if other.name == f_name or other.name.startswith(f"{f_name}.")) + 1
+        program.graphs.insert(position, ControlFlowGraph(clone_name, list(copies.values())))
+        return clone_name
+
+    def redirect_call(self, program: ProgramFlowGraph, block: BasicBlock, index: int, f_name: str, constants: tuple):
+        """
+        Make a call go to the copy of the function and stop sending the constant arguments.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            block (BasicBlock): The block with the GOSUB quadruple.
+            index (int): The position of the GOSUB quadruple in the block.
+            f_name (str): The name of the copy.
+            constants (tuple): The address of each replaced parameter and the address of its constant.
+        """
+        address = program.function_directory.get_function_from_directory(f_name).address
+        start = self.get_call_start(block, index)
+        replaced = {param for param, _ in constants}
+        params = [quad for quad in block.quads[start + 1:index] if quad.return_address not in replaced]
+        block.quads[start:index + 1] = [Quad("ERA", None, None, address)] + params + [Quad("GOSUB", None, None, address)]
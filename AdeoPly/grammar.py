@@ -2,9 +2,13 @@ from array_manager import ArrayManager
 from class_directory import ClassDirectory
 from context_stack import Context, ContextStack
 from data_helper import DataHelper
+from dependence_analysis import DependenceAnalysis
 from function_directory import FunctionDirectory
 from memory_manager import MemoryManager
+from optimizer import Optimizer
+from profile_data import ProfileData
 from program_error import ProgramErrorType, raise_program_error
+from quad_helper import QuadHelper
 from quadruples import Quad, Quadruples
 from semantic_cube import SemanticCube
 from variable_table import Variable
@@ -28,11 +32,14 @@ keywords = {
     'Class' : 'CLASS',
     'while' : 'WHILE',
     'for' : 'FOR',
+    'parallel' : 'PARALLEL',
     'to' : 'TO',
     'do' : 'DO',
     'function' : 'FUNCTION',
     'return': 'RETURN',
     'read' : 'READ',
+    'readarray' : 'READARRAY',
+    'writearray' : 'WRITEARRAY',
     'print' : 'PRINT',
     'main' : 'MAIN'
 }
@@ -122,9 +129,13 @@ temporal_memory_manager = MemoryManager(10000)
 # Function management
 function_directory = FunctionDirectory()
 function_stack: list[str] = []
+# Number of arguments of the builtins that run on a whole array
+builtin_functions = {"sort": 1, "fill": 2, "copy": 2, "sum": 1, "min": 1, "max": 1, "bsearch": 2}
 
 # Context management
 context_stack = ContextStack()
+# The array and the first index of each PTR quadruple, which the parallel loops are checked with
+array_accesses: dict[int, tuple[int, int]] = {}
 
 # Quadruples
 quadruples = Quadruples()
@@ -192,6 +203,7 @@ def p_statement(t):
               | conditional
               | write SEMICOLON
               | read SEMICOLON
+              | array_io SEMICOLON
               | l_while
               | l_for
               | f_call SEMICOLON
@@ -313,17 +325,21 @@ def p_write(t):
     elements = t[3]
     if elements is None:
         raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, t.lineno(1), "The data to be printed is invalid")
+    addresses = []
     for elem in elements:
         # Print a constant
         if type(elem) == tuple:
             c_address = elem[1]
             if c_address == None:
                 raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, t.lineno(1), "A void function cannot be called inside a print statement")
-            quadruples.add_quad("PRINT", None, None, c_address)
+            addresses.append(c_address)
         # Print a variable
         elif type(elem) == Variable:
-            v_address = elem.address
-            quadruples.add_quad("PRINT", None, None, v_address)
+            addresses.append(elem.address)
+    # Each PRINT quadruple prints up to three arguments, which fill the operands from the right
+    for i in range(0, len(addresses), 3):
+        operands = addresses[i:i + 3]
+        quadruples.add_quad("PRINT", *([None] * (3 - len(operands)) + operands))
 
 def p_read(t):
     '''
@@ -335,6 +351,24 @@ def p_read(t):
     v_address = variable.address
     quadruples.add_quad("READ", None, None, v_address)
 
+def p_array_io(t):
+    '''
+    array_io : READARRAY LPAREN ID COMMA expression RPAREN
+             | WRITEARRAY LPAREN ID COMMA expression RPAREN
+    '''
+    variable = context_stack.get_variable_from_context(t[3])
+    if variable is None:
+        raise_program_error(ProgramErrorType.UNDECLARED_IDENTIFIER, t.lineno(1), f"The variable '{t[3]}' has not been declared")
+    if variable.array_manager is None:
+        raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, t.lineno(1), f"The variable '{t[3]}' is not an array")
+    f_type, f_address = DataHelper.process_constant_or_variable(t[5])
+    if f_type != "string":
+        raise_program_error(ProgramErrorType.TYPE_MISMATCH, t.lineno(1), "The name of the file should be a string")
+    # The whole array is read or written by one quadruple with the size and base address of the array as constants
+    size_address = constant_memory_manager.find_memory_address(variable.array_manager.size)
+    base_address = constant_memory_manager.find_memory_address(variable.address)
+    quadruples.add_quad(t[1].upper(), f_address, size_address, base_address)
+
 def p_l_while(t):
     '''
     l_while : WHILE LPAREN l_while_np1 expression conditional_np1 RPAREN l_block
@@ -358,6 +392,7 @@ def p_l_while_np1(t):
 def p_l_for(t):
     '''
     l_for : FOR l_for_np1 ASSIGNOP expr l_for_np2 TO expr l_for_np3 DO l_block
+          | PARALLEL FOR l_for_np1 ASSIGNOP expr l_for_np2 TO expr l_parallel_np1 DO l_block
     '''
     # Jumps
     last_jump = jumps.pop()
@@ -365,7 +400,13 @@ def p_l_for(t):
     # Look for constant 1 or save it
     c_address = constant_memory_manager.find_memory_address(1)
     # Add one to the loop variable
-    left_type, left_address = DataHelper.process_constant_or_variable(t[2])
+    is_parallel = len(t) == 12
+    left_type, left_address = DataHelper.process_constant_or_variable(t[3] if is_parallel else t[2])
+    # The body of a parallel loop is checked before the quadruples that go to the next iteration
+    if is_parallel:
+        variables = [variable for context in context_stack.contexts for variable in context.variable_table.variables.values()]
+        analysis = DependenceAnalysis(quadruples, constant_memory_manager, function_directory, array_accesses, variables, function_stack[-1] if function_stack else "main", t.lineno(1))
+        analysis.check_loop(first_jump, last_jump + 1, quadruples.instr_ptr, left_address)
     operation_type = SemanticCube.get_result_type(left_type, "+", "int")
     if operation_type == "TypeMismatch":
         raise_program_error(ProgramErrorType.TYPE_MISMATCH, t.lineno(1), "Operand does not match data type")
@@ -414,6 +455,7 @@ def p_l_for_np2(t):
 def p_l_for_np3(t):
     '''
     l_for_np3 :
+    l_parallel_np1 :
     '''
     left_type, left_address = DataHelper.process_constant_or_variable(t[-6])
     right_type, right_address = DataHelper.process_constant_or_variable(t[-1])
@@ -424,6 +466,9 @@ def p_l_for_np3(t):
     # Reserve a temporary space to store the result
     result_address = temporal_memory_manager.reserve_space(operation_type)
     quadruples.add_quad("<", left_address, right_address, result_address)
+    # A parallel loop runs its remaining iterations in the worker processes when the condition is checked
+    if t.slice[0].type == "l_parallel_np1":
+        quadruples.add_quad("PARALLEL", left_address, right_address, result_address)
     # Save the instruction pointer of the GOTOF quadruple for later use
     jumps.append(quadruples.instr_ptr)
     quadruples.add_quad("GOTOF", result_address, None, None)
@@ -438,6 +483,10 @@ def p_f_call(t):
         f_args = t[3]
     else:
         f_args = []
+    # A builtin runs on the whole array unless the program declares a function with the same name
+    if f_name in builtin_functions and not function_directory.check_function_exists(f_name):
+        t[0] = add_builtin_call(f_name, f_args, t.lineno(1))
+        return
     # Check that function has been declared
     if not function_directory.check_function_exists(f_name):
         raise_program_error(ProgramErrorType.UNDECLARED_IDENTIFIER, t.lineno(1), f"The function named '{f_name}' was not declared")
@@ -464,6 +513,61 @@ def p_f_call(t):
         return_address = function.return_address
     t[0] = (function.return_type, return_address)
 
+def add_builtin_call(f_name: str, f_args: list, line_num: int) -> tuple:
+    """
+    Add the quadruples of a call to a builtin that runs as one operation on the elements of an array.
+
+    Parameters:
+        f_name (str): The name of the builtin.
+        f_args (list): The arguments of the call, where the first one is the array.
+        line_num (int): The line number of the call.
+
+    Returns:
+        tuple: The type and address of the result, or "void" and None if the builtin does not return a value.
+    """
+    if len(f_args) != builtin_functions[f_name]:
+        raise_program_error(ProgramErrorType.MISSING_REQUIRED_ARGUMENT, line_num, f"The amount of call arguments does not match the amount of parameters for function '{f_name}'")
+    arrays = f_args[:2] if f_name == "copy" else f_args[:1]
+    for array in arrays:
+        if type(array) != Variable or array.array_manager is None:
+            raise_program_error(ProgramErrorType.UNSUPPORTED_OPERATION, line_num, f"The function '{f_name}' can only be called with an array")
+    array = f_args[0]
+    # The array is given by its size and base address as constants, and a 2-D array is used row by row
+    size_address = constant_memory_manager.find_memory_address(array.array_manager.size)
+    base_address = constant_memory_manager.find_memory_address(array.address)
+    if f_name == "sort":
+        quadruples.add_quad("SORT", None, size_address, base_address)
+    elif f_name == "fill":
+        v_type, v_address = DataHelper.process_constant_or_variable(f_args[1])
+        if SemanticCube.get_result_type(array.type, "=", v_type) == "TypeMismatch":
+            raise_program_error(ProgramErrorType.TYPE_MISMATCH, line_num, f"The value does not match the data type of the array '{array.name}'")
+        quadruples.add_quad("FILL", v_address, size_address, base_address)
+    elif f_name == "copy":
+        source = f_args[1]
+        if source.type != array.type:
+            raise_program_error(ProgramErrorType.TYPE_MISMATCH, line_num, f"The arrays '{array.name}' and '{source.name}' do not have the same data type")
+        if source.array_manager.size > array.array_manager.size:
+            raise_program_error(ProgramErrorType.ARRAY_INDEX_OUT_OF_BOUNDS, line_num, f"The array '{source.name}' does not fit in the array '{array.name}'")
+        # The elements of the source are copied to the start of the destination
+        size_address = constant_memory_manager.find_memory_address(source.array_manager.size)
+        quadruples.add_quad("COPY", constant_memory_manager.find_memory_address(source.address), size_address, base_address)
+    elif f_name == "bsearch":
+        v_type, v_address = DataHelper.process_constant_or_variable(f_args[1])
+        if SemanticCube.get_result_type(array.type, "==", v_type) == "TypeMismatch":
+            raise_program_error(ProgramErrorType.TYPE_MISMATCH, line_num, f"The value does not match the data type of the array '{array.name}'")
+        # The result starts with the size of the array, which does not fit in the other operands
+        result_address = temporal_memory_manager.reserve_space("int")
+        quadruples.add_quad("=", size_address, None, result_address)
+        quadruples.add_quad("BSEARCH", v_address, base_address, result_address)
+        return ("int", result_address)
+    else:
+        if f_name == "sum" and array.type not in ["int", "float"]:
+            raise_program_error(ProgramErrorType.TYPE_MISMATCH, line_num, f"The elements of the array '{array.name}' cannot be added")
+        result_address = temporal_memory_manager.reserve_space(array.type)
+        quadruples.add_quad(f_name.upper(), base_address, size_address, result_address)
+        return (array.type, result_address)
+    return ("void", None)
+
 def p_return(t):
     '''
     return : RETURN expression
@@ -571,6 +675,10 @@ def p_repeated_elements(t):
             | ID
             | array COMMA variables_2
             | array
+            | array_init COMMA variables_2
+            | array_init
+    array_values : const COMMA array_values
+                 | const
     class_attributes : attributes_t COMMA class_attributes
                      | attributes_t
     '''
@@ -617,7 +725,25 @@ def p_variables(t):
                     value = constant_memory_manager[base_ad]
                     array_manager.add_dimension(value)
                 array_manager.update_dimension()
-                context_stack.contexts[-1].add_variable_to_context(v_name, v_type, array_manager)
+                variable = context_stack.contexts[-1].add_variable_to_context(v_name, v_type, array_manager)
+                # Save the memory of the array for the optimizations that need to know which addresses it covers
+                function_directory.arrays.append((variable.address, array_manager.size))
+                # The initial values are loaded with the memory, so the array is filled without quadruples
+                values = var[2] if len(var) == 3 else []
+                if len(values) > array_manager.size:
+                    raise_program_error(ProgramErrorType.ARRAY_INDEX_OUT_OF_BOUNDS, t.lineno(1), f"The array '{v_name}' has {array_manager.size} elements but {len(values)} initial values were given")
+                for i, (c_type, c_address) in enumerate(values):
+                    if SemanticCube.get_result_type(v_type, "=", c_type) == "TypeMismatch":
+                        raise_program_error(ProgramErrorType.TYPE_MISMATCH, t.lineno(1), f"The initial value at position {i} of '{v_name}' does not match data type")
+                    value = constant_memory_manager[c_address]
+                    value = float(value) if v_type == "float" else value
+                    address = variable.address + i
+                    if QuadHelper.is_global_address(address):
+                        typespace = global_memory_manager.get_typespace_from_address(address)
+                        typespace.values[address - typespace.initial_address] = value
+                    else:
+                        function = function_directory.get_function_from_directory(function_stack[-1] if function_stack else "main")
+                        function.data[address] = value
     # For class objects
     else:
         c_name = t[2]
@@ -643,6 +769,12 @@ def p_array(t):
     '''
     t[0] = (t[1], t[2])
 
+def p_array_init(t):
+    '''
+    array_init : array ASSIGNOP LBRACE array_values RBRACE
+    '''
+    t[0] = (t[1][0], t[1][1], t[4])
+
 def p_array_dimension(t):
     '''
     array_dimension : LBRACK expr RBRACK LBRACK expr RBRACK
@@ -681,6 +813,17 @@ def p_var(t):
         # Check if the number of dimensions entered while trying to index is the same as the array's
         if len(dim) != len(array_manager.dimensions):
             raise_program_error(ProgramErrorType.ARRAY_INDEX_OUT_OF_BOUNDS, t.lineno(1), f"Wrong indexing when trying to access '{v_name}'")
+        # Resolve the address of the element at compile time when every index is a constant
+        params = [(param.type, param.address) if type(param) == Variable else param for param in dim]
+        if all(p_type == "int" and QuadHelper.is_constant_address(p_address) for p_type, p_address in params):
+            element_address = variable.address
+            for i, (dim, (_, p_address)) in enumerate(zip(array_manager.dimensions, params)):
+                index = constant_memory_manager[p_address]
+                if index < 0 or index >= dim.upper_lim:
+                    raise_program_error(ProgramErrorType.ARRAY_INDEX_OUT_OF_BOUNDS, t.lineno(1), f"The index '{index}' is outside of the valid range")
+                element_address += index * dim.m if i < len(array_manager.dimensions) - 1 else index
+            t[0] = Variable(variable.name, variable.type, element_address)
+            return
         addresses = []
         lower_lim = constant_memory_manager.find_memory_address(0)
         for i, (dim, param) in enumerate(zip(array_manager.dimensions, dim)):
@@ -716,6 +859,7 @@ def p_var(t):
         quadruples.add_quad("+", addresses.pop(), base_address, t1)
         # Create a pointer quad to store t1 in t2
         t2 = temporal_memory_manager.reserve_space("ptr")
+        array_accesses[quadruples.instr_ptr] = (variable.address, params[0][1])
         quadruples.add_quad("PTR", t1, None, t2)
         t[0] = Variable(variable.name, variable.type, t2)
 
@@ -833,10 +977,42 @@ def p_expr_unique(t):
     else:
         t[0] = t[2]
 
+def p_expr_logic(t):
+    '''
+    expression : expression AND expr_logic_np1 sub_expr_e
+               | expression OR expr_logic_np1 sub_expr_e
+    '''
+    left_type, _ = DataHelper.process_constant_or_variable(t[1])
+    right_type, right_address = DataHelper.process_constant_or_variable(t[4])
+    # Determine the result type based on the left and right types
+    operation_type = SemanticCube.get_result_type(left_type, t[2], right_type)
+    if operation_type == "TypeMismatch":
+        raise_program_error(ProgramErrorType.TYPE_MISMATCH, t.lineno(1), "Operand does not match data type")
+    # The right operand decides the result when it is evaluated
+    result_address = t[3]
+    quadruples.add_quad("=", right_address, None, result_address)
+    # Update the jump that skips the right operand to point to the current instruction pointer
+    last_jump = jumps.pop()
+    quad = quadruples[last_jump]
+    instr_address = constant_memory_manager.find_memory_address(quadruples.instr_ptr)
+    quadruples[last_jump] = Quad(quad.operator, quad.left_address, None, instr_address)
+    t[0] = (operation_type, result_address)
+
+def p_expr_logic_np1(t):
+    '''
+    expr_logic_np1 :
+    '''
+    _, left_address = DataHelper.process_constant_or_variable(t[-2])
+    # Store the left operand as the result in case the right operand is skipped
+    result_address = temporal_memory_manager.reserve_space("bool")
+    quadruples.add_quad("=", left_address, None, result_address)
+    # AND skips the right operand when the result is false and OR skips it when the result is true
+    jumps.append(quadruples.instr_ptr)
+    quadruples.add_quad("GOTOF" if t[-1] == "&&" else "GOTOT", result_address, None, None)
+    t[0] = result_address
+
 def p_expr_complex(t):
     '''
-    expression : expression AND sub_expr_e
-               | expression OR sub_expr_e
     sub_expr_e : sub_expr_e EQOP sub_expr_r
     sub_expr_r : sub_expr_r RELOP expr
     expr : expr PLUS term
@@ -860,6 +1036,10 @@ def p_expr_complex(t):
 def p_error(t):
     raise_program_error(ProgramErrorType.SYNTAX_ERROR, t.lineno, f"Invalid syntax in value '{t.value}'")
 
+def optimize_program(optimization_level: int = 2, time_passes: bool = False, dump_ir: bool = False, profile: ProfileData | None = None):
+    optimizer = Optimizer(quadruples, function_directory, global_memory_manager, constant_memory_manager, optimization_level, time_passes, dump_ir, profile)
+    optimizer.optimize()
+
 def get_data_to_compiler():
     data: list[str] = []
     d_temp = "--Global Memory--"
@@ -870,6 +1050,8 @@ def get_data_to_compiler():
     data.append(d_temp)
     d_temp = "\n--Functions--" + str(function_directory)
     data.append(d_temp)
+    d_temp = "\n--Data--" + function_directory.get_data()
+    data.append(d_temp)
     d_temp = "\n--Quadruples--" + str(quadruples)
     data.append(d_temp)
     return data
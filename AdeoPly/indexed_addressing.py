@@ -0,0 +1,186 @@
+from control_flow_graph import BasicBlock, ControlFlowGraph, ProgramFlowGraph
+from quad_helper import QuadHelper
+from quadruples import IndexedAddress, Quad
+
+class IndexedAddressing:
+    """
+    The IndexedAddressing class replaces the pointers to array elements with operands that add an index to a base address.
+
+    Every pointer of a function gets an integer temporal that stores the address its PTR quadruple computed, and the
+    quadruples that read or write through the pointer name the element as that temporal added to a base of zero.
+    Inside each block, an index that is known to be a constant plus another address is folded into the operand, so an
+    access like arr[i] becomes an operand with the base address of arr and the address of i, and the quadruples that
+    only computed the address of the element are removed. The virtual machine has no pointers, so this runs at every
+    optimization level after the other optimizations.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Replace the pointers of every function with indexed operands.
+        replace_pointers(program: ProgramFlowGraph, graph: ControlFlowGraph) -> set[int]:
+            Replace the pointers of a function with integer temporals that are used as indexes.
+        fold_block(program: ProgramFlowGraph, block: BasicBlock) -> set[int]:
+            Fold the constant part of the indexes of a block into the base of the operands.
+        fold_operand(operand: int | IndexedAddress | None, offsets: dict) -> int | IndexedAddress | None:
+            Get the operand that names the same element with the known part of its index in the base.
+        remove_unused_quads(graph: ControlFlowGraph, addresses: set[int]):
+            Remove the quadruples that compute addresses that are no longer read.
+        get_read_addresses(quad: Quad) -> list[int]:
+            Get the addresses a quadruple with indexed operands reads.
+    """
+
+    name = "index"
+    level = 0
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Replace the pointers of every function with indexed operands.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            addresses = self.replace_pointers(program, graph)
+            for block in graph.blocks:
+                addresses |= self.fold_block(program, block)
+            self.remove_unused_quads(graph, addresses)
+
+    def replace_pointers(self, program: ProgramFlowGraph, graph: ControlFlowGraph) -> set[int]:
+        """
+        Replace the pointers of a function with integer temporals that are used as indexes.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+
+        Returns:
+            set[int]: The integer temporals that replaced the pointers.
+        """
+        slots = {}
+        for block in graph.blocks:
+            quads = []
+            for quad in block.quads:
+                operands = [quad.left_address, quad.right_address, quad.return_address]
+                for address in operands:
+                    if QuadHelper.is_ptr_address(address) and address not in slots:
+                        slots[address] = program.reserve_temporal(graph, "int")
+                if quad.operator == "PTR":
+                    # The temporal stores the address of the element instead of the pointer
+                    quads.append(Quad("=", quad.left_address, None, slots[quad.return_address]))
+                else:
+                    operands = [IndexedAddress(0, slots[address]) if QuadHelper.is_ptr_address(address) else address for address in operands]
+                    quads.append(Quad(quad.operator, *operands))
+            block.quads = quads
+        # The function no longer needs memory for pointers
+        function = program.function_directory.get_function_from_directory(graph.name)
+        function.resources = function.resources[:4] + (0,)
+        return set(slots.values())
+
+    def fold_block(self, program: ProgramFlowGraph, block: BasicBlock) -> set[int]:
+        """
+        Fold the constant part of the indexes of a block into the base of the operands.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            block (BasicBlock): The block to optimize.
+
+        Returns:
+            set[int]: The addresses that were used to compute an index folded into an operand.
+        """
+        # The value of each address is a constant plus the value of an index, and the sources are the addresses it was computed in
+        offsets = {}
+        folded = set()
+        quads = []
+        defining_operators = QuadHelper.arithmetic_operators + QuadHelper.relational_operators + QuadHelper.logical_operators + ["=", "READ", "SUM", "MIN", "MAX", "BSEARCH", "VOUT"]
+        for quad in block.quads:
+            operands = [quad.left_address, quad.right_address, quad.return_address]
+            for address in operands:
+                if isinstance(address, IndexedAddress) and address.index in offsets:
+                    folded |= offsets[address.index][2]
+            quad = Quad(quad.operator, *[self.fold_operand(address, offsets) for address in operands])
+            quads.append(quad)
+            # Forget the offsets whose addresses change
+            left_address, right_address, address = quad.left_address, quad.right_address, quad.return_address
+            if isinstance(address, IndexedAddress) or quad.operator not in defining_operators:
+                if (isinstance(address, IndexedAddress) and quad.operator not in ["PRINT", "VARG"]) or QuadHelper.writes_array(quad):
+                    offsets = {k: v for k, v in offsets.items() if not program.is_array_address(k) and not program.is_array_address(v[1])}
+                elif quad.operator == "GOSUB":
+                    offsets = {k: v for k, v in offsets.items() if not QuadHelper.is_global_address(k) and not QuadHelper.is_global_address(v[1])}
+                continue
+            offsets = {k: v for k, v in offsets.items() if address not in [k, v[1]]}
+            if QuadHelper.get_type_from_address(address) != "int" or isinstance(left_address, IndexedAddress) or isinstance(right_address, IndexedAddress):
+                continue
+            # Keep the offsets of the integers that are a constant plus another address
+            if quad.operator == "=" and QuadHelper.is_constant_address(left_address):
+                value = program.constant_memory_manager[left_address]
+                if type(value) == int:
+                    offsets[address] = (value, None, {address})
+            elif quad.operator == "=" and QuadHelper.get_type_from_address(left_address) == "int" and left_address != address:
+                base, index, sources = offsets.get(left_address, (0, left_address, set()))
+                offsets[address] = (base, index, sources | {address})
+            elif quad.operator == "+" and QuadHelper.is_constant_address(left_address) != QuadHelper.is_constant_address(right_address):
+                constant, other = (left_address, right_address) if QuadHelper.is_constant_address(left_address) else (right_address, left_address)
+                value = program.constant_memory_manager[constant]
+                if type(value) == int and QuadHelper.get_type_from_address(other) == "int" and other != address:
+                    base, index, sources = offsets.get(other, (0, other, set()))
+                    offsets[address] = (base + value, index, sources | {address})
+        block.quads = quads
+        return folded
+
+    def fold_operand(self, operand: int | IndexedAddress | None, offsets: dict) -> int | IndexedAddress | None:
+        """
+        Get the operand that names the same element with the known part of its index in the base.
+
+        Parameters:
+            operand (int | IndexedAddress | None): The operand of a quadruple.
+            offsets (dict): A dictionary with the constant, the index and the sources of the value of each address.
+
+        Returns:
+            int | IndexedAddress | None: The folded operand, which is a direct address when the whole index is known.
+        """
+        if not isinstance(operand, IndexedAddress) or operand.index not in offsets:
+            return operand
+        base, index, _ = offsets[operand.index]
+        if index is None:
+            return operand.base + base
+        return IndexedAddress(operand.base + base, index)
+
+    def remove_unused_quads(self, graph: ControlFlowGraph, addresses: set[int]):
+        """
+        Remove the quadruples that compute addresses that are no longer read.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+            addresses (set[int]): The addresses that were only used to compute the address of an element.
+        """
+        changed = True
+        while changed:
+            changed = False
+            read = {address for block in graph.blocks for quad in block.quads for address in self.get_read_addresses(quad)}
+            for block in graph.blocks:
+                quads = [quad for quad in block.quads if not (quad.operator in ["+", "="] and quad.return_address in addresses and
+                                                             QuadHelper.is_local_address(quad.return_address) and quad.return_address not in read)]
+                if len(quads) != len(block.quads):
+                    block.quads = quads
+                    changed = True
+
+    def get_read_addresses(self, quad: Quad) -> list[int]:
+        """
+        Get the addresses a quadruple with indexed operands reads.
+
+        Parameters:
+            quad (Quad): The quadruple to be inspected.
+
+        Returns:
+            list[int]: The addresses read by the quadruple, including the indexes of its operands.
+        """
+        read = []
+        for position, address in enumerate([quad.left_address, quad.right_address, quad.return_address]):
+            if isinstance(address, IndexedAddress):
+                read.append(address.index)
+            elif address is not None and (position < 2 or quad.operator in ["PRINT", "VARG", "VOUT"]):
+                read.append(address)
+        return read
@@ -0,0 +1,70 @@
+from control_flow_graph import ControlFlowGraph, Loop, ProgramFlowGraph
+from quad_helper import QuadHelper
+from quadruples import Quad
+
+class InductionVariable:
+    """
+    The InductionVariable class represents the variable of a for loop, which goes up by one in every iteration.
+
+    Attributes:
+        address (int): The address of the loop variable.
+        end_address (int): The address of the value the loop variable has to reach to leave the loop.
+        increment_quad (Quad): The quadruple that stores the incremented value in the loop variable.
+
+    Methods:
+        __init__(address: int, end_address: int, increment_quad: Quad):
+            Initialize a new instance of the InductionVariable class.
+        find_in_loop(program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop) -> InductionVariable | None:
+            Find the variable that a for loop increments in every iteration.
+    """
+
+    def __init__(self, address: int, end_address: int, increment_quad: Quad):
+        self.address = address
+        self.end_address = end_address
+        self.increment_quad = increment_quad
+
+    @staticmethod
+    def find_in_loop(program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop) -> "InductionVariable | None":
+        """
+        Find the variable that a for loop increments in every iteration.
+
+        The header must compare the loop variable with an end value that does not change inside the loop, and the only
+        assignment to the loop variable inside the loop must be the increment added at the end of the for loop.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+            loop (Loop): The loop to inspect.
+
+        Returns:
+            InductionVariable | None: The loop variable, or None if the loop does not have the shape of a for loop.
+        """
+        header = loop.header
+        if len(header.quads) != 2 or header.quads[1].operator != "GOTOF" or header.jump_target in loop.blocks:
+            return None
+        compare = header.quads[0]
+        if compare.operator != "<" or compare.return_address != header.quads[1].left_address:
+            return None
+        address = compare.left_address
+        end_address = compare.right_address
+        if QuadHelper.is_ptr_address(address) or QuadHelper.is_constant_address(address) or QuadHelper.is_ptr_address(end_address):
+            return None
+        increment_quads = []
+        for block in loop.blocks:
+            for i, quad in enumerate(block.quads):
+                if QuadHelper.get_defined_address(quad) == address:
+                    # The for loop adds one to the variable in a temporal and then assigns it, unless both were coalesced
+                    increment = quad
+                    if quad.operator == "=" and i > 0 and block.quads[i - 1].return_address == quad.left_address:
+                        increment = block.quads[i - 1]
+                    if (block in loop.latches and increment.operator == "+" and increment.left_address == address and
+                            QuadHelper.is_constant_address(increment.right_address) and program.constant_memory_manager[increment.right_address] == 1):
+                        increment_quads.append(quad)
+                    else:
+                        return None
+        written = program.get_loop_writes(loop)
+        if len(increment_quads) != 1 or end_address in written or (QuadHelper.is_global_address(address) and address in program.get_loop_call_writes(loop)):
+            return None
+        if loop.preheader is None:
+            graph.insert_preheader(loop)
+        return InductionVariable(address, end_address, increment_quads[0])
@@ -0,0 +1,115 @@
+import codecs, os, sys, threading
+from collections import deque
+
+class InputReader:
+    """
+    The InputReader class gives the virtual machine the lines of the input that each READ quadruple stores.
+
+    Each READ reads one line, like input() does. When the input comes from a file, the whole file is read at once and
+    the lines are served from memory. When the standard input is a pipe or a file, a background thread reads it in
+    large chunks and adds all the lines of each chunk to a queue at once, so the program runs while the next lines
+    arrive and only waits for the thread when the queue is empty. The thread stops reading while the queue is full, so
+    an endless input does not fill the memory. When the standard input is a terminal, the lines are read with input()
+    as the user types them.
+
+    Attributes:
+        max_pending (int): The number of pending lines that makes the background thread stop reading ahead.
+        chunk_size (int): The number of bytes the background thread reads at once.
+        lines (deque[str]): The lines that were read and not yet used.
+        finished (bool): Indicates if the end of the input was reached.
+        interactive (bool): Indicates if the lines are read with input() when they are needed.
+        condition (threading.Condition): The condition used to wait for the lines of the background thread.
+
+    Methods:
+        __init__(file_name: str | None):
+            Initialize a new instance of the InputReader class.
+        prefetch():
+            Read the lines of the standard input in the background.
+        read_line() -> str:
+            Get the next line of the input.
+        read_value(v_type: str) -> int | float | str | bool:
+            Get the next line of the input converted to the type of the variable that stores it.
+    """
+
+    max_pending = 65536
+    chunk_size = 65536
+
+    def __init__(self, file_name: str | None = None):
+        self.lines = deque()
+        self.finished = False
+        self.interactive = False
+        self.condition = threading.Condition()
+        if file_name is not None:
+            with open(file_name, "r") as file:
+                lines = file.read().split("\n")
+            # A last line without a newline is still read, like input() does
+            if lines[-1] == "":
+                lines.pop()
+            self.lines.extend(lines)
+            self.finished = True
+        elif sys.stdin is None or sys.stdin.isatty():
+            self.interactive = True
+        else:
+            threading.Thread(target=self.prefetch, daemon=True).start()
+
+    def prefetch(self):
+        """
+        Read the lines of the standard input in the background.
+        """
+        decoder = codecs.getincrementaldecoder(sys.stdin.encoding or "utf-8")(sys.stdin.errors or "strict")
+        pending = ""
+        chunk = True
+        while chunk:
+            chunk = os.read(sys.stdin.fileno(), self.chunk_size)
+            lines = (pending + decoder.decode(chunk, final=not chunk)).split("\n")
+            # The text after the last newline is completed by the next chunk
+            pending = lines.pop()
+            if not chunk and pending:
+                lines.append(pending)
+            lines = [line.removesuffix("\r") for line in lines]
+            with self.condition:
+                while len(self.lines) >= self.max_pending:
+                    self.condition.wait(0.01)
+                self.lines.extend(lines)
+                self.finished = not chunk
+                self.condition.notify_all()
+
+    def read_line(self) -> str:
+        """
+        Get the next line of the input.
+
+        Returns:
+            str: The line without its newline, where an EOFError is raised like input() does when there are no lines left.
+        """
+        if self.interactive:
+            return input()
+        # Taking a line from the queue is safe without the lock, which is only needed to wait for the thread
+        try:
+            return self.lines.popleft()
+        except IndexError:
+            pass
+        with self.condition:
+            while not self.lines and not self.finished:
+                self.condition.wait()
+            if not self.lines:
+                raise EOFError("The input has no more lines.")
+            return self.lines.popleft()
+
+    def read_value(self, v_type: str) -> int | float | str | bool:
+        """
+        Get the next line of the input converted to the type of the variable that stores it.
+
+        Parameters:
+            v_type (str): The type of the variable.
+
+        Returns:
+            int | float | str | bool: The value of the line, where a ValueError is raised if the line is not a value of the type.
+        """
+        line = self.read_line()
+        if v_type == "int":
+            return int(line)
+        elif v_type == "float":
+            return float(line)
+        elif v_type == "bool":
+            return line == "true"
+        return line
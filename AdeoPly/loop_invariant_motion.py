@@ -0,0 +1,154 @@
+from control_flow_graph import BasicBlock, ControlFlowGraph, Loop, ProgramFlowGraph
+from quad_helper import QuadHelper
+from quadruples import Quad
+
+class LoopInvariantCodeMotion:
+    """
+    The LoopInvariantCodeMotion class moves the quadruples that compute the same value in every iteration of a loop to the preheader of the loop.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Hoist the loop invariant quadruples of every function.
+        hoist_loop_invariants(program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop) -> int:
+            Move the invariant quadruples of a loop to its preheader.
+        check_dominates_uses(graph: ControlFlowGraph, block: BasicBlock, quad: Quad, uses: list) -> bool:
+            Check if a quadruple runs before every use of the value it defines.
+        check_can_fault(quad: Quad, program: ProgramFlowGraph) -> bool:
+            Check if a quadruple can raise an execution error when its operands are initialized.
+    """
+
+    name = "licm"
+    level = 2
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Hoist the loop invariant quadruples of every function.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            loops = graph.find_loops()
+            if not loops:
+                continue
+            for loop in loops:
+                graph.insert_preheader(loop)
+            # Find the loops again so the new preheaders belong to the outer loops
+            loops = graph.find_loops()
+            for loop in loops:
+                graph.insert_preheader(loop)
+            graph.compute_dominators()
+            for loop in loops:
+                self.hoist_loop_invariants(program, graph, loop)
+
+    def hoist_loop_invariants(self, program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop) -> int:
+        """
+        Move the invariant quadruples of a loop to its preheader.
+
+        A quadruple is moved when its operands do not change inside the loop, it is the only definition of its result,
+        and moving it cannot raise an error that the original program would not raise at the same point.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+            loop (Loop): The loop to optimize.
+
+        Returns:
+            int: The number of quadruples that were moved.
+        """
+        preheader = loop.preheader
+        if preheader not in graph.dominators:
+            return 0
+        # Collect the definitions and uses of every address in the function
+        def_count = {}
+        uses = {}
+        for block in graph.blocks:
+            for quad in block.quads:
+                address = QuadHelper.get_defined_address(quad)
+                def_count[address] = def_count.get(address, 0) + 1
+                for address in QuadHelper.get_used_addresses(quad):
+                    uses.setdefault(address, []).append((block, quad))
+        loop_blocks = [block for block in graph.blocks if block in loop.blocks]
+        loop_defs = {QuadHelper.get_defined_address(quad) for block in loop_blocks for quad in block.quads}
+        has_call = any(quad.operator == "GOSUB" for block in loop_blocks for quad in block.quads)
+        has_array_write = any(QuadHelper.writes_array(quad) for block in loop_blocks for quad in block.quads)
+        # An invariant pointer can still point to an element that changes inside the loop
+        variant_elements = has_call or has_array_write
+        initialized_in = program.compute_initialized_addresses(graph)
+        initialized = initialized_in[preheader] | {program.get_assigned_address(quad) for quad in preheader.quads}
+        invariant = set()
+        hoisted = 0
+        changed = True
+        while changed:
+            changed = False
+            for block in loop_blocks:
+                for quad in list(block.quads):
+                    result = QuadHelper.get_defined_address(quad)
+                    if not QuadHelper.is_pure(quad) or not QuadHelper.is_local_address(result) or def_count.get(result) != 1 or program.is_array_address(result):
+                        continue
+                    operands = [address for address in (quad.left_address, quad.right_address) if address is not None]
+                    if quad.operator in ["=", "PTR"]:
+                        operands = operands[:1]
+                    # Operands must keep the same value in every iteration
+                    if not all(QuadHelper.is_constant_address(address) or (address in invariant and not (variant_elements and QuadHelper.is_ptr_address(address))) or
+                               (address not in loop_defs and not QuadHelper.is_ptr_address(address) and not (has_call and QuadHelper.is_global_address(address)) and
+                                not (has_array_write and program.is_array_address(address)))
+                               for address in operands):
+                        continue
+                    if not self.check_dominates_uses(graph, block, quad, uses.get(result, [])):
+                        continue
+                    # The first quadruple of the header always runs when the loop is entered
+                    runs_on_entry = block is loop.header and block.quads[0] is quad
+                    speculative = not self.check_can_fault(quad, program) and all(QuadHelper.is_constant_address(address) or address in initialized for address in operands)
+                    if not runs_on_entry and not speculative:
+                        continue
+                    block.quads.remove(quad)
+                    preheader.add_quad_before_exit(quad)
+                    invariant.add(result)
+                    initialized.add(result)
+                    hoisted += 1
+                    changed = True
+        return hoisted
+
+    def check_dominates_uses(self, graph: ControlFlowGraph, block: BasicBlock, quad: Quad, uses: list) -> bool:
+        """
+        Check if a quadruple runs before every use of the value it defines.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+            block (BasicBlock): The block of the quadruple.
+            quad (Quad): The quadruple that defines the value.
+            uses (list): The blocks and quadruples that read the value.
+
+        Returns:
+            bool: True or False depending on if the definition dominates all of its uses.
+        """
+        for use_block, use_quad in uses:
+            if use_block is block:
+                if use_quad is quad or block.quads.index(use_quad) < block.quads.index(quad):
+                    return False
+            elif not graph.dominates(block, use_block):
+                return False
+        return True
+
+    def check_can_fault(self, quad: Quad, program: ProgramFlowGraph) -> bool:
+        """
+        Check if a quadruple can raise an execution error when its operands are initialized.
+
+        Parameters:
+            quad (Quad): The quadruple to be checked.
+            program (ProgramFlowGraph): The control flow graphs of the program.
+
+        Returns:
+            bool: True or False depending on if the quadruple is a division that might be by zero or reads an array element.
+        """
+        # The element is only known to exist and be initialized after the VER quadruple of its index runs in the loop
+        if QuadHelper.is_ptr_address(quad.left_address) or QuadHelper.is_ptr_address(quad.right_address):
+            return True
+        if quad.operator != "/":
+            return False
+        return not QuadHelper.is_constant_address(quad.right_address) or program.constant_memory_manager[quad.right_address] == 0
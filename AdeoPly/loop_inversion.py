@@ -0,0 +1,93 @@
+from control_flow_graph import BasicBlock, ControlFlowGraph, Loop, ProgramFlowGraph
+from quadruples import Quad
+
+class LoopInversion:
+    """
+    The LoopInversion class moves the condition of the while and for loops to the bottom of the loop.
+
+    A loop whose header checks the condition and whose last block jumps back to the header runs a conditional and an
+    unconditional jump in every iteration. The header is kept as a guard that is only checked when entering the loop,
+    and each jump back to the header is replaced by a copy of the condition with a conditional jump to the body, so
+    every iteration only runs one jump.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+        max_size (int): The maximum number of quadruples of a condition that is copied to the bottom of a loop.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Invert the loops of every function.
+        find_invertible_loop(graph: ControlFlowGraph, inverted: set) -> Loop | None:
+            Find a loop that checks its condition at the top and has not been inverted.
+        invert_loop(graph: ControlFlowGraph, loop: Loop):
+            Replace the jumps back to the header of a loop with a copy of its condition.
+    """
+
+    name = "invert"
+    level = 2
+    max_size = 8
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Invert the loops of every function.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            inverted = set()
+            # Inverting a loop changes the blocks of the loops around it, so the loops are found again every time
+            loop = self.find_invertible_loop(graph, inverted)
+            while loop is not None:
+                self.invert_loop(graph, loop)
+                inverted.add(loop.header)
+                loop = self.find_invertible_loop(graph, inverted)
+
+    def find_invertible_loop(self, graph: ControlFlowGraph, inverted: set) -> Loop | None:
+        """
+        Find a loop that checks its condition at the top and has not been inverted.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+            inverted (set): The headers of the loops that were already inverted.
+
+        Returns:
+            Loop | None: The innermost loop that can be inverted, or None if there is none.
+        """
+        for loop in graph.find_loops():
+            header = loop.header
+            last_quad = header.get_last_quad()
+            body = graph.get_next_block(header)
+            if header in inverted or last_quad is None or last_quad.operator not in ["GOTOF", "GOTOT"]:
+                continue
+            # The header must leave the loop when the condition fails and continue into the body otherwise
+            if header.jump_target in loop.blocks or body not in loop.blocks or len(header.quads) > self.max_size:
+                continue
+            if all(latch.ends_in_jump() and latch.get_last_quad().operator == "GOTO" and latch.jump_target is header for latch in loop.latches):
+                return loop
+        return None
+
+    def invert_loop(self, graph: ControlFlowGraph, loop: Loop):
+        """
+        Replace the jumps back to the header of a loop with a copy of its condition.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+            loop (Loop): The loop to invert.
+        """
+        header = loop.header
+        body = graph.get_next_block(header)
+        exit_block = header.jump_target
+        condition = header.get_last_quad()
+        # The copy jumps back to the body when the header would have continued into it
+        operator = "GOTOT" if condition.operator == "GOTOF" else "GOTOF"
+        for latch in loop.latches:
+            latch.quads = latch.quads[:-1] + header.quads[:-1] + [Quad(operator, condition.left_address, None, None)]
+            latch.jump_target = body
+            # When the condition fails the latch has to reach the exit of the loop
+            if graph.get_next_block(latch) is not exit_block:
+                trampoline = BasicBlock([Quad("GOTO", None, None, None)])
+                trampoline.jump_target = exit_block
+                graph.blocks.insert(graph.blocks.index(latch) + 1, trampoline)
+        graph.compute_edges()
@@ -0,0 +1,202 @@
+from control_flow_graph import BasicBlock, ControlFlowGraph, Loop, ProgramFlowGraph
+from induction_variable import InductionVariable
+from quad_helper import QuadHelper
+from quadruples import Quad
+
+class LoopUnrolling:
+    """
+    The LoopUnrolling class replaces the for loops with constant bounds by copies of their body.
+
+    When the loop variable starts at a constant and is compared with a constant, the number of iterations is known at
+    compile time. A loop whose copies fit in the size limit is unrolled fully: the header is removed and every copy
+    reads the value the loop variable has in its iteration as a constant, so the later optimizations can fold it. The
+    final value of the loop variable is still assigned after the last copy. A larger loop without array accesses is
+    unrolled partially, where its body runs several times for each check of the condition and the iterations that are
+    left over are copied before the loop. Loops with array accesses keep their shape so the bounds checks and addresses
+    can still be optimized on their loop variable. When there is a profile, the loops of the functions that never ran
+    are left as they are, and the functions that executed a large share of the program can grow more.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+        max_size (int): The maximum number of quadruples the copies of a loop body can add up to.
+        factor (int): The number of copies of the body in a partially unrolled loop.
+        hot_factor (int): The number of times the size limit is multiplied for the functions the profile shows as hot.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Unroll the for loops with constant bounds of every function.
+        unroll_loop(program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop, variable: InductionVariable) -> bool:
+            Unroll a for loop fully or partially if its number of iterations is known.
+        get_start_value(program: ProgramFlowGraph, loop: Loop, variable: InductionVariable) -> int | None:
+            Get the constant value the loop variable has when entering the loop.
+        get_constant_value(program: ProgramFlowGraph, address: int) -> int | None:
+            Get the integer stored at a constant address.
+        copy_body(body: list[BasicBlock], header: BasicBlock, next_block: BasicBlock, addresses: dict, removed: list[Quad]) -> list[BasicBlock]:
+            Copy the blocks of a loop body, where the jumps back to the header go to another block.
+    """
+
+    name = "unroll"
+    level = 2
+    max_size = 64
+    factor = 4
+    hot_factor = 2
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Unroll the for loops with constant bounds of every function.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            # Copying the loops of a function that never ran only makes the program larger
+            if program.profile is not None and program.profile.is_cold(graph.name):
+                continue
+            processed = set()
+            while True:
+                # Find the loops again since unrolling a loop changes the blocks of the loops around it
+                loops = [loop for loop in graph.find_loops() if loop.header not in processed]
+                if not loops:
+                    break
+                loop = loops[0]
+                processed.add(loop.header)
+                variable = InductionVariable.find_in_loop(program, graph, loop)
+                if variable is not None:
+                    self.unroll_loop(program, graph, loop, variable)
+
+    def unroll_loop(self, program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop, variable: InductionVariable) -> bool:
+        """
+        Unroll a for loop fully or partially if its number of iterations is known.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+            loop (Loop): The loop to unroll.
+            variable (InductionVariable): The loop variable.
+
+        Returns:
+            bool: True or False depending on if the loop was unrolled.
+        """
+        header = loop.header
+        index = graph.blocks.index(header)
+        body = [block for block in graph.blocks if block in loop.blocks and block is not header]
+        exit_block = header.jump_target
+        # The body has to follow the header and can only leave the loop through the header
+        if graph.blocks[index + 1:index + 1 + len(body)] != body or any(successor not in loop.blocks for block in body for successor in block.successors):
+            return False
+        start = self.get_start_value(program, loop, variable)
+        end = self.get_constant_value(program, variable.end_address)
+        if start is None or end is None:
+            return False
+        iterations = max(end - start, 0)
+        size = sum(len(block.quads) for block in body)
+        after = graph.blocks[index + 1 + len(body):]
+        address = variable.address
+        max_size = self.max_size * self.hot_factor if program.profile is not None and program.profile.is_hot(graph.name) else self.max_size
+        if iterations * size <= max_size:
+            # The increment is replaced by the constant value of the loop variable in the next copy
+            increment = variable.increment_quad
+            removed = [increment]
+            latch = next(block for block in body if any(quad is increment for quad in block.quads))
+            position = [id(quad) for quad in latch.quads].index(id(increment))
+            if increment.operator == "=":
+                removed.append(latch.quads[position - 1])
+                temporal = increment.left_address
+                if sum(temporal in QuadHelper.get_used_addresses(quad) for block in graph.blocks for quad in block.quads) != 1:
+                    return False
+            # A function called in the body can read a global loop variable
+            has_call = any(quad.operator == "GOSUB" for block in body for quad in block.quads)
+            keep_values = QuadHelper.is_global_address(address) and has_call
+            blocks = []
+            next_block = exit_block
+            for i in reversed(range(iterations)):
+                constant = program.constant_memory_manager.find_memory_address(start + i)
+                copy = self.copy_body(body, header, next_block, {address: constant}, removed)
+                program.copy_branch_counts(body, copy)
+                if keep_values or i == iterations - 1:
+                    value = program.constant_memory_manager.find_memory_address(start + i + 1)
+                    copy[body.index(latch)].add_quad_before_exit(Quad("=", value, None, address))
+                blocks = copy + blocks
+                next_block = copy[0]
+            graph.blocks = graph.blocks[:index] + blocks + after
+        else:
+            has_ptr = any(QuadHelper.is_ptr_address(used) for block in body for quad in block.quads for used in QuadHelper.get_used_addresses(quad))
+            if has_ptr or iterations < self.factor or size * self.factor > max_size:
+                return False
+            # The copies inside the loop check the condition once and the iterations left over run before the first check
+            chains = []
+            for count in [iterations % self.factor, self.factor]:
+                chain = []
+                next_block = header
+                for _ in range(count):
+                    copy = self.copy_body(body, header, next_block, {}, [])
+                    program.copy_branch_counts(body, copy)
+                    chain = copy + chain
+                    next_block = copy[0]
+                chains.append(chain)
+            graph.blocks = graph.blocks[:index] + chains[0] + [header] + chains[1] + after
+        graph.compute_edges()
+        return True
+
+    def get_start_value(self, program: ProgramFlowGraph, loop: Loop, variable: InductionVariable) -> int | None:
+        """
+        Get the constant value the loop variable has when entering the loop.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            loop (Loop): The loop to inspect.
+            variable (InductionVariable): The loop variable.
+
+        Returns:
+            int | None: The value assigned to the loop variable in the preheader, or None if it is not a known constant.
+        """
+        preheader = loop.preheader
+        if [block for block in loop.header.predecessors if block not in loop.blocks] != [preheader]:
+            return None
+        for quad in reversed(preheader.quads):
+            if quad.operator == "GOSUB" and QuadHelper.is_global_address(variable.address):
+                return None
+            if QuadHelper.get_defined_address(quad) == variable.address:
+                if quad.operator == "=" and QuadHelper.is_constant_address(quad.left_address):
+                    return self.get_constant_value(program, quad.left_address)
+                return None
+        return None
+
+    def get_constant_value(self, program: ProgramFlowGraph, address: int) -> int | None:
+        """
+        Get the integer stored at a constant address.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            address (int): The address to be read.
+
+        Returns:
+            int | None: The integer stored at the address, or None if the address does not store an integer constant.
+        """
+        if not QuadHelper.is_constant_address(address):
+            return None
+        value = program.constant_memory_manager[address]
+        return value if type(value) == int else None
+
+    def copy_body(self, body: list[BasicBlock], header: BasicBlock, next_block: BasicBlock, addresses: dict, removed: list[Quad]) -> list[BasicBlock]:
+        """
+        Copy the blocks of a loop body, where the jumps back to the header go to another block.
+
+        Parameters:
+            body (list[BasicBlock]): The blocks of the loop without its header, in layout order.
+            header (BasicBlock): The header of the loop.
+            next_block (BasicBlock): The block the copy continues into, or None if it is linked later.
+            addresses (dict): A dictionary with the address to read instead of each address.
+            removed (list[Quad]): The quadruples that are left out of the copy.
+
+        Returns:
+            list[BasicBlock]: The copied blocks.
+        """
+        copies = {block: BasicBlock([QuadHelper.replace_used_addresses(quad, addresses) for quad in block.quads if all(quad is not other for other in removed)]) for block in body}
+        for block, copy in copies.items():
+            if block.jump_target is header:
+                copy.jump_target = next_block
+            else:
+                copy.jump_target = copies.get(block.jump_target, block.jump_target)
+        return list(copies.values())
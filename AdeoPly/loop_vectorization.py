@@ -0,0 +1,565 @@
+from control_flow_graph import BasicBlock, ControlFlowGraph, Loop, ProgramFlowGraph
+from induction_variable import InductionVariable
+from quad_helper import QuadHelper
+from quadruples import Quad
+from semantic_cube import SemanticCube
+
+class LoopVectorization:
+    """
+    The LoopVectorization class runs the for loops that map or reduce arrays as a single vector operation.
+
+    A nest of up to three for loops qualifies when each loop only contains the next one, and the innermost loop computes
+    an arithmetic value of integers and floats from array elements, invariant values and the loop variables, where
+    every index is affine in the loop variables. The value is either stored in an element that changes in every
+    iteration (a map) or added to a single variable or to an element that only moves with the outer loops (a reduction),
+    which can be set to its initial value right before the inner loops, like the sum of a matrix multiplication. The
+    preheader of the outermost loop runs a VMAP or VREDUCE with the shape of the nest followed by VOUT quadruples with
+    the values the loop variables and the accumulator have at the end. The loops are kept after it, and they run no
+    iteration when the operation ran, or all of them when it could not run exactly.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+        max_depth (int): The maximum number of nested loops that are run as one operation.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Replace the iterations of the loops over arrays of every function with vector operations.
+        find_nest(program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop) -> list | None:
+            Find the loops nested in a loop, each one the only content of the one around it.
+        vectorize_nest(program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop) -> bool:
+            Add a vector operation that runs all the iterations of a nest of loops before it.
+        get_iteration_quads(loop: Loop, variable: InductionVariable) -> list[Quad]:
+            Get the quadruples of the latch of a loop that are not its jump or the increment of its variable.
+        find_reduced_levels(index: dict, variables: list[int]) -> int | None:
+            Find the number of outer loops the element an accumulator is stored in moves with.
+        find_initial_value(program: ProgramFlowGraph, entry: BasicBlock, variables: list[int], written: set[int], store: tuple, checks: list) -> int | None:
+            Find the value an element accumulator is set to before the loops that add to it.
+        evaluate(program: ProgramFlowGraph, quads: list[Quad], state: dict) -> bool:
+            Compute the value of every address a list of quadruples writes in terms of the values before them.
+        read(program: ProgramFlowGraph, address: int, state: dict) -> tuple | None:
+            Get the value of an address while the quadruples of an iteration are evaluated.
+        combine(program: ProgramFlowGraph, quad: Quad, left: tuple, right: tuple, state: dict) -> tuple | None:
+            Get the value of an arithmetic quadruple.
+        get_term(value: tuple, accumulator: tuple) -> tuple | None:
+            Get the value that an iteration adds to an accumulator.
+        contains(value: tuple, predicate: Callable) -> bool:
+            Check if a value or any of its operands meets a condition.
+        is_global_element(program: ProgramFlowGraph, address: int) -> bool:
+            Check if an address is an element of a global array.
+        get_value_type(value: tuple) -> str:
+            Get the type of a value.
+        add_affine(left: dict, right: dict, factor: int) -> dict:
+            Add an affine value multiplied by a factor to another one.
+        encode_value(program: ProgramFlowGraph, value: tuple, variables: list[int]) -> tuple[str, list[int]]:
+            Get the form in postfix and the operands of a value.
+        encode_affine(program: ProgramFlowGraph, affine: dict, variables: list[int]) -> list[int]:
+            Get the operands of an affine value.
+        get_used_outside(program: ProgramFlowGraph, graph: ControlFlowGraph, blocks: set[BasicBlock]) -> set[int]:
+            Get the addresses read by the quadruples outside of some blocks.
+    """
+
+    name = "vectorize"
+    level = 2
+    max_depth = 3
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Replace the iterations of the loops over arrays of every function with vector operations.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            processed = set()
+            while True:
+                # Work from the outermost loop so a whole nest becomes a single operation
+                loops = [loop for loop in reversed(graph.find_loops()) if loop.header not in processed]
+                if not loops:
+                    break
+                loop = loops[0]
+                processed.add(loop.header)
+                if self.vectorize_nest(program, graph, loop):
+                    processed |= loop.blocks
+
+    def find_nest(self, program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop) -> list | None:
+        """
+        Find the loops nested in a loop, each one the only content of the one around it.
+
+        Every loop must be a for loop whose body is the block that starts the next loop, which ends by assigning the
+        start of its variable, the next loop and the increment of its variable. The innermost loop has a single block.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+            loop (Loop): The outermost loop.
+
+        Returns:
+            list | None: The loop and its variable for each level, from the outermost, or None if the loops are not nested that way.
+        """
+        loops = graph.find_loops()
+        nest = []
+        while True:
+            header = loop.header
+            if len(loop.latches) != 1 or len(nest) == self.max_depth:
+                return None
+            latch = loop.latches[0]
+            if loop.blocks == {header, latch}:
+                if graph.get_next_block(header) is not latch or latch.successors != [header]:
+                    return None
+                inner = None
+            else:
+                inner_loops = [other for other in loops if other.header in loop.blocks and other.header is not header]
+                if not inner_loops:
+                    return None
+                inner = max(inner_loops, key=lambda other: len(other.blocks))
+                entry = graph.get_next_block(header)
+                # The block that starts the inner loop must be its preheader, so finding its variable adds no block
+                if (loop.blocks != inner.blocks | {header, entry, latch} or entry in inner.blocks or latch in inner.blocks or
+                        entry.successors != [inner.header] or graph.get_next_block(entry) is not inner.header or entry.ends_in_jump() or
+                        inner.header.jump_target is not latch or latch.successors != [header]):
+                    return None
+            variable = InductionVariable.find_in_loop(program, graph, loop)
+            if variable is None or QuadHelper.get_type_from_address(variable.address) != "int":
+                return None
+            nest.append((loop, variable))
+            if inner is None:
+                return nest
+            loop = inner
+
+    def vectorize_nest(self, program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop) -> bool:
+        """
+        Add a vector operation that runs all the iterations of a nest of loops before it.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+            loop (Loop): The outermost loop.
+
+        Returns:
+            bool: True or False depending on if the vector operation was added.
+        """
+        nest = self.find_nest(program, graph, loop)
+        if nest is None:
+            return False
+        variables = [variable.address for _, variable in nest]
+        written = program.get_loop_writes(loop)
+        # Each loop runs from a start assigned right before it to an end that does not change inside the nest
+        starts = [variables[0]]
+        entries = []
+        for level in range(1, len(nest)):
+            entry = nest[level][0].preheader
+            assignment = entry.get_last_quad()
+            if assignment is None or assignment.operator != "=" or assignment.return_address != variables[level]:
+                return False
+            starts.append(assignment.left_address)
+            entries.append(entry.quads[:-1])
+        ends = [variable.end_address for _, variable in nest]
+        for address in starts[1:] + ends:
+            if (QuadHelper.get_type_from_address(address) != "int" or QuadHelper.is_ptr_address(address) or address in written or
+                    self.is_global_element(program, address)):
+                return False
+        # The latches of the outer loops only increment their variables
+        if any(self.get_iteration_quads(outer, variable) for outer, variable in nest[:-1]):
+            return False
+        state = {"variables": variables, "written": written, "env": {}, "bases": {}, "checks": [], "stores": [], "accumulator": None, "reduce": True}
+        if not self.evaluate(program, self.get_iteration_quads(*nest[-1]), state):
+            return False
+        env = state["env"]
+        stores = state["stores"]
+        accumulator = state["accumulator"]
+        checks = state["checks"]
+        args = [len(nest)] + [("address", address) for pair in zip(starts, ends) for address in pair]
+        init = None
+        if accumulator is not None:
+            # A single variable is the accumulator when the iteration only adds to it
+            term = self.get_term(env.get(accumulator), ("acc", accumulator, QuadHelper.get_type_from_address(accumulator)))
+            if stores or term is None or any(entries):
+                return False
+            operator, kind = "VREDUCE", "s"
+            targets = [accumulator]
+        else:
+            if len(stores) != 1:
+                return False
+            start, index, value = stores[0]
+            element_type = QuadHelper.get_type_from_address(start)
+            address = self.add_affine(index, {None: start}, 1)
+            term = None
+            if index.get(variables[-1], 0) == 0:
+                term = self.get_term(value, ("load", start, index, element_type))
+            if term is not None:
+                # An element accumulator moves with the outer loops and can be set to its initial value before the rest
+                if self.contains(term, lambda node: node[0] == "load" and node[1] == start) or self.get_value_type(value) != element_type:
+                    return False
+                reduced = self.find_reduced_levels(index, variables)
+                if reduced is None or any(entry for level, entry in enumerate(entries) if level + 1 != reduced):
+                    return False
+                if 0 < reduced < len(nest) and entries[reduced - 1]:
+                    init = self.find_initial_value(program, nest[reduced][0].preheader, variables[:reduced], written, stores[0], checks)
+                    if init is None:
+                        return False
+                operator, kind = "VREDUCE", "a" if init is None else "ia"
+                args += ([] if init is None else [("address", init)]) + self.encode_affine(program, address, variables)
+            else:
+                # Every iteration of a map stores its own element, and reads the elements of the same array only there
+                if (any(entries) or any(index.get(variable, 0) == 0 for variable in variables) or self.contains(value, lambda node: node[0] == "load" and node[1] == start and node[2] != index) or
+                        (element_type == "int" and self.get_value_type(value) != "int")):
+                    return False
+                operator, kind = "VMAP", None
+                args += self.encode_affine(program, address, variables)
+                term = value
+            targets = []
+        if self.contains(term, lambda node: node[0] == "acc"):
+            return False
+        if accumulator is not None:
+            args.append(("address", accumulator))
+        form, operands = self.encode_value(program, term, variables)
+        args += operands
+        for index, size in checks:
+            args += self.encode_affine(program, index, variables) + [size]
+        # The temporals of the loops are not written when the operation runs, so nothing after them can read them
+        defined = {QuadHelper.get_defined_address(quad) for block in loop.blocks for quad in block.quads} - {None} - set(variables + targets)
+        if defined & self.get_used_outside(program, graph, loop.blocks):
+            return False
+        constants = program.constant_memory_manager
+        args = [arg[1] if type(arg) == tuple else constants.find_memory_address(arg) for arg in args]
+        quads = []
+        for i in range(0, len(args), 3):
+            group = args[i:i + 3]
+            quads.append(Quad("VARG", *(group + [None] * (3 - len(group)))))
+        kind_address = constants.find_memory_address(f'"{kind}"') if kind is not None else None
+        quads.append(Quad(operator, constants.find_memory_address(f'"{form}"'), kind_address, None))
+        quads += [Quad("VOUT", None, None, address) for address in variables + targets]
+        for quad in quads:
+            loop.preheader.add_quad_before_exit(quad)
+        return True
+
+    def get_iteration_quads(self, loop: Loop, variable: InductionVariable) -> list[Quad]:
+        """
+        Get the quadruples of the latch of a loop that are not its jump or the increment of its variable.
+
+        Parameters:
+            loop (Loop): The loop.
+            variable (InductionVariable): The variable of the loop.
+
+        Returns:
+            list[Quad]: The quadruples of the latch, without the ones that only belong to the for loop.
+        """
+        quads = loop.latches[0].quads[:-1]
+        increment = quads.index(variable.increment_quad)
+        # The increment is computed in a temporal unless it was coalesced with the assignment
+        removed = [increment - 1, increment] if variable.increment_quad.operator == "=" else [increment]
+        return [quad for i, quad in enumerate(quads) if i not in removed]
+
+    def find_reduced_levels(self, index: dict, variables: list[int]) -> int | None:
+        """
+        Find the number of outer loops the element an accumulator is stored in moves with.
+
+        Parameters:
+            index (dict): The affine index of the element.
+            variables (list[int]): The loop variables, from the outermost.
+
+        Returns:
+            int | None: The number of outer loops, or None if the element moves with a loop inside one that does not move it.
+        """
+        levels = [index.get(variable, 0) != 0 for variable in variables]
+        reduced = levels.index(False)
+        return reduced if not any(levels[reduced:]) else None
+
+    def find_initial_value(self, program: ProgramFlowGraph, entry: BasicBlock, variables: list[int], written: set[int], store: tuple, checks: list) -> int | None:
+        """
+        Find the value an element accumulator is set to before the loops that add to it.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            entry (BasicBlock): The block that starts the loops that add to the element.
+            variables (list[int]): The variables of the loops around that block.
+            written (set[int]): The addresses written by the loops.
+            store (tuple): The element the iterations store the sum in.
+            checks (list): The bounds checks of the nest, which get the checks of the block.
+
+        Returns:
+            int | None: The constant or invariant address with the initial value, or None if the block does something else.
+        """
+        state = {"variables": variables, "written": written, "env": {}, "bases": {}, "checks": [], "stores": [], "accumulator": None, "reduce": False}
+        if not self.evaluate(program, entry.quads[:-1], state) or len(state["stores"]) != 1:
+            return None
+        start, index, value = state["stores"][0]
+        if start != store[0] or index != store[1]:
+            return None
+        if value[0] == "scalar":
+            address = value[1]
+        elif value[0] == "affine" and list(value[1]) == [None]:
+            address = program.constant_memory_manager.find_memory_address(value[1][None])
+        elif value[0] == "affine" and value[1].get(None) == 0 and len(value[1]) == 2:
+            address = [key for key, coefficient in value[1].items() if key is not None and coefficient == 1]
+            address = address[0] if address and address[0] not in variables else None
+        else:
+            return None
+        checks += state["checks"]
+        return address
+
+    def evaluate(self, program: ProgramFlowGraph, quads: list[Quad], state: dict) -> bool:
+        """
+        Compute the value of every address a list of quadruples writes in terms of the values before them.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            quads (list[Quad]): The quadruples to evaluate.
+            state (dict): The loop variables, the addresses written by the loops and the values, bounds checks and stores found so far.
+
+        Returns:
+            bool: True or False depending on if every quadruple is a bounds check, a pointer to an element or arithmetic on numbers.
+        """
+        env = state["env"]
+        for quad in quads:
+            operator = quad.operator
+            if operator == "VER":
+                index = self.read(program, quad.left_address, state)
+                constants = program.constant_memory_manager
+                if (index is None or index[0] != "affine" or not QuadHelper.is_constant_address(quad.right_address) or
+                        not QuadHelper.is_constant_address(quad.return_address) or constants[quad.right_address] != 0 or type(constants[quad.return_address]) != int):
+                    return False
+                state["checks"].append((index[1], constants[quad.return_address]))
+            elif operator == "PTR":
+                base = state["bases"].get(quad.left_address)
+                if base is None:
+                    return False
+                env[quad.return_address] = ("ptr",) + base
+            elif operator in QuadHelper.arithmetic_operators + ["="]:
+                left = self.read(program, quad.left_address, state)
+                if left is None:
+                    return False
+                # An address that is written again is no longer the address of an element
+                state["bases"].pop(quad.return_address, None)
+                if operator == "=":
+                    value = left
+                else:
+                    right = self.read(program, quad.right_address, state)
+                    value = self.combine(program, quad, left, right, state) if right is not None else None
+                    if value is None:
+                        return False
+                target = quad.return_address
+                if QuadHelper.is_ptr_address(target):
+                    pointer = env.get(target)
+                    if pointer is None or pointer[0] != "ptr":
+                        return False
+                    state["stores"].append((pointer[1], pointer[2], value))
+                elif (target in state["variables"] or QuadHelper.is_constant_address(target) or self.is_global_element(program, target) or
+                        QuadHelper.get_type_from_address(target) != self.get_value_type(value)):
+                    return False
+                else:
+                    env[target] = value
+            else:
+                return False
+        return True
+
+    def read(self, program: ProgramFlowGraph, address: int, state: dict) -> tuple | None:
+        """
+        Get the value of an address while the quadruples of an iteration are evaluated.
+
+        A value is an affine integer ('affine'), a number that does not change in the loops ('scalar'), an element at an
+        affine index of an array ('load'), an operator on two values ('op') or the accumulator of a reduction ('acc').
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            address (int): The address to read.
+            state (dict): The state of the evaluation.
+
+        Returns:
+            tuple | None: The value, or None if it is not a number or it changes in the loops in another way.
+        """
+        env = state["env"]
+        if address in env:
+            value = env[address]
+            if value[0] == "ptr":
+                return ("load", value[1], value[2], QuadHelper.get_type_from_address(value[1]))
+            return value
+        if address is None or QuadHelper.is_ptr_address(address):
+            return None
+        if address in state["variables"]:
+            return ("affine", {None: 0, address: 1})
+        v_type = QuadHelper.get_type_from_address(address)
+        if QuadHelper.is_constant_address(address):
+            value = program.constant_memory_manager[address]
+            if type(value) == int:
+                return ("affine", {None: value})
+            return ("scalar", address, "float") if type(value) == float else None
+        if v_type not in ["int", "float"] or self.is_global_element(program, address):
+            return None
+        if address in state["written"]:
+            # Only the accumulator of a reduction is read before an iteration writes it
+            if not state["reduce"] or state["accumulator"] not in [None, address]:
+                return None
+            state["accumulator"] = address
+            return ("acc", address, v_type)
+        return ("affine", {None: 0, address: 1}) if v_type == "int" else ("scalar", address, v_type)
+
+    def combine(self, program: ProgramFlowGraph, quad: Quad, left: tuple, right: tuple, state: dict) -> tuple | None:
+        """
+        Get the value of an arithmetic quadruple.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            quad (Quad): The arithmetic quadruple.
+            left (tuple): The value of its left operand.
+            right (tuple): The value of its right operand.
+            state (dict): The state of the evaluation, which keeps the addresses of elements found.
+
+        Returns:
+            tuple | None: The value, or None if its type does not come from the semantic cube.
+        """
+        operator = quad.operator
+        if left[0] == "affine" and right[0] == "affine":
+            if operator in ["+", "-"]:
+                # The address of an element adds the base address of its array to the index last
+                if operator == "+" and QuadHelper.is_constant_address(quad.right_address):
+                    start = program.constant_memory_manager[quad.right_address]
+                    if any(start == base for base, _ in program.function_directory.arrays):
+                        state["bases"][quad.return_address] = (start, left[1])
+                return ("affine", self.add_affine(left[1], right[1], 1 if operator == "+" else -1))
+            if operator == "*" and list(right[1]) == [None]:
+                return ("affine", self.add_affine({None: 0}, left[1], right[1][None]))
+            if operator == "*" and list(left[1]) == [None]:
+                return ("affine", self.add_affine({None: 0}, right[1], left[1][None]))
+        v_type = SemanticCube.get_result_type(self.get_value_type(left), operator, self.get_value_type(right))
+        if v_type not in ["int", "float"]:
+            return None
+        return ("op", operator, left, right, v_type)
+
+    def get_term(self, value: tuple | None, accumulator: tuple) -> tuple | None:
+        """
+        Get the value that an iteration adds to an accumulator.
+
+        Parameters:
+            value (tuple | None): The value the iteration leaves in the accumulator.
+            accumulator (tuple): The value the accumulator had before the iteration.
+
+        Returns:
+            tuple | None: The value added, or None if the iteration does not only add a value that does not read the accumulator.
+        """
+        if value is None or value[0] != "op" or value[1] != "+":
+            return None
+        if value[2] == accumulator:
+            term = value[3]
+        elif value[3] == accumulator:
+            term = value[2]
+        else:
+            return None
+        return term if not self.contains(term, lambda node: node == accumulator) else None
+
+    def contains(self, value: tuple, predicate) -> bool:
+        """
+        Check if a value or any of its operands meets a condition.
+
+        Parameters:
+            value (tuple): The value to inspect.
+            predicate (Callable): The condition.
+
+        Returns:
+            bool: True or False depending on if the condition is met.
+        """
+        if predicate(value):
+            return True
+        return value[0] == "op" and (self.contains(value[2], predicate) or self.contains(value[3], predicate))
+
+    def is_global_element(self, program: ProgramFlowGraph, address: int) -> bool:
+        """
+        Check if an address is an element of a global array.
+
+        The elements of local arrays are only reached through pointers until the constants are folded, and the same
+        local addresses are the temporals of other functions, so only the global ones are checked.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            address (int): The address to be checked.
+
+        Returns:
+            bool: True or False depending on if the address belongs to a global array.
+        """
+        return QuadHelper.is_global_address(address) and program.is_array_address(address)
+
+    def get_value_type(self, value: tuple) -> str:
+        """
+        Get the type of a value.
+
+        Parameters:
+            value (tuple): The value.
+
+        Returns:
+            str: The type of the value.
+        """
+        return "int" if value[0] == "affine" else value[-1]
+
+    def add_affine(self, left: dict, right: dict, factor: int) -> dict:
+        """
+        Add an affine value multiplied by a factor to another one.
+
+        Parameters:
+            left (dict): The coefficient of every address and the constant, whose key is None.
+            right (dict): The affine value to add.
+            factor (int): The factor the second value is multiplied by.
+
+        Returns:
+            dict: The sum, without the addresses whose coefficient is zero.
+        """
+        result = dict(left)
+        for address, coefficient in right.items():
+            result[address] = result.get(address, 0) + factor * coefficient
+        return {address: coefficient for address, coefficient in result.items() if address is None or coefficient != 0}
+
+    def encode_value(self, program: ProgramFlowGraph, value: tuple, variables: list[int]) -> tuple[str, list[int]]:
+        """
+        Get the form in postfix and the operands of a value.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            value (tuple): The value.
+            variables (list[int]): The loop variables, from the outermost.
+
+        Returns:
+            tuple[str, list[int]]: The form and its operands, where the numbers are constants and the addresses are tuples.
+        """
+        if value[0] == "affine":
+            return ("v", self.encode_affine(program, value[1], variables))
+        if value[0] == "scalar":
+            return ("s", [("address", value[1])])
+        if value[0] == "load":
+            return ("a", self.encode_affine(program, self.add_affine(value[2], {None: value[1]}, 1), variables))
+        left_form, left_args = self.encode_value(program, value[2], variables)
+        right_form, right_args = self.encode_value(program, value[3], variables)
+        return (left_form + right_form + value[1], left_args + right_args)
+
+    def encode_affine(self, program: ProgramFlowGraph, affine: dict, variables: list[int]) -> list[int]:
+        """
+        Get the operands of an affine value.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            affine (dict): The affine value.
+            variables (list[int]): The loop variables, from the outermost.
+
+        Returns:
+            list[int]: The constant, the number of terms, each invariant address with its coefficient and the coefficient of each loop variable.
+        """
+        terms = [(address, coefficient) for address, coefficient in affine.items() if address is not None and address not in variables]
+        args = [affine.get(None, 0), len(terms)]
+        for address, coefficient in terms:
+            args += [("address", address), coefficient]
+        return args + [affine.get(variable, 0) for variable in variables]
+
+    def get_used_outside(self, program: ProgramFlowGraph, graph: ControlFlowGraph, blocks: set[BasicBlock]) -> set[int]:
+        """
+        Get the addresses read by the quadruples outside of some blocks.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function with the blocks.
+            blocks (set[BasicBlock]): The blocks to skip.
+
+        Returns:
+            set[int]: The addresses read in the rest of the function, and the global addresses read by the other functions.
+        """
+        used = {address for block in graph.blocks if block not in blocks for quad in block.quads for address in QuadHelper.get_used_addresses(quad)}
+        quads = [quad for other in program.graphs if other is not graph for block in other.blocks for quad in block.quads] + program.prologue
+        return used | {address for quad in quads for address in QuadHelper.get_used_addresses(quad) if QuadHelper.is_global_address(address)}
@@ -13,13 +13,15 @@ class TypeSpace(Generic[T]):
         values (List[T | None]): A list to store the values in the type space.
     
     Methods:
-        __init__(initial_address: int, resource_size: Optional[int] = None):
+        __init__(initial_address: int, resource_size: Optional[int] = None, initial_values: Optional[Tuple] = None):
             Initialize a new instance of the TypeSpace class.
     """
 
-    def __init__(self, initial_address: int, resource_size: Optional[int] = None):
+    def __init__(self, initial_address: int, resource_size: Optional[int] = None, initial_values: Optional[Tuple] = None):
         self.initial_address = initial_address
-        if resource_size is None:
+        if initial_values is not None:
+            self.values = list(initial_values)
+        elif resource_size is None:
             self.values = []
         else:
             self.values = [None for _ in range(resource_size)]
@@ -36,12 +38,10 @@ class MemoryManager:
         ptrs_space (TypeSpace[int | None]): The TypeSpace for pointers.
     
     Methods:
-        __init__(start_address: int, resources: Optional[Tuple[int, int, int, int, int]] = None):
+        __init__(start_address: int, resources: Optional[Tuple[int, int, int, int, int]] = None, initial_values: Optional[Tuple] = None):
             Initialize a new instance of the MemoryManager class.
         add_value_to_typespace(typespace: TypeSpace, value: int | None) -> int:
             Adds a new value to the type space.
-        add_ptr(address: int, value: int):
-            Add a new pointer to the pointer type space.
         reserve_space(v_type: str, size: int = 1) -> int:
             Reserves space for a variable that hasn't been assigned yet, only declared.
         get_typespace_from_address(address: int) -> TypeSpace:
@@ -56,6 +56,8 @@ class MemoryManager:
             Get the number of resources (values) per type.
         clear_memory_values():
             Clear the values stored in the type spaces of the memory manager.
+        get_values() -> Tuple:
+            Get the values stored in every type space of the memory manager.
         __getitem__(address: int) -> int | float | str | bool | None:
             Get the value at a memory address.
         __setitem__(address: int, value: int):
@@ -72,8 +74,15 @@ class MemoryManager:
     bools_space: TypeSpace[bool | None]
     ptrs_space: TypeSpace[int | None]
 
-    def __init__(self, start_address: int, resources: Optional[Tuple[int, int, int, int, int]] = None):
-        if resources is None:
+    def __init__(self, start_address: int, resources: Optional[Tuple[int, int, int, int, int]] = None, initial_values: Optional[Tuple] = None):
+        if initial_values is not None:
+            # The values of every type space are copied at once, in the order of the resources
+            self.ints_space = TypeSpace(start_address, initial_values=initial_values[0])
+            self.floats_space = TypeSpace(start_address  + SIZE, initial_values=initial_values[1])
+            self.strings_space = TypeSpace(start_address + SIZE * 2, initial_values=initial_values[2])
+            self.bools_space = TypeSpace(start_address + SIZE * 3, initial_values=initial_values[3])
+            self.ptrs_space = TypeSpace(start_address + SIZE * 4, initial_values=initial_values[4])
+        elif resources is None:
             self.ints_space = TypeSpace(start_address)
             self.floats_space = TypeSpace(start_address  + SIZE)
             self.strings_space = TypeSpace(start_address + SIZE * 2)
@@ -102,17 +111,6 @@ class MemoryManager:
         typespace.values.append(value)
         return typespace.initial_address + len(typespace.values) - 1
     
-    def add_ptr(self, address: int, value: int):
-        """
-        Add a new pointer to the pointer type space.
-
-        Parameters:
-            address (int): The memory address where the pointer will be stored.
-            value (int): The value of the pointer.
-        """
-        typespace = self.ptrs_space
-        typespace.values[address - typespace.initial_address] = value
-    
     def reserve_space(self, v_type: str, size: int = 1) -> int:
         """
         Reserves space for a variable that hasn't been assigned yet, only declared.
@@ -235,6 +233,15 @@ class MemoryManager:
         self.bools_space.values.clear()
         self.ptrs_space.values.clear()
 
+    def get_values(self) -> Tuple:
+        """
+        Get the values stored in every type space of the memory manager.
+
+        Returns:
+            Tuple: The values of every type space, in the order of the resources.
+        """
+        return tuple(tuple(space.values) for space in [self.ints_space, self.floats_space, self.strings_space, self.bools_space, self.ptrs_space])
+
     def __getitem__(self, address: int) -> int | float | str | bool | None:
         """
         Get the value at a memory address.
@@ -304,4 +311,34 @@ class MemoryManager:
         for space_name, space in memory_spaces:
             print(space_name)
             for address, value in enumerate(space.values):
-                print(f"{address + space.initial_address}\t{value}")
\ No newline at end of file
+                print(f"{address + space.initial_address}\t{value}")
+
+class TrackedMemoryManager(MemoryManager):
+    """
+    The TrackedMemoryManager class is a memory manager that keeps the addresses whose values are set.
+
+    Attributes:
+        written (set[int]): The addresses set since the memory manager was created, including the elements set through a pointer.
+
+    Methods:
+        __init__(start_address: int, resources: Optional[Tuple[int, int, int, int, int]] = None, initial_values: Optional[Tuple] = None):
+            Initialize a new instance of the TrackedMemoryManager class.
+        __setitem__(address: int, value: int):
+            Set the value at a memory address and keep the address.
+    """
+
+    def __init__(self, start_address: int, resources: Optional[Tuple[int, int, int, int, int]] = None, initial_values: Optional[Tuple] = None):
+        super().__init__(start_address, resources, initial_values)
+        self.written = set()
+
+    def __setitem__(self, address: int, value: int):
+        """
+        Set the value at a memory address and keep the address.
+
+        Parameters:
+            address (int): The memory address.
+            value (int): The value to set.
+        """
+        # A value that is set again without changing still has to replace the value of an earlier write
+        self.written.add(address)
+        super().__setitem__(address, value)
@@ -0,0 +1,109 @@
+import time
+from block_ordering import BlockOrdering
+from bounds_check_elimination import BoundsCheckElimination
+from common_subexpression import CommonSubexpressionElimination
+from constant_folding import ConstantFolding
+from control_flow_graph import ProgramFlowGraph
+from copy_propagation import CopyPropagation
+from dead_code_elimination import DeadCodeElimination
+from function_directory import FunctionDirectory
+from function_inlining import FunctionInlining
+from function_specialization import FunctionSpecialization
+from indexed_addressing import IndexedAddressing
+from loop_inversion import LoopInversion
+from loop_invariant_motion import LoopInvariantCodeMotion
+from loop_unrolling import LoopUnrolling
+from loop_vectorization import LoopVectorization
+from memory_manager import MemoryManager
+from partial_evaluation import PartialEvaluation
+from profile_data import ProfileData
+from purity_analysis import PurityAnalysis
+from quadruples import Quadruples
+from strength_reduction import StrengthReduction
+from switch_lowering import SwitchLowering
+from tail_call import TailCallElimination
+from tree_shaking import TreeShaking
+
+class Optimizer:
+    """
+    The Optimizer class runs the optimizations over the control flow graphs of a compiled program.
+
+    The quadruples are split into the basic blocks of each function, every optimization enabled at the optimization
+    level runs over those blocks in order, and the blocks are laid out again as the final quadruples. Level 0 only replaces
+    the pointers to array elements with the indexed operands the virtual machine reads, level 1 runs the optimizations
+    inside blocks and removes the functions and addresses the program never uses, and level 2 adds the ones on loops
+    and calls and runs the start of the program that does not depend on its input at compile time. The counts of a
+    profiled run let the optimizations on loops, calls and block layout favor the code that ran most.
+
+    Attributes:
+        quadruples (Quadruples): The quadruples of the program.
+        function_directory (FunctionDirectory): The function directory of the program.
+        global_memory_manager (MemoryManager): The memory manager for the global memory, which stores the names of the functions.
+        constant_memory_manager (MemoryManager): The memory manager for the constants.
+        optimization_level (int): The optimization level, where each optimization only runs at its level or above.
+        time_passes (bool): Indicates if the time taken by each optimization is printed.
+        dump_ir (bool): Indicates if the basic blocks are printed after each optimization.
+        profile (ProfileData | None): The execution counts of a previous run of the program, or None if the optimizations only use the quadruples.
+        passes (list): The optimizations to run, in order.
+
+    Methods:
+        __init__(quadruples: Quadruples, function_directory: FunctionDirectory, global_memory_manager: MemoryManager, constant_memory_manager: MemoryManager, optimization_level: int, time_passes: bool, dump_ir: bool, profile: ProfileData | None):
+            Initialize a new instance of the Optimizer class.
+        optimize():
+            Run every optimization and replace the quadruples with the optimized ones.
+    """
+
+    def __init__(self, quadruples: Quadruples, function_directory: FunctionDirectory, global_memory_manager: MemoryManager, constant_memory_manager: MemoryManager, optimization_level: int = 2, time_passes: bool = False, dump_ir: bool = False, profile: ProfileData | None = None):
+        self.quadruples = quadruples
+        self.function_directory = function_directory
+        self.global_memory_manager = global_memory_manager
+        self.constant_memory_manager = constant_memory_manager
+        self.optimization_level = optimization_level
+        self.time_passes = time_passes
+        self.dump_ir = dump_ir
+        self.profile = profile
+        optimizations = [
+            FunctionSpecialization(),
+            FunctionInlining(),
+            LoopVectorization(),
+            LoopUnrolling(),
+            ConstantFolding(),
+            CommonSubexpressionElimination(),
+            CopyPropagation(),
+            LoopInvariantCodeMotion(),
+            BoundsCheckElimination(),
+            StrengthReduction(),
+            LoopInversion(),
+            DeadCodeElimination(),
+            TailCallElimination(),
+            SwitchLowering(),
+            BlockOrdering(),
+            PurityAnalysis(),
+            IndexedAddressing(),
+            PartialEvaluation(),
+            TreeShaking()
+        ]
+        self.passes = [optimization for optimization in optimizations if optimization.level <= optimization_level]
+
+    def optimize(self):
+        """
+        Run every optimization and replace the quadruples with the optimized ones.
+        """
+        start = time.perf_counter()
+        program = ProgramFlowGraph(self.quadruples, self.function_directory, self.global_memory_manager, self.constant_memory_manager, self.profile)
+        timings = [("cfg", time.perf_counter() - start)]
+        if self.dump_ir:
+            program.print("IR after cfg")
+        for optimization in self.passes:
+            start = time.perf_counter()
+            optimization.run(program)
+            timings.append((optimization.name, time.perf_counter() - start))
+            if self.dump_ir:
+                program.print(f"IR after {optimization.name}")
+        self.quadruples.quadruples = program.to_quadruples()
+        self.quadruples.instr_ptr = len(self.quadruples.quadruples)
+        if self.time_passes:
+            print("\n--Optimization Time--")
+            for name, seconds in timings:
+                print(f"{name:<8} {seconds * 1000:9.3f} ms")
+            print(f"{'total':<8} {sum(seconds for _, seconds in timings) * 1000:9.3f} ms")
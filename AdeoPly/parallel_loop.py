@@ -0,0 +1,176 @@
+import math
+from memory_manager import TrackedMemoryManager
+from program_error import ProgramError, raise_program_error
+from quad_helper import START_FUNCTION_MEMORY
+
+class ParallelLoop:
+    """
+    The ParallelLoop class runs the iterations of a parallel for loop in a pool of worker processes.
+
+    When the condition of a parallel loop is checked for the first time, its remaining iterations are split in chunks
+    of consecutive values of the loop variable, one for each worker. Every worker gets a copy of the global memory and
+    of the memory of the current function, runs the quadruples of the loop from the PARALLEL quadruple until its loop
+    variable reaches the end of its chunk and sends back the values of the addresses it changed. The compiler already
+    checked that an iteration does not read what another one writes, so the changes are applied in the order of the
+    chunks, which leaves the value of the last iteration that wrote each address like running them one by one does.
+    When a chunk stops with an error, the changes of the chunks before it and the ones it made before the error are
+    applied and the error is raised. The memory is copied to the workers instead of shared, since the integers have
+    no fixed size and the elements of an array can be uninitialized.
+
+    Attributes:
+        worker (VirtualMachine | None): The virtual machine of the program in a worker process, or None in the main process.
+
+    Methods:
+        run(virtual_machine: VirtualMachine, variable: int, end: int, condition: int):
+            Run the remaining iterations of a parallel loop in the worker processes.
+        get_pool(virtual_machine: VirtualMachine) -> ProcessPoolExecutor | None:
+            Get the pool of worker processes of a virtual machine, which is started with the first parallel loop.
+        start_worker(virtual_machine: VirtualMachine):
+            Keep the virtual machine with the program in a worker process.
+        run_chunk(global_values: tuple, frame_values: tuple, position: int, variable: int, first: int, last: int | float) -> tuple:
+            Run the iterations of a chunk in a worker process.
+        get_writes(memory: TrackedMemoryManager, values: tuple) -> list:
+            Get the addresses a chunk changed with their values.
+    """
+
+    worker = None
+
+    @staticmethod
+    def run(virtual_machine, variable: int, end: int, condition: int):
+        """
+        Run the remaining iterations of a parallel loop in the worker processes.
+
+        Parameters:
+            virtual_machine (VirtualMachine): The virtual machine that reached the PARALLEL quadruple.
+            variable (int): The address of the loop variable.
+            end (int): The address of the end of the loop.
+            condition (int): The address of the condition of the loop, which is false once the iterations ran.
+        """
+        variable_memory = virtual_machine.get_memory_manager_type(variable)
+        start = variable_memory[variable]
+        end_value = virtual_machine.get_memory_manager_type(end)[end]
+        if start is None or end_value is None:
+            return
+        count = math.ceil(end_value - start)
+        chunks = min(virtual_machine.workers, count)
+        if chunks < 2:
+            return
+        pool = ParallelLoop.get_pool(virtual_machine)
+        if pool is None:
+            return
+        from concurrent.futures.process import BrokenProcessPool
+        # The last chunk runs until the condition of the loop fails, which also works for an end that is not an integer
+        bounds = [start + count * chunk // chunks for chunk in range(chunks)] + [end_value]
+        global_values = virtual_machine.global_memory_manager.get_values()
+        frame_values = virtual_machine.function_memory_manager.get_values()
+        position = virtual_machine.quadruples.instr_ptr - 1
+        try:
+            futures = [pool.submit(ParallelLoop.run_chunk, global_values, frame_values, position, variable, first, last) for first, last in zip(bounds, bounds[1:])]
+            results = [future.result() for future in futures]
+        except BrokenProcessPool:
+            # The memory is only changed after every chunk finished, so the iterations can still run one by one
+            virtual_machine.workers = 1
+            return
+        for writes, error in results:
+            for address, value in writes:
+                # The values already have the type of their address
+                typespace = virtual_machine.get_memory_manager_type(address).get_typespace_from_address(address)
+                typespace.values[address - typespace.initial_address] = value
+            if error is not None:
+                raise_program_error(error[0], None, error[1])
+        virtual_machine.get_memory_manager_type(condition)[condition] = False
+
+    @staticmethod
+    def get_pool(virtual_machine):
+        """
+        Get the pool of worker processes of a virtual machine, which is started with the first parallel loop.
+
+        Parameters:
+            virtual_machine (VirtualMachine): The virtual machine that runs the program.
+
+        Returns:
+            ProcessPoolExecutor | None: The pool of worker processes, or None if processes cannot be started.
+        """
+        if virtual_machine.parallel_pool is None:
+            # The processes are only imported when a program runs a parallel loop, since they slow down the start of every execution
+            from concurrent.futures import ProcessPoolExecutor
+            # The workers only get the program once, and the memory is sent with every chunk
+            worker = type(virtual_machine)(virtual_machine.memo_size)
+            worker.quadruples = virtual_machine.quadruples
+            worker.constant_memory_manager = virtual_machine.constant_memory_manager
+            worker.function_directory = virtual_machine.function_directory
+            try:
+                virtual_machine.parallel_pool = ProcessPoolExecutor(virtual_machine.workers, initializer=ParallelLoop.start_worker, initargs=(worker,))
+            except (NotImplementedError, OSError):
+                virtual_machine.workers = 1
+        return virtual_machine.parallel_pool
+
+    @staticmethod
+    def start_worker(virtual_machine):
+        """
+        Keep the virtual machine with the program in a worker process.
+
+        Parameters:
+            virtual_machine (VirtualMachine): The virtual machine with the quadruples, constants and functions of the program.
+        """
+        ParallelLoop.worker = virtual_machine
+
+    @staticmethod
+    def run_chunk(global_values: tuple, frame_values: tuple, position: int, variable: int, first: int, last: int | float) -> tuple:
+        """
+        Run the iterations of a chunk in a worker process.
+
+        Parameters:
+            global_values (tuple): The values of the global memory when the loop started.
+            frame_values (tuple): The values of the memory of the function with the loop when the loop started.
+            position (int): The position of the PARALLEL quadruple that started the loop.
+            variable (int): The address of the loop variable.
+            first (int): The value of the loop variable in the first iteration of the chunk.
+            last (int | float): The value of the loop variable that ends the chunk.
+
+        Returns:
+            tuple: The addresses the chunk changed with their values, and the type and description of the error that stopped it or None.
+        """
+        virtual_machine = ParallelLoop.worker
+        global_memory = TrackedMemoryManager(0, initial_values=global_values)
+        frame = TrackedMemoryManager(START_FUNCTION_MEMORY, initial_values=frame_values)
+        virtual_machine.global_memory_manager = global_memory
+        virtual_machine.function_memory_manager = frame
+        virtual_machine.function_memory_stack = []
+        variable_memory = virtual_machine.get_memory_manager_type(variable)
+        variable_memory[variable] = first
+        quads = virtual_machine.quadruples
+        # The condition of the first iteration is already true, so the chunk continues after the PARALLEL quadruple
+        quads.instr_ptr = position + 1
+        error = None
+        try:
+            while True:
+                quad = quads[quads.instr_ptr]
+                # The chunk ends when the condition of its loop is checked with the loop variable at the end of the chunk
+                if quad.operator == "PARALLEL" and quad.left_address == variable and not virtual_machine.function_memory_stack and variable_memory[variable] >= last:
+                    break
+                quads.instr_ptr += 1
+                virtual_machine.execute_quad(quad)
+        except ProgramError as e:
+            error = (e.error_type, e.description)
+        return (ParallelLoop.get_writes(global_memory, global_values) + ParallelLoop.get_writes(frame, frame_values), error)
+
+    @staticmethod
+    def get_writes(memory: TrackedMemoryManager, values: tuple) -> list:
+        """
+        Get the addresses a chunk changed with their values.
+
+        Parameters:
+            memory (TrackedMemoryManager): The memory after the chunk ran.
+            values (tuple): The values of the memory before the chunk ran.
+
+        Returns:
+            list: The address and value of every address that was set, or changed by an operation on a whole array.
+        """
+        written = set(memory.written)
+        # The operations on whole arrays and the vector operations change the values without setting each address
+        for space, initial_values in zip([memory.ints_space, memory.floats_space, memory.strings_space, memory.bools_space, memory.ptrs_space], values):
+            for offset, (value, initial_value) in enumerate(zip(space.values, initial_values)):
+                if value != initial_value:
+                    written.add(space.initial_address + offset)
+        return [(address, memory[address]) for address in sorted(written)]
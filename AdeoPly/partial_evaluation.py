@@ -0,0 +1,219 @@
+import copy
+from control_flow_graph import BasicBlock, ControlFlowGraph, ProgramFlowGraph
+from data_helper import DataHelper
+from dead_code_elimination import DeadCodeElimination
+from memory_manager import MemoryManager
+from program_error import ProgramError
+from quad_helper import QuadHelper
+from quadruples import Quad
+from virtual_machine import START_FUNCTION_MEMORY, VirtualMachine
+
+class PartialEvaluation:
+    """
+    The PartialEvaluation class runs the start of the program at compile time and stores the memory it leaves.
+
+    The quadruples are run by a virtual machine in the compiler from the call to main until the first quadruple whose
+    result depends on the execution, which is a READ, a PRINT, a READARRAY or WRITEARRAY, an error, a tail call or the
+    end of the program. A call made from main is only kept when the function returns without reaching one of them, so
+    the compiler stops before the ERA of the call otherwise. The values of the global variables are written in the
+    object file as their initial values, and main starts with the assignments of the constants its own variables had
+    at that point followed by a jump to the quadruple where the evaluation stopped. The evaluation also stops after a
+    maximum number of quadruples, though never inside a vector operation, and its result is only used when it saves
+    more quadruples than the assignments it adds.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+        max_steps (int): The maximum number of quadruples that are run at compile time.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Run the start of the program and make main continue from where the evaluation stopped.
+        load_program(program: ProgramFlowGraph) -> VirtualMachine:
+            Create a virtual machine with the quadruples and memory of the program.
+        evaluate(virtual_machine: VirtualMachine) -> tuple[int, int]:
+            Run the quadruples that do not depend on the execution.
+        get_constant_address(program: ProgramFlowGraph, value: int | float | str | bool, v_type: str) -> int:
+            Get the constant address that stores a value read from the virtual machine.
+        resume_main(program: ProgramFlowGraph, graph: ControlFlowGraph, stop: int, steps: int, frame: MemoryManager, initial_frame: MemoryManager) -> bool:
+            Make main assign the values of its variables and jump to where the evaluation stopped.
+    """
+
+    name = "eval"
+    level = 2
+    max_steps = 100000
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Run the start of the program and make main continue from where the evaluation stopped.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        calls = [quad for quad in program.prologue if quad.operator == "GOSUB"]
+        if not calls:
+            return
+        graph = program.get_graph(program.get_function_name(calls[0].return_address))
+        virtual_machine = self.load_program(program)
+        stop, steps = self.evaluate(virtual_machine)
+        function = virtual_machine.function_directory.get_function_from_directory(graph.name)
+        initial_frame = MemoryManager(START_FUNCTION_MEMORY, function.resources, function.data)
+        if not self.resume_main(program, graph, stop, steps, virtual_machine.function_memory_manager, initial_frame):
+            return
+        # The global variables start with the values they had when the evaluation stopped
+        memory_manager = program.global_memory_manager
+        evaluated_memory = virtual_machine.global_memory_manager
+        for space, evaluated_space in zip([memory_manager.ints_space, memory_manager.floats_space, memory_manager.strings_space, memory_manager.bools_space],
+                                          [evaluated_memory.ints_space, evaluated_memory.floats_space, evaluated_memory.strings_space, evaluated_memory.bools_space]):
+            v_type = memory_manager.get_type_from_address(space.initial_address)
+            for i, value in enumerate(evaluated_space.values):
+                if value is None:
+                    continue
+                value = ("true" if value else "false") if v_type == "bool" else f'"{DataHelper.encode_string(value)}"' if v_type == "string" else value
+                # The values are compared as the virtual machine loads them, so the names of the functions keep their form
+                if DataHelper.change_to_type(v_type, str(value)) != DataHelper.change_to_type(v_type, str(space.values[i])):
+                    space.values[i] = value
+
+    def load_program(self, program: ProgramFlowGraph) -> VirtualMachine:
+        """
+        Create a virtual machine with the quadruples and memory of the program.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+
+        Returns:
+            VirtualMachine: The virtual machine, which reads the program the same way as from the object file.
+        """
+        quads = program.to_quadruples()
+        sections = {
+            "--Global Memory--": str(program.global_memory_manager),
+            "--Constants--": str(program.constant_memory_manager),
+            "--Functions--": str(program.function_directory),
+            "--Data--": program.function_directory.get_data(),
+            "--Quadruples--": "\n".join(str(quad) for quad in quads)
+        }
+        # The results of pure functions are not saved, so every call runs its quadruples
+        virtual_machine = VirtualMachine(0)
+        virtual_machine.process_section_data({section: [line.strip() for line in data.split("\n") if line.strip()] for section, data in sections.items()})
+        return virtual_machine
+
+    def evaluate(self, virtual_machine: VirtualMachine) -> tuple[int, int]:
+        """
+        Run the quadruples that do not depend on the execution.
+
+        Parameters:
+            virtual_machine (VirtualMachine): The virtual machine with the program.
+
+        Returns:
+            tuple[int, int]: The position of the quadruple of main where the evaluation stopped, or -1 if it did not reach main, and the number of quadruples run since main started.
+        """
+        quads = virtual_machine.quadruples
+        quads.instr_ptr = 0
+        checkpoint = None
+        steps = 0
+        for _ in range(self.max_steps):
+            position = quads.instr_ptr
+            quad = quads[position]
+            in_main = len(virtual_machine.function_memory_stack) == 1
+            if in_main and checkpoint is None:
+                if quad.operator in ["PRINT", "READ", "READARRAY", "WRITEARRAY", "TAILCALL", "ENDFUNC", "ENDPROG"]:
+                    return (position, steps)
+                # The memory is saved before a call so the evaluation can stop before it
+                if quad.operator == "ERA":
+                    checkpoint = (position, steps, copy.deepcopy(virtual_machine.global_memory_manager), copy.deepcopy(virtual_machine.function_memory_manager))
+            elif quad.operator in ["PRINT", "READ", "READARRAY", "WRITEARRAY"]:
+                break
+            quads.instr_ptr += 1
+            try:
+                virtual_machine.execute_quad(quad)
+            except ProgramError:
+                # The quadruples check their operands before they write anything
+                quads.instr_ptr = position
+                break
+            if in_main or checkpoint is not None:
+                steps += 1
+            # The call finished when the execution is back in main after the GOSUB
+            if checkpoint is not None and len(virtual_machine.function_memory_stack) == 1 and quad.operator not in ["ERA", "PARAM"]:
+                checkpoint = None
+        if checkpoint is not None:
+            quads.instr_ptr, steps, virtual_machine.global_memory_manager, virtual_machine.function_memory_manager = checkpoint
+        elif len(virtual_machine.function_memory_stack) != 1:
+            return (-1, 0)
+        # The operands and results of a vector operation are not in the memory, so the evaluation cannot stop inside one
+        while quads[quads.instr_ptr].operator in ["VARG", "VOUT"] + QuadHelper.vector_operators:
+            quads.instr_ptr += 1
+            virtual_machine.execute_quad(quads[quads.instr_ptr - 1])
+            steps += 1
+        return (quads.instr_ptr, steps)
+
+    def get_constant_address(self, program: ProgramFlowGraph, value: int | float | str | bool, v_type: str) -> int:
+        """
+        Get the constant address that stores a value read from the virtual machine.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            value (int | float | str | bool): The value in the memory of the virtual machine.
+            v_type (str): The type of the address the value was read from.
+
+        Returns:
+            int: The constant address of the value as the compiler stores it.
+        """
+        if v_type == "bool":
+            return program.constant_memory_manager.find_memory_address("true" if value else "false")
+        if v_type == "string":
+            return program.constant_memory_manager.find_memory_address(f'"{DataHelper.encode_string(value)}"')
+        return program.constant_memory_manager.find_memory_address(value)
+
+    def resume_main(self, program: ProgramFlowGraph, graph: ControlFlowGraph, stop: int, steps: int, frame: MemoryManager, initial_frame: MemoryManager) -> bool:
+        """
+        Make main assign the values of its variables and jump to where the evaluation stopped.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of main.
+            stop (int): The position of the quadruple where the evaluation stopped.
+            steps (int): The number of quadruples the evaluation ran since main started.
+            frame (MemoryManager): The memory of main when the evaluation stopped.
+            initial_frame (MemoryManager): The memory main starts with, which has the initial values of its arrays.
+
+        Returns:
+            bool: True or False depending on if main was changed.
+        """
+        function = program.function_directory.get_function_from_directory(graph.name)
+        position = function.initial_quad_address
+        if stop <= position:
+            return False
+        for index, block in enumerate(graph.blocks):
+            if position <= stop < position + len(block.quads):
+                break
+            position += len(block.quads)
+        else:
+            return False
+        # The memory of main already starts with the initial values of its arrays, and assigning the rest must cost less than the quadruples that were run
+        assignments = []
+        for space in [frame.ints_space, frame.floats_space, frame.strings_space, frame.bools_space]:
+            v_type = frame.get_type_from_address(space.initial_address)
+            for i, value in enumerate(space.values):
+                if value is not None and value != initial_frame[space.initial_address + i]:
+                    assignments.append(Quad("=", self.get_constant_address(program, value, v_type), None, space.initial_address + i))
+        if len(assignments) + 1 >= steps:
+            return False
+        # The quadruples from the stop point start a block that the start of main jumps to
+        if stop > position:
+            rest = BasicBlock(block.quads[stop - position:])
+            rest.jump_target = block.jump_target
+            rest.switch_table = block.switch_table
+            block.quads = block.quads[:stop - position]
+            block.jump_target = None
+            block.switch_table = []
+            graph.blocks.insert(index + 1, rest)
+            block = rest
+        entry = BasicBlock(assignments + [Quad("GOTO", None, None, None)])
+        entry.jump_target = block
+        graph.blocks.insert(0, entry)
+        graph.compute_edges()
+        # The quadruples that were evaluated no longer run, and the functions only they called can then be removed
+        dead_code_elimination = DeadCodeElimination()
+        dead_code_elimination.remove_unreachable_blocks(graph)
+        dead_code_elimination.remove_useless_jumps(graph)
+        return True
@@ -0,0 +1,199 @@
+import json
+from quad_helper import QuadHelper
+from quadruples import Quad
+from typing import Callable
+
+class ProfileData:
+    """
+    The ProfileData class stores the execution counts of a program, which the virtual machine records and the compiler reads.
+
+    The counts of each quadruple are grouped by the function that contains it, with the number of times the function
+    was called, the number of quadruples it executed and how often each GOTOF or GOTOT jumped. The jumps of a function
+    are only matched with its blocks when the shape of the blocks is the same as in the profiled program, which is the
+    case when the profile comes from a -O0 build of the same source. The copies of a function made by specialization
+    are counted together with the function.
+
+    Attributes:
+        hot_share (float): The share of all executed quadruples a function needs to execute to be considered hot.
+        quad_counts (list[int]): The number of times each quadruple of the profiled program was executed.
+        functions (dict): A dictionary with the calls, executed quadruples, block signature and branch counts of each function.
+        call_sites (list[dict]): The quadruple, calling function, called function and number of calls of each call.
+
+    Methods:
+        __init__(quad_counts: list[int], functions: dict, call_sites: list[dict]):
+            Initialize a new instance of the ProfileData class.
+        from_execution(quads: list[Quad], function_starts: dict, quad_counts: list[int], taken_counts: list[int], get_jump_target: Callable, get_function_name: Callable) -> ProfileData:
+            Group the counts recorded while running a program by function.
+        load(file_name: str) -> ProfileData:
+            Read a profile from a JSON file.
+        save(file_name: str):
+            Write the profile to a JSON file.
+        get_signature(quads: list[Quad], start: int, get_jump_target: Callable) -> list:
+            Get the number of blocks of a function and the blocks each of its jumps connects.
+        get_base_name(f_name: str) -> str:
+            Get the name of the function a specialized copy was made from.
+        get_executed_quads(f_name: str) -> int | None:
+            Get the number of quadruples a function and its copies executed.
+        is_hot(f_name: str) -> bool:
+            Check if a function executed a large share of the quadruples of the program.
+        is_cold(f_name: str) -> bool:
+            Check if a function was in the profiled program but never executed.
+        get_branches(f_name: str, signature: list) -> list | None:
+            Get the branch counts of a function if its blocks have the same shape as in the profile.
+    """
+
+    hot_share = 0.1
+
+    def __init__(self, quad_counts: list[int], functions: dict, call_sites: list[dict]):
+        self.quad_counts = quad_counts
+        self.functions = functions
+        self.call_sites = call_sites
+
+    @staticmethod
+    def from_execution(quads: list[Quad], function_starts: dict, quad_counts: list[int], taken_counts: list[int], get_jump_target: Callable, get_function_name: Callable) -> "ProfileData":
+        """
+        Group the counts recorded while running a program by function.
+
+        Parameters:
+            quads (list[Quad]): The quadruples of the program.
+            function_starts (dict): A dictionary with the first quadruple of each function name.
+            quad_counts (list[int]): The number of times each quadruple was executed.
+            taken_counts (list[int]): The number of times each quadruple jumped.
+            get_jump_target (Callable): A function that gets the quadruple a jump goes to.
+            get_function_name (Callable): A function that gets the name of the function an ERA or GOSUB calls.
+
+        Returns:
+            ProfileData: The profile of the execution.
+        """
+        starts = sorted(function_starts.items(), key=lambda item: item[1])
+        functions = {}
+        call_sites = []
+        for (f_name, start), end in zip(starts, [start for _, start in starts[1:]] + [len(quads)]):
+            f_quads = quads[start:end]
+            branches = [[quad.operator, taken_counts[i], quad_counts[i]] for i, quad in enumerate(f_quads, start) if quad.operator in ["GOTOF", "GOTOT"]]
+            functions[f_name] = {"calls": 0, "quads": sum(quad_counts[start:end]), "signature": ProfileData.get_signature(f_quads, start, get_jump_target), "branches": branches}
+        for i, quad in enumerate(quads):
+            if quad.operator in ["GOSUB", "TAILCALL"]:
+                caller = next((f_name for f_name, start in reversed(starts) if start <= i), None)
+                callee = get_function_name(quad)
+                call_sites.append({"quad": i, "caller": caller, "callee": callee, "count": quad_counts[i]})
+                if callee in functions:
+                    functions[callee]["calls"] += quad_counts[i]
+        return ProfileData(quad_counts, functions, call_sites)
+
+    @staticmethod
+    def load(file_name: str) -> "ProfileData":
+        """
+        Read a profile from a JSON file.
+
+        Parameters:
+            file_name (str): The name of the file.
+
+        Returns:
+            ProfileData: The profile stored in the file.
+        """
+        with open(file_name, "r") as file:
+            data = json.load(file)
+        return ProfileData(data["quads"], data["functions"], data["call_sites"])
+
+    def save(self, file_name: str):
+        """
+        Write the profile to a JSON file.
+
+        Parameters:
+            file_name (str): The name of the file.
+        """
+        with open(file_name, "w") as file:
+            json.dump({"quads": self.quad_counts, "functions": self.functions, "call_sites": self.call_sites}, file, indent=1)
+
+    @staticmethod
+    def get_signature(quads: list[Quad], start: int, get_jump_target: Callable) -> list:
+        """
+        Get the number of blocks of a function and the blocks each of its jumps connects.
+
+        Parameters:
+            quads (list[Quad]): The quadruples of the function.
+            start (int): The position of the first quadruple of the function in the program.
+            get_jump_target (Callable): A function that gets the quadruple a jump goes to.
+
+        Returns:
+            list: The number of blocks, followed by the block, operator and target block of each jump.
+        """
+        leaders = {0}
+        for i, quad in enumerate(quads):
+            if QuadHelper.is_jump(quad) and 0 <= get_jump_target(quad) - start < len(quads):
+                leaders.add(get_jump_target(quad) - start)
+            if QuadHelper.is_jump(quad) or QuadHelper.is_exit(quad):
+                leaders.add(i + 1)
+        leaders = sorted(leader for leader in leaders if leader < len(quads))
+        def get_block(i: int) -> int:
+            return sum(leader <= i for leader in leaders) - 1 if 0 <= i < len(quads) else -1
+        jumps = [[get_block(i), quad.operator, get_block(get_jump_target(quad) - start)] for i, quad in enumerate(quads) if QuadHelper.is_jump(quad)]
+        return [len(leaders), jumps]
+
+    @staticmethod
+    def get_base_name(f_name: str) -> str:
+        """
+        Get the name of the function a specialized copy was made from.
+
+        Parameters:
+            f_name (str): The name of the function or of its copy.
+
+        Returns:
+            str: The name without the number of the copy.
+        """
+        return f_name.split(".")[0]
+
+    def get_executed_quads(self, f_name: str) -> int | None:
+        """
+        Get the number of quadruples a function and its copies executed.
+
+        Parameters:
+            f_name (str): The name of the function.
+
+        Returns:
+            int | None: The number of executed quadruples, or None if the function was not in the profiled program.
+        """
+        counts = [data["quads"] for name, data in self.functions.items() if self.get_base_name(name) == self.get_base_name(f_name)]
+        return sum(counts) if counts else None
+
+    def is_hot(self, f_name: str) -> bool:
+        """
+        Check if a function executed a large share of the quadruples of the program.
+
+        Parameters:
+            f_name (str): The name of the function.
+
+        Returns:
+            bool: True or False depending on if the function executed at least the hot share of the quadruples.
+        """
+        executed = self.get_executed_quads(f_name)
+        return executed is not None and executed > 0 and executed >= self.hot_share * sum(self.quad_counts)
+
+    def is_cold(self, f_name: str) -> bool:
+        """
+        Check if a function was in the profiled program but never executed.
+
+        Parameters:
+            f_name (str): The name of the function.
+
+        Returns:
+            bool: True or False depending on if the profile has the function without executed quadruples.
+        """
+        return self.get_executed_quads(f_name) == 0
+
+    def get_branches(self, f_name: str, signature: list) -> list | None:
+        """
+        Get the branch counts of a function if its blocks have the same shape as in the profile.
+
+        Parameters:
+            f_name (str): The name of the function.
+            signature (list): The signature of the blocks of the function in the program being compiled.
+
+        Returns:
+            list | None: The operator, number of jumps and number of executions of each GOTOF and GOTOT, or None if the blocks do not match.
+        """
+        data = self.functions.get(f_name)
+        if data is None or data["signature"] != signature:
+            return None
+        return data["branches"]
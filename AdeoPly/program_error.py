@@ -23,6 +23,7 @@ class ProgramErrorType:
     """
     ARITHMETIC_EXCEPTION = "ARITHMETIC_EXCEPTION"
     ARRAY_INDEX_OUT_OF_BOUNDS = "ARRAY_INDEX_OUT_OF_BOUNDS"
+    FILE_ACCESS_ERROR = "FILE_ACCESS_ERROR"
     INPUT_TYPE_MISMATCH = "INPUT_TYPE_MISMATCH"
     MISSING_REQUIRED_ARGUMENT = "MISSING_REQUIRED_ARGUMENT"
     REDECLARATION_ERROR = "REDECLARATION_ERROR"
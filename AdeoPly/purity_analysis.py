@@ -0,0 +1,73 @@
+from control_flow_graph import ControlFlowGraph, ProgramFlowGraph
+from quad_helper import QuadHelper
+
+class PurityAnalysis:
+    """
+    The PurityAnalysis class marks the functions whose result only depends on the values of their parameters.
+
+    A function is pure when it returns a value, does not print or read, does not use arrays and does not read or write
+    global memory other than the return values of the pure functions it calls. Every function that returns a value
+    starts as a candidate, and the functions that break a rule or call a function that is not pure are removed until
+    nothing changes, so recursive functions can be pure. The mark is written in the object file, and the virtual
+    machine reuses the result of an earlier call to a pure function with the same arguments. The quadruples are not
+    changed.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Mark the pure functions of the program.
+        check_is_pure(program: ProgramFlowGraph, graph: ControlFlowGraph, pure: set[str]) -> bool:
+            Check if a function only reads its parameters and the results of pure functions.
+    """
+
+    name = "pure"
+    level = 1
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Mark the pure functions of the program.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        functions = program.function_directory.functions
+        pure = {graph.name for graph in program.graphs if functions[graph.name].return_address is not None}
+        changed = True
+        while changed:
+            changed = False
+            for graph in program.graphs:
+                if graph.name in pure and not self.check_is_pure(program, graph, pure):
+                    pure.remove(graph.name)
+                    changed = True
+        for graph in program.graphs:
+            functions[graph.name].pure = graph.name in pure
+
+    def check_is_pure(self, program: ProgramFlowGraph, graph: ControlFlowGraph, pure: set[str]) -> bool:
+        """
+        Check if a function only reads its parameters and the results of pure functions.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+            pure (set[str]): The names of the functions that are still considered pure.
+
+        Returns:
+            bool: True or False depending on if the function has no effects and its result only depends on its parameters.
+        """
+        return_addresses = {program.function_directory.functions[name].return_address for name in pure}
+        for block in graph.blocks:
+            for quad in block.quads:
+                if quad.operator in ["PRINT", "READ", "PTR"] + QuadHelper.array_operators + QuadHelper.vector_operators:
+                    return False
+                if quad.operator in ["GOSUB", "TAILCALL"] and program.get_function_name(quad.return_address) not in pure:
+                    return False
+                addresses = QuadHelper.get_used_addresses(quad) + [QuadHelper.get_defined_address(quad)]
+                for address in addresses:
+                    if QuadHelper.is_ptr_address(address) or program.is_array_address(address):
+                        return False
+                    if QuadHelper.is_global_address(address) and address not in return_addresses:
+                        return False
+        return True
@@ -0,0 +1,261 @@
+from memory_manager import SIZE
+from quadruples import Quad
+
+START_CONSTANT_MEMORY = SIZE * 5
+START_FUNCTION_MEMORY = START_CONSTANT_MEMORY * 2
+
+class QuadHelper:
+    """
+    The QuadHelper class provides utility methods to inspect the operands of quadruples during optimization.
+
+    Attributes:
+        arithmetic_operators (list): The operators that perform arithmetic.
+        relational_operators (list): The operators that compare two values.
+        logical_operators (list): The operators that combine two booleans.
+        jump_operators (list): The operators that transfer control inside a function.
+        exit_operators (list): The operators that leave the current function.
+        array_operators (list): The operators that read or write a whole array, which is given by constants with its base address and size.
+        vector_operators (list): The operators that run a loop over arrays at once, with the operands collected by the VARG quadruples before them.
+
+    Methods:
+        is_pure(quad: Quad) -> bool:
+            Check if a quadruple only computes a value from its operands.
+        is_jump(quad: Quad) -> bool:
+            Check if a quadruple transfers control inside a function.
+        is_exit(quad: Quad) -> bool:
+            Check if a quadruple leaves the current function.
+        get_used_addresses(quad: Quad) -> list[int]:
+            Get the addresses a quadruple reads in the current memory.
+        get_defined_address(quad: Quad) -> int | None:
+            Get the address a quadruple writes in the current memory.
+        replace_used_addresses(quad: Quad, addresses: dict) -> Quad:
+            Get a quadruple that reads other addresses.
+        writes_through_ptr(quad: Quad) -> bool:
+            Check if a quadruple stores a value in the address held by a pointer.
+        writes_array(quad: Quad) -> bool:
+            Check if a quadruple can store a value in any element of an array.
+        is_constant_address(address: int | None) -> bool:
+            Check if an address belongs to constant memory.
+        is_global_address(address: int | None) -> bool:
+            Check if an address belongs to global memory.
+        is_local_address(address: int | None) -> bool:
+            Check if an address belongs to the memory of the current function.
+        is_ptr_address(address: int | None) -> bool:
+            Check if an address belongs to a pointer type space.
+        get_type_from_address(address: int) -> str:
+            Get the type of the values stored at an address.
+    """
+
+    arithmetic_operators = ["+", "-", "*", "/"]
+    relational_operators = [">", ">=", "<", "<=", "==", "!="]
+    logical_operators = ["||", "&&"]
+    jump_operators = ["GOTO", "GOTOF", "GOTOT"]
+    exit_operators = ["ENDFUNC", "ENDPROG", "TAILCALL"]
+    array_operators = ["READARRAY", "WRITEARRAY", "SORT", "FILL", "COPY", "SUM", "MIN", "MAX", "BSEARCH"]
+    vector_operators = ["VMAP", "VREDUCE"]
+
+    @staticmethod
+    def is_pure(quad: Quad) -> bool:
+        """
+        Check if a quadruple only computes a value from its operands.
+
+        Parameters:
+            quad (Quad): The quadruple to be checked.
+
+        Returns:
+            bool: True or False depending on if the quadruple has no effect other than writing its result.
+        """
+        operators = QuadHelper.arithmetic_operators + QuadHelper.relational_operators + QuadHelper.logical_operators + ["=", "PTR"]
+        return quad.operator in operators and not QuadHelper.writes_through_ptr(quad)
+
+    @staticmethod
+    def is_jump(quad: Quad) -> bool:
+        """
+        Check if a quadruple transfers control inside a function.
+
+        Parameters:
+            quad (Quad): The quadruple to be checked.
+
+        Returns:
+            bool: True or False depending on if the quadruple is a GOTO, GOTOF or GOTOT.
+        """
+        return quad.operator in QuadHelper.jump_operators
+
+    @staticmethod
+    def is_exit(quad: Quad) -> bool:
+        """
+        Check if a quadruple leaves the current function.
+
+        Parameters:
+            quad (Quad): The quadruple to be checked.
+
+        Returns:
+            bool: True or False depending on if the quadruple is an ENDFUNC, ENDPROG or TAILCALL.
+        """
+        return quad.operator in QuadHelper.exit_operators
+
+    @staticmethod
+    def get_used_addresses(quad: Quad) -> list[int]:
+        """
+        Get the addresses a quadruple reads in the current memory.
+
+        Parameters:
+            quad (Quad): The quadruple to be inspected.
+
+        Returns:
+            list[int]: The addresses read by the quadruple, including pointers that are dereferenced to store a value.
+        """
+        operator = quad.operator
+        if operator in QuadHelper.arithmetic_operators + QuadHelper.relational_operators + QuadHelper.logical_operators:
+            used = [quad.left_address, quad.right_address]
+        elif operator in ["=", "GOTOF", "GOTOT", "VER", "PTR", "PARAM", "SWITCH", "READARRAY", "WRITEARRAY", "FILL"]:
+            used = [quad.left_address]
+        elif operator in ["PRINT", "VARG"]:
+            used = [quad.left_address, quad.right_address, quad.return_address]
+        elif operator == "BSEARCH":
+            # The result starts with the size of the array
+            used = [quad.left_address, quad.return_address]
+        elif operator == "VOUT":
+            # The address keeps its value when the vector operation did not run
+            used = [quad.return_address]
+        elif operator == "PARALLEL":
+            # The loop variable, the end of the loop and the result of the condition decide if the iterations are split
+            used = [quad.left_address, quad.right_address, quad.return_address]
+        else:
+            used = []
+        if QuadHelper.writes_through_ptr(quad):
+            used.append(quad.return_address)
+        return [address for address in used if address is not None]
+
+    @staticmethod
+    def get_defined_address(quad: Quad) -> int | None:
+        """
+        Get the address a quadruple writes in the current memory.
+
+        Parameters:
+            quad (Quad): The quadruple to be inspected.
+
+        Returns:
+            int | None: The address written by the quadruple, or None if it writes nothing or writes through a pointer.
+        """
+        operator = quad.operator
+        if operator in QuadHelper.arithmetic_operators + QuadHelper.relational_operators + QuadHelper.logical_operators + ["=", "READ"]:
+            if not QuadHelper.writes_through_ptr(quad):
+                return quad.return_address
+        elif operator in ["PTR", "SUM", "MIN", "MAX", "BSEARCH", "VOUT", "PARALLEL"]:
+            return quad.return_address
+        return None
+
+    @staticmethod
+    def replace_used_addresses(quad: Quad, addresses: dict) -> Quad:
+        """
+        Get a quadruple that reads other addresses.
+
+        Parameters:
+            quad (Quad): The quadruple to be changed.
+            addresses (dict): A dictionary with the address to read instead of each address.
+
+        Returns:
+            Quad: The quadruple with its operands replaced.
+        """
+        operator = quad.operator
+        if operator in QuadHelper.arithmetic_operators + QuadHelper.relational_operators + QuadHelper.logical_operators:
+            return Quad(operator, addresses.get(quad.left_address, quad.left_address), addresses.get(quad.right_address, quad.right_address), quad.return_address)
+        elif operator in ["=", "GOTOF", "GOTOT", "VER", "PTR", "PARAM", "SWITCH", "READARRAY", "WRITEARRAY", "FILL", "BSEARCH"]:
+            return Quad(operator, addresses.get(quad.left_address, quad.left_address), quad.right_address, quad.return_address)
+        elif operator in ["PRINT", "VARG"]:
+            return Quad(operator, *[addresses.get(address, address) for address in [quad.left_address, quad.right_address, quad.return_address]])
+        return quad
+
+    @staticmethod
+    def writes_through_ptr(quad: Quad) -> bool:
+        """
+        Check if a quadruple stores a value in the address held by a pointer.
+
+        Parameters:
+            quad (Quad): The quadruple to be checked.
+
+        Returns:
+            bool: True or False depending on if the result of the quadruple goes to an array element.
+        """
+        operators = QuadHelper.arithmetic_operators + QuadHelper.relational_operators + QuadHelper.logical_operators + ["=", "READ"]
+        return quad.operator in operators and QuadHelper.is_ptr_address(quad.return_address)
+
+    @staticmethod
+    def writes_array(quad: Quad) -> bool:
+        """
+        Check if a quadruple can store a value in any element of an array.
+
+        Parameters:
+            quad (Quad): The quadruple to be checked.
+
+        Returns:
+            bool: True or False depending on if the quadruple writes through a pointer, changes a whole array or runs a loop over arrays.
+        """
+        return QuadHelper.writes_through_ptr(quad) or quad.operator in ["READARRAY", "SORT", "FILL", "COPY", "PARALLEL"] + QuadHelper.vector_operators
+
+    @staticmethod
+    def is_constant_address(address: int | None) -> bool:
+        """
+        Check if an address belongs to constant memory.
+
+        Parameters:
+            address (int | None): The address to be checked.
+
+        Returns:
+            bool: True or False depending on if the address is a constant.
+        """
+        return address is not None and START_CONSTANT_MEMORY <= address < START_FUNCTION_MEMORY
+
+    @staticmethod
+    def is_global_address(address: int | None) -> bool:
+        """
+        Check if an address belongs to global memory.
+
+        Parameters:
+            address (int | None): The address to be checked.
+
+        Returns:
+            bool: True or False depending on if the address is global.
+        """
+        return address is not None and address < START_CONSTANT_MEMORY
+
+    @staticmethod
+    def is_local_address(address: int | None) -> bool:
+        """
+        Check if an address belongs to the memory of the current function.
+
+        Parameters:
+            address (int | None): The address to be checked.
+
+        Returns:
+            bool: True or False depending on if the address is a local variable or temporal.
+        """
+        return address is not None and address >= START_FUNCTION_MEMORY
+
+    @staticmethod
+    def is_ptr_address(address: int | None) -> bool:
+        """
+        Check if an address belongs to a pointer type space.
+
+        Parameters:
+            address (int | None): The address to be checked.
+
+        Returns:
+            bool: True or False depending on if the address stores a pointer.
+        """
+        return address is not None and address % START_CONSTANT_MEMORY >= SIZE * 4
+
+    @staticmethod
+    def get_type_from_address(address: int) -> str:
+        """
+        Get the type of the values stored at an address.
+
+        Parameters:
+            address (int): The address to be checked.
+
+        Returns:
+            str: The type of the type space the address belongs to.
+        """
+        types = ["int", "float", "string", "bool", "ptr"]
+        return types[address % START_CONSTANT_MEMORY // SIZE]
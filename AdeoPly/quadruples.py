@@ -1,12 +1,40 @@
+class IndexedAddress:
+    """
+    The IndexedAddress class represents an operand that names an array element by a base address and an index.
+
+    Attributes:
+        base (int): The address the index is added to.
+        index (int): The address of the integer that is added to the base.
+
+    Methods:
+        __init__(base: int, index: int):
+            Initialize a new instance of the IndexedAddress class.
+        __str__() -> str:
+            Return a string representation of the operand.
+    """
+
+    def __init__(self, base: int, index: int):
+        self.base = base
+        self.index = index
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the operand.
+
+        Returns:
+            str: The base address followed by the index address in brackets.
+        """
+        return f"{self.base}[{self.index}]"
+
 class Quad:
     """
     The Quad class represents a quadruple, which consists of an operator and addresses for the left operand, right operand, and return value.
     
     Attributes:
         operator (str): The operator of the quadruple.
-        left_address (int | None): The address of the left operand, or None if the field is empty.
-        right_address (int | None): The address of the right operand, or None if the field is empty.
-        return_address (int): The address of the return value.
+        left_address (int | IndexedAddress | None): The address of the left operand, or None if the field is empty.
+        right_address (int | IndexedAddress | None): The address of the right operand, or None if the field is empty.
+        return_address (int | IndexedAddress): The address of the return value.
 
     Methods:
         __init__(operator: str, left_address: int | None, right_address: int | None, return_address: int):
@@ -0,0 +1,189 @@
+from control_flow_graph import ControlFlowGraph, Loop, ProgramFlowGraph
+from induction_variable import InductionVariable
+from quad_helper import QuadHelper
+from quadruples import Quad
+
+class StrengthReduction:
+    """
+    The StrengthReduction class replaces the array addresses built from the variable of a for loop with running pointers.
+
+    The address of an element like arr[i][j] is rebuilt in every iteration with a multiplication and two additions.
+    When it only depends on the loop variable and on values that do not change inside the loop, a new temporal is
+    computed once in the preheader and advanced by the stride of the loop variable right after it is incremented.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Reduce the array addresses of every for loop in the program.
+        reduce_loop(program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop, variable: InductionVariable) -> list[Quad]:
+            Replace the addresses computed from the loop variable with running pointers.
+        get_step(quad: Quad, derived: dict, program: ProgramFlowGraph, check_invariant) -> tuple | None:
+            Get the stride and quadruples of a value that grows with the loop variable.
+        remove_dead_quads(graph: ControlFlowGraph, quads: list[Quad]):
+            Remove the given quadruples whose results are no longer read.
+    """
+
+    name = "sr"
+    level = 2
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Reduce the array addresses of every for loop in the program.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            reduced = []
+            processed = set()
+            while True:
+                # Find the loops again since every reduction can add a preheader
+                loops = [loop for loop in graph.find_loops() if loop.header not in processed]
+                if not loops:
+                    break
+                loop = loops[0]
+                processed.add(loop.header)
+                variable = InductionVariable.find_in_loop(program, graph, loop)
+                if variable is not None:
+                    reduced += self.reduce_loop(program, graph, loop, variable)
+            if reduced:
+                self.remove_dead_quads(graph, reduced)
+
+    def reduce_loop(self, program: ProgramFlowGraph, graph: ControlFlowGraph, loop: Loop, variable: InductionVariable) -> list[Quad]:
+        """
+        Replace the addresses computed from the loop variable with running pointers.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+            loop (Loop): The loop to optimize.
+            variable (InductionVariable): The variable of the loop.
+
+        Returns:
+            list[Quad]: The quadruples that computed the replaced addresses.
+        """
+        preheader = loop.preheader
+        initialized = program.compute_initialized_addresses(graph).get(preheader, set())
+        initialized = initialized | {program.get_assigned_address(quad) for quad in preheader.quads}
+        if variable.address not in initialized:
+            return []
+        written = program.get_loop_writes(loop)
+        def_count = {}
+        for block in loop.blocks:
+            for quad in block.quads:
+                address = QuadHelper.get_defined_address(quad)
+                def_count[address] = def_count.get(address, 0) + 1
+
+        def check_invariant(address: int) -> bool:
+            if QuadHelper.is_constant_address(address):
+                return type(program.constant_memory_manager[address]) == int
+            return address not in written and address in initialized and QuadHelper.get_type_from_address(address) == "int"
+
+        # Follow the values derived from the loop variable inside each block
+        ptr_quads = []
+        for block in loop.blocks:
+            derived = {variable.address: (1, [])}
+            for quad in block.quads:
+                if quad is variable.increment_quad:
+                    break
+                if quad.operator == "PTR" and quad.left_address in derived and quad.left_address != variable.address:
+                    stride, chain = derived[quad.left_address]
+                    if stride != 0:
+                        ptr_quads.append((block, quad, stride, chain))
+                    continue
+                address = QuadHelper.get_defined_address(quad)
+                if address is None:
+                    continue
+                derived.pop(address, None)
+                step = self.get_step(quad, derived, program, check_invariant)
+                if step is not None and QuadHelper.is_local_address(address) and QuadHelper.get_type_from_address(address) == "int" and def_count.get(address) == 1:
+                    derived[address] = step
+        reduced = []
+        increment_block = next(block for block in loop.blocks if variable.increment_quad in block.quads)
+        pointers = {}
+        for block, quad, stride, chain in ptr_quads:
+            # Compute the first address in the preheader
+            steps = []
+            previous = None
+            for step_quad in chain:
+                # A copy of the previous value is already in the pointer
+                if step_quad.operator == "=" and step_quad.left_address == previous:
+                    previous = step_quad.return_address
+                    continue
+                # The previous value is marked so it can be read from the pointer
+                left_address = "pointer" if previous is not None and step_quad.left_address == previous else step_quad.left_address
+                right_address = "pointer" if previous is not None and step_quad.right_address == previous else step_quad.right_address
+                steps.append((step_quad.operator, left_address, right_address))
+                previous = step_quad.return_address
+            # Addresses computed the same way share a single pointer
+            steps = tuple(steps)
+            if steps not in pointers:
+                pointer = program.reserve_temporal(graph, "int")
+                for operator, left_address, right_address in steps:
+                    preheader.add_quad_before_exit(Quad(operator, pointer if left_address == "pointer" else left_address, pointer if right_address == "pointer" else right_address, pointer))
+                # Advance the pointer every time the loop variable is incremented
+                index = increment_block.quads.index(variable.increment_quad) + 1
+                stride_address = program.constant_memory_manager.find_memory_address(stride)
+                increment_block.quads.insert(index, Quad("+", pointer, stride_address, pointer))
+                pointers[steps] = pointer
+            block.quads[block.quads.index(quad)] = Quad("PTR", pointers[steps], None, quad.return_address)
+            reduced += chain
+        return reduced
+
+    def get_step(self, quad: Quad, derived: dict, program: ProgramFlowGraph, check_invariant) -> tuple | None:
+        """
+        Get the stride and quadruples of a value that grows with the loop variable.
+
+        Parameters:
+            quad (Quad): The quadruple that computes the value.
+            derived (dict): A dictionary with the stride and quadruples of the values already derived from the loop variable.
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            check_invariant (Callable): A function that checks if an address keeps its value inside the loop.
+
+        Returns:
+            tuple | None: The stride and the quadruples that compute the value from the loop variable, or None if the value does not grow linearly.
+        """
+        left_address = quad.left_address
+        right_address = quad.right_address
+        if quad.operator == "=" and left_address in derived:
+            stride, chain = derived[left_address]
+            return (stride, chain + [quad])
+        if quad.operator in ["+", "-"] and left_address in derived and check_invariant(right_address):
+            stride, chain = derived[left_address]
+            return (stride, chain + [quad])
+        if quad.operator == "+" and right_address in derived and check_invariant(left_address):
+            stride, chain = derived[right_address]
+            return (stride, chain + [quad])
+        if quad.operator == "*":
+            for variable_address, factor_address in [(left_address, right_address), (right_address, left_address)]:
+                if variable_address in derived and QuadHelper.is_constant_address(factor_address):
+                    factor = program.constant_memory_manager[factor_address]
+                    if type(factor) == int:
+                        stride, chain = derived[variable_address]
+                        return (stride * factor, chain + [quad])
+        return None
+
+    def remove_dead_quads(self, graph: ControlFlowGraph, quads: list[Quad]):
+        """
+        Remove the given quadruples whose results are no longer read.
+
+        Parameters:
+            graph (ControlFlowGraph): The control flow graph of the function.
+            quads (list[Quad]): The quadruples that can be removed.
+        """
+        candidates = set(quads)
+        live_out = graph.compute_live_addresses()
+        for block in graph.blocks:
+            live = set(live_out[block])
+            kept = []
+            for quad in reversed(block.quads):
+                address = QuadHelper.get_defined_address(quad)
+                if quad in candidates and address not in live:
+                    continue
+                live.discard(address)
+                live |= set(QuadHelper.get_used_addresses(quad))
+                kept.append(quad)
+            block.quads = list(reversed(kept))
@@ -0,0 +1,150 @@
+from control_flow_graph import BasicBlock, ControlFlowGraph, ProgramFlowGraph
+from quad_helper import QuadHelper
+from quadruples import Quad
+
+class SwitchLowering:
+    """
+    The SwitchLowering class replaces the chains of elseif that compare an integer with constants by a jump table.
+
+    A chain like if (x == 1) ... elseif (x == 2) ... elseif (x == 3) checks one condition after another, so reaching
+    the last branch runs every comparison before it. When the conditions compare the same integer address with distinct
+    constants that are close to each other, the first comparison is replaced by a SWITCH quadruple followed by a GOTO
+    for each value between the lowest and the highest constant, and the virtual machine jumps to the branch of the
+    value in a single step. The GOTO right after the SWITCH goes to the else branch, which also runs for the values
+    without a branch. The table is built after the dead code elimination, which would remove the GOTO quadruples that
+    jump to the next block.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+        min_cases (int): The minimum number of comparisons a chain needs to be replaced.
+        max_density (int): The maximum number of table entries for each comparison of the chain.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Replace the chains of comparisons of every function with jump tables.
+        find_chain(program: ProgramFlowGraph, graph: ControlFlowGraph, block: BasicBlock, live_out: dict) -> list[tuple] | None:
+            Find the chain of comparisons of an address that starts at the end of a block.
+        get_comparison(program: ProgramFlowGraph, block: BasicBlock, live_out: dict) -> tuple | None:
+            Get the address and the constant a block compares before its final GOTOF.
+        lower_chain(program: ProgramFlowGraph, graph: ControlFlowGraph, block: BasicBlock, chain: list[tuple]):
+            Replace a chain of comparisons with a SWITCH and its table.
+    """
+
+    name = "switch"
+    level = 2
+    min_cases = 3
+    max_density = 2
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Replace the chains of comparisons of every function with jump tables.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        for graph in program.graphs:
+            live_out = graph.compute_live_addresses()
+            for block in list(graph.blocks):
+                if block not in graph.blocks:
+                    continue
+                chain = self.find_chain(program, graph, block, live_out)
+                if chain is not None:
+                    self.lower_chain(program, graph, block, chain)
+            # The branches of repeated constants can no longer be reached
+            graph.blocks = graph.get_reachable_blocks()
+            graph.compute_edges()
+
+    def find_chain(self, program: ProgramFlowGraph, graph: ControlFlowGraph, block: BasicBlock, live_out: dict) -> list[tuple] | None:
+        """
+        Find the chain of comparisons of an address that starts at the end of a block.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+            block (BasicBlock): The block whose last comparison starts the chain.
+            live_out (dict): A dictionary with the addresses that can still be read after each block of the function.
+
+        Returns:
+            list[tuple] | None: The block, the constant and the branch of each comparison, or None if there is no chain to replace.
+        """
+        comparison = self.get_comparison(program, block, live_out)
+        if comparison is None:
+            return None
+        address = comparison[0]
+        chain = []
+        while comparison is not None and comparison[0] == address and graph.get_next_block(block) is not block.jump_target:
+            chain.append((block, comparison[1], graph.get_next_block(block)))
+            # The next comparison must be a block of its own that is only reached when the previous one fails
+            block = block.jump_target
+            if block is None or len(block.quads) != 2 or block.predecessors != [chain[-1][0]]:
+                break
+            comparison = self.get_comparison(program, block, live_out)
+        values = [value for _, value, _ in chain]
+        if len(chain) < self.min_cases or max(values) - min(values) + 1 > self.max_density * len(chain):
+            return None
+        return chain
+
+    def get_comparison(self, program: ProgramFlowGraph, block: BasicBlock, live_out: dict) -> tuple | None:
+        """
+        Get the address and the constant a block compares before its final GOTOF.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            block (BasicBlock): The block to inspect.
+            live_out (dict): A dictionary with the addresses that can still be read after each block of the function.
+
+        Returns:
+            tuple | None: The integer address and the constant it is compared with, or None if the block does not end in such a comparison.
+        """
+        if len(block.quads) < 2 or block.jump_target is None:
+            return None
+        compare, jump = block.quads[-2:]
+        if compare.operator != "==" or jump.operator != "GOTOF" or jump.left_address != compare.return_address:
+            return None
+        # The result of the comparison must only be read by the jump
+        if not QuadHelper.is_local_address(compare.return_address) or block not in live_out or compare.return_address in live_out[block]:
+            return None
+        address, constant = compare.left_address, compare.right_address
+        if QuadHelper.is_constant_address(address):
+            address, constant = constant, address
+        if not QuadHelper.is_constant_address(constant) or QuadHelper.is_constant_address(address) or QuadHelper.is_ptr_address(address):
+            return None
+        value = program.constant_memory_manager[constant]
+        if QuadHelper.get_type_from_address(address) != "int" or type(value) != int:
+            return None
+        return (address, value)
+
+    def lower_chain(self, program: ProgramFlowGraph, graph: ControlFlowGraph, block: BasicBlock, chain: list[tuple]):
+        """
+        Replace a chain of comparisons with a SWITCH and its table.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+            graph (ControlFlowGraph): The control flow graph of the function.
+            block (BasicBlock): The block whose last comparison starts the chain.
+            chain (list[tuple]): The block, the constant and the branch of each comparison.
+        """
+        compare = block.quads[-2]
+        address = compare.right_address if QuadHelper.is_constant_address(compare.left_address) else compare.left_address
+        default = chain[-1][0].jump_target
+        # The first comparison of a repeated constant is the one that runs
+        branches = {}
+        for _, value, branch in chain:
+            branches.setdefault(value, branch)
+        low, high = min(branches), max(branches)
+        table = []
+        for target in [default] + [branches.get(value, default) for value in range(low, high + 1)]:
+            entry = BasicBlock([Quad("GOTO", None, None, None)])
+            entry.jump_target = target
+            table.append(entry)
+        low_address = program.constant_memory_manager.find_memory_address(low)
+        count_address = program.constant_memory_manager.find_memory_address(high - low + 1)
+        block.quads = block.quads[:-2] + [Quad("SWITCH", address, low_address, count_address)]
+        block.jump_target = None
+        block.switch_table = table
+        # The table takes the place of the comparisons, and the branches are only reached through it
+        compared = [compared_block for compared_block, _, _ in chain[1:]]
+        index = graph.blocks.index(block)
+        graph.blocks = graph.blocks[:index + 1] + table + [other for other in graph.blocks[index + 1:] if other not in compared]
+        graph.compute_edges()
@@ -0,0 +1,100 @@
+from control_flow_graph import BasicBlock, ProgramFlowGraph
+from quad_helper import QuadHelper
+from quadruples import Quad
+
+class TailCallElimination:
+    """
+    The TailCallElimination class replaces the calls whose result is returned right away with a jump that reuses the frame.
+
+    A call in tail position, like return f(n - 1, acc + n), only copies the return value of the called function into
+    its own return value before its ENDFUNC. When both functions return the value in the same address, which happens
+    when a function calls itself, or neither returns a value, the GOSUB is replaced by a TAILCALL. The virtual machine
+    runs the called function in place of the current one without saving it in the call stack, so the ENDFUNC of the
+    called function returns straight to the original caller and the recursion runs in constant stack memory.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Replace the tail calls of every function.
+        get_tail_quads(block: BasicBlock, index: int) -> list[Quad] | None:
+            Get the quadruples that run between a call and the end of the function.
+        check_returns_result(quads: list[Quad], return_address: int | None) -> bool:
+            Check if the quadruples after a call only copy its return value into the return value of the function.
+    """
+
+    name = "tail"
+    level = 2
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Replace the tail calls of every function.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        returned = program.get_returned_globals()
+        for graph in program.graphs:
+            function = program.function_directory.get_function_from_directory(graph.name)
+            for block in graph.blocks:
+                for index, quad in enumerate(block.quads):
+                    if quad.operator != "GOSUB":
+                        continue
+                    callee = program.function_directory.get_function_from_directory(program.get_function_name(quad.return_address))
+                    # The caller of this function reads the result in its own return address
+                    if callee.return_address != function.return_address:
+                        continue
+                    if callee.return_address is not None and callee.name not in returned:
+                        continue
+                    quads = self.get_tail_quads(block, index)
+                    if quads is not None and self.check_returns_result(quads, function.return_address):
+                        block.quads = block.quads[:index] + [Quad("TAILCALL", None, None, quad.return_address)]
+                        block.jump_target = None
+                        break
+            graph.compute_edges()
+
+    def get_tail_quads(self, block: BasicBlock, index: int) -> list[Quad] | None:
+        """
+        Get the quadruples that run between a call and the end of the function.
+
+        Parameters:
+            block (BasicBlock): The block with the GOSUB quadruple.
+            index (int): The position of the GOSUB quadruple in the block.
+
+        Returns:
+            list[Quad] | None: The quadruples before the ENDFUNC, or None if the call is not followed by the end of the function.
+        """
+        quads = block.quads[index + 1:]
+        if block.ends_in_jump() and quads[-1].operator == "GOTO":
+            quads = quads[:-1]
+        elif block.ends_in_jump():
+            return None
+        if quads and quads[-1].operator == "ENDFUNC":
+            return quads[:-1]
+        # The block can also continue into a block that only ends the function
+        if len(block.successors) != 1 or [quad.operator for quad in block.successors[0].quads] != ["ENDFUNC"]:
+            return None
+        return quads
+
+    def check_returns_result(self, quads: list[Quad], return_address: int | None) -> bool:
+        """
+        Check if the quadruples after a call only copy its return value into the return value of the function.
+
+        Parameters:
+            quads (list[Quad]): The quadruples between the call and the end of the function.
+            return_address (int | None): The return address of the function, which is also the return address of the call.
+
+        Returns:
+            bool: True or False depending on if the quadruples leave the return address with the result of the call.
+        """
+        # Follow the copies of the result, which can only be stored in the frame that is discarded
+        holds_result = {return_address}
+        for quad in quads:
+            if quad.operator != "=" or quad.left_address not in holds_result:
+                return False
+            if quad.return_address != return_address and not QuadHelper.is_local_address(quad.return_address):
+                return False
+            holds_result.add(quad.return_address)
+        return True
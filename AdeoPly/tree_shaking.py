@@ -0,0 +1,139 @@
+from control_flow_graph import ProgramFlowGraph
+from memory_manager import MemoryManager
+from quad_helper import QuadHelper
+from quadruples import IndexedAddress, Quad
+
+class TreeShaking:
+    """
+    The TreeShaking class removes the functions, global variables and constants that the program never uses.
+
+    The functions are followed from the calls of the prologue through the calls of every function they reach, and the
+    ones that are never called, including the functions that were replaced by their copies or inlined everywhere, are
+    removed from the layout and the function directory. The jumps are then pointed to their final quadruples, so the
+    constants of the old positions are no longer read, and the global and constant addresses are packed so the object
+    file only keeps the values the remaining quadruples read or write. The arrays are reached by adding an index to
+    their address at run time, so the global arrays keep their addresses and the other variables fill the space around
+    them. This runs after the other optimizations, when no quadruple can start using an address again.
+
+    Attributes:
+        name (str): The name of the optimization.
+        level (int): The lowest optimization level that runs the optimization.
+
+    Methods:
+        run(program: ProgramFlowGraph):
+            Remove the unused functions and pack the global and constant memory.
+        find_called_functions(program: ProgramFlowGraph) -> set[str]:
+            Find the functions that can be called when the program runs.
+        compact_memory(memory_manager: MemoryManager, used: set[int], fixed: set[int]) -> dict:
+            Pack the used addresses of a memory manager and drop the values of the other ones.
+        replace_operand(operand: int | IndexedAddress | None, addresses: dict) -> int | IndexedAddress | None:
+            Get the new address of an operand after the memory was packed.
+    """
+
+    name = "shake"
+    level = 1
+
+    def run(self, program: ProgramFlowGraph):
+        """
+        Remove the unused functions and pack the global and constant memory.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+        """
+        called = self.find_called_functions(program)
+        program.graphs = [graph for graph in program.graphs if graph.name in called]
+        functions = program.function_directory.functions
+        for f_name in [f_name for f_name in functions if f_name not in called]:
+            del functions[f_name]
+        # Lay out the program once so the jumps read the constants of their final positions
+        program.to_quadruples()
+        quads = list(program.prologue) + [quad for graph in program.graphs for block in graph.blocks for quad in block.quads]
+        used = set()
+        for quad in quads:
+            for operand in [quad.left_address, quad.right_address, quad.return_address]:
+                # The base of an indexed operand is only added to the index, so it is not an address of its own
+                used.add(operand.index if isinstance(operand, IndexedAddress) else operand)
+        # The virtual machine stores the result of each function in its return address
+        used |= {function.return_address for function in functions.values()}
+        fixed = {address for start, size in program.function_directory.arrays for address in range(start, start + size) if QuadHelper.is_global_address(address)}
+        addresses = self.compact_memory(program.global_memory_manager, {address for address in used if QuadHelper.is_global_address(address)}, fixed)
+        addresses |= self.compact_memory(program.constant_memory_manager, {address for address in used if QuadHelper.is_constant_address(address)}, set())
+        program.prologue = [Quad(quad.operator, *[self.replace_operand(operand, addresses) for operand in [quad.left_address, quad.right_address, quad.return_address]]) for quad in program.prologue]
+        for graph in program.graphs:
+            for block in graph.blocks:
+                block.quads = [Quad(quad.operator, *[self.replace_operand(operand, addresses) for operand in [quad.left_address, quad.right_address, quad.return_address]]) for quad in block.quads]
+        for function in functions.values():
+            function.address = addresses[function.address]
+            function.return_address = addresses.get(function.return_address)
+        program.written_globals = None
+        program.returned_globals = None
+
+    def find_called_functions(self, program: ProgramFlowGraph) -> set[str]:
+        """
+        Find the functions that can be called when the program runs.
+
+        Parameters:
+            program (ProgramFlowGraph): The control flow graphs of the program.
+
+        Returns:
+            set[str]: The names of the functions called by the prologue or by another called function.
+        """
+        pending = [program.get_function_name(quad.return_address) for quad in program.prologue if quad.operator == "GOSUB"]
+        called = set()
+        while pending:
+            f_name = pending.pop()
+            if f_name in called:
+                continue
+            called.add(f_name)
+            for block in program.get_graph(f_name).blocks:
+                for quad in block.quads:
+                    if quad.operator in ["GOSUB", "TAILCALL"]:
+                        pending.append(program.get_function_name(quad.return_address))
+        return called
+
+    def compact_memory(self, memory_manager: MemoryManager, used: set[int], fixed: set[int]) -> dict:
+        """
+        Pack the used addresses of a memory manager and drop the values of the other ones.
+
+        Parameters:
+            memory_manager (MemoryManager): The memory manager to pack.
+            used (set[int]): The addresses that the program reads or writes.
+            fixed (set[int]): The addresses that must keep their position, which are kept even if they are not used.
+
+        Returns:
+            dict: A dictionary with the new address of each used or fixed address.
+        """
+        addresses = {}
+        for space in [memory_manager.ints_space, memory_manager.floats_space, memory_manager.strings_space, memory_manager.bools_space, memory_manager.ptrs_space]:
+            start = space.initial_address
+            kept = [start + i for i in range(len(space.values)) if start + i in fixed]
+            size = max(kept) - start + 1 if kept else 0
+            values = [space.values[i] if start + i in fixed else None for i in range(size)]
+            # The other used addresses fill the positions that are not fixed, in their original order
+            free = (i for i in range(len(space.values) + size) if start + i not in fixed)
+            for address in kept:
+                addresses[address] = address
+            for i, value in enumerate(space.values):
+                if start + i in used and start + i not in fixed:
+                    position = next(free)
+                    if position >= len(values):
+                        values.extend([None] * (position - len(values) + 1))
+                    values[position] = value
+                    addresses[start + i] = start + position
+            space.values = values
+        return addresses
+
+    def replace_operand(self, operand: int | IndexedAddress | None, addresses: dict) -> int | IndexedAddress | None:
+        """
+        Get the new address of an operand after the memory was packed.
+
+        Parameters:
+            operand (int | IndexedAddress | None): The operand of a quadruple.
+            addresses (dict): A dictionary with the new address of each packed address.
+
+        Returns:
+            int | IndexedAddress | None: The operand with its new address, or the same operand if its address did not move.
+        """
+        if isinstance(operand, IndexedAddress):
+            return IndexedAddress(operand.base, addresses.get(operand.index, operand.index))
+        return addresses.get(operand, operand)
@@ -0,0 +1,335 @@
+import itertools
+
+class VectorKernel:
+    """
+    The VectorKernel class runs the loops over arrays that the compiler turned into vector operations, with NumPy.
+
+    The operands of an operation are the values collected by the VARG quadruples before it, in order. They start with
+    the number of nested loops and the start and end of each loop, from the outermost. An affine value is a constant,
+    the number of terms, the value and coefficient of each term and the coefficient of each loop variable, and it gives
+    the address of an element or an integer for every iteration. The form of the operation is written in postfix,
+    where 'a' is the element at an affine address, 'v' is an affine integer, 's' is a single value and the operators
+    combine the two values before them. A VMAP stores its form in the element at an affine address in every iteration.
+    A VREDUCE adds its form to an accumulator in iteration order, which is a single value ('s') or the element at an
+    affine address ('a') that only moves with the outer loops and can start with a value ('i'). The rest of the
+    operands are the bounds checks of the loops, each one an affine index and the size of its dimension.
+
+    The operation only runs when its result is exactly the one the loops would leave, with the same types, rounding and
+    order of the additions. When NumPy is not installed, an element is not initialized, an index is out of bounds, a
+    divisor is zero, an integer could overflow or a loop would not run, it does nothing, and the loops that follow it
+    run their iterations one by one and raise the same errors they always did.
+
+    Attributes:
+        max_int (int): The magnitude that the integers must stay below to be computed as 64-bit integers.
+        max_exact (int): The magnitude that the divided integers must stay below to be exact as 64-bit floats.
+
+    Methods:
+        run(virtual_machine: VirtualMachine, operator: str, form: str, accumulator: str | None, args: list) -> list:
+            Run a vector operation if its result is exact.
+        execute(virtual_machine: VirtualMachine, numpy: module, operator: str, form: str, accumulator: str | None, args: list) -> list:
+            Run a vector operation, where a ValueError is raised when it cannot run exactly.
+        check_bounds(numpy: module, args: iterator, starts: list[int], counts: list[int]):
+            Check that the indexes of the bounds checks are inside their dimension in every iteration.
+        read_affine(numpy: module, args: iterator, starts: list[int], counts: list[int]) -> tuple:
+            Read an affine value and compute it for every iteration.
+        locate(virtual_machine: VirtualMachine, addresses: ndarray) -> tuple:
+            Get the type space that stores the elements at an array of addresses.
+        gather(virtual_machine: VirtualMachine, numpy: module, addresses: ndarray) -> tuple:
+            Read the values of the elements at an array of addresses.
+        evaluate(virtual_machine: VirtualMachine, numpy: module, form: str, args: iterator, starts: list[int], counts: list[int]) -> tuple:
+            Compute the values of a form in postfix for every iteration.
+        combine(numpy: module, operator: str, left: tuple, right: tuple) -> tuple:
+            Apply an arithmetic operator to two values like the virtual machine does.
+        get_numpy() -> module | None:
+            Import NumPy, which the vector operations run with when it is installed.
+    """
+
+    max_int = 2 ** 63
+    max_exact = 2 ** 53
+
+    @staticmethod
+    def run(virtual_machine, operator: str, form: str, accumulator: str | None, args: list) -> list:
+        """
+        Run a vector operation if its result is exact.
+
+        Parameters:
+            virtual_machine (VirtualMachine): The virtual machine whose memory has the arrays.
+            operator (str): The operator of the quadruple, VMAP or VREDUCE.
+            form (str): The value of every iteration, in postfix.
+            accumulator (str | None): The kind of accumulator of a VREDUCE.
+            args (list): The values collected by the VARG quadruples.
+
+        Returns:
+            list: The final values of the loop variables and of a single accumulator for the VOUT quadruples, or an empty list if the loops have to run.
+        """
+        numpy = VectorKernel.get_numpy()
+        if numpy is None:
+            return []
+        try:
+            with numpy.errstate(all="ignore"):
+                return VectorKernel.execute(virtual_machine, numpy, operator, form, accumulator, args)
+        except (ArithmeticError, IndexError, StopIteration, TypeError, ValueError):
+            return []
+
+    @staticmethod
+    def execute(virtual_machine, numpy, operator: str, form: str, accumulator: str | None, args: list) -> list:
+        """
+        Run a vector operation, where a ValueError is raised when it cannot run exactly.
+
+        Parameters:
+            virtual_machine (VirtualMachine): The virtual machine whose memory has the arrays.
+            numpy (module): The numpy module.
+            operator (str): The operator of the quadruple, VMAP or VREDUCE.
+            form (str): The value of every iteration, in postfix.
+            accumulator (str | None): The kind of accumulator of a VREDUCE.
+            args (list): The values collected by the VARG quadruples.
+
+        Returns:
+            list: The final values of the loop variables and of a single accumulator.
+        """
+        args = iter(args)
+        starts = []
+        counts = []
+        for _ in range(next(args)):
+            start, end = next(args), next(args)
+            if type(start) != int or type(end) != int or end <= start:
+                raise ValueError("Every loop must run at least once.")
+            starts.append(start)
+            counts.append(end - start)
+        shape = tuple(counts)
+        results = [start + count for start, count in zip(starts, counts)]
+        reduce = operator == "VREDUCE"
+        init = next(args) if reduce and accumulator.startswith("i") else None
+        if not reduce or accumulator.endswith("a"):
+            targets, strides = VectorKernel.read_affine(numpy, args, starts, counts)
+            targets = numpy.broadcast_to(targets, shape)
+        else:
+            value = next(args)
+            if type(value) not in [int, float]:
+                raise ValueError("The accumulator is not a number.")
+        values, bound = VectorKernel.evaluate(virtual_machine, numpy, form, args, starts, counts)
+        values = numpy.broadcast_to(values, shape)
+        # Every bounds check has to pass in every iteration before anything is written
+        VectorKernel.check_bounds(numpy, args, starts, counts)
+        if not reduce:
+            # Each iteration stores its own element, so the order of the stores does not matter
+            if numpy.unique(targets).size != targets.size:
+                raise ValueError("Two iterations store the same element.")
+            typespace, v_type = VectorKernel.locate(virtual_machine, targets)
+            if v_type == "float":
+                values = values.astype(numpy.float64)
+            elif values.dtype.kind != "i":
+                raise ValueError("A float is not stored exactly in an integer.")
+            writes = zip(targets.ravel().tolist(), values.ravel().tolist())
+        else:
+            # The outer loops that move the accumulator map over it and the inner ones add to it
+            outer = 0
+            if accumulator.endswith("a"):
+                while outer < len(strides) and strides[outer] != 0:
+                    outer += 1
+                if any(strides[outer:]):
+                    raise ValueError("The accumulator moves in an inner loop.")
+            rows = int(numpy.prod(shape[:outer]))
+            values = values.reshape(rows, -1)
+            if accumulator.endswith("a"):
+                targets = targets[tuple(slice(None) if level < outer else 0 for level in range(len(shape)))].reshape(rows)
+                if numpy.unique(targets).size != rows:
+                    raise ValueError("Two iterations add to the same element.")
+                typespace, v_type = VectorKernel.locate(virtual_machine, targets)
+                if init is None:
+                    first, first_bound = VectorKernel.gather(virtual_machine, numpy, targets)
+                elif type(init) == int or (type(init) == float and v_type == "float"):
+                    first, first_bound = numpy.full(rows, init), abs(init)
+                else:
+                    raise ValueError("The initial value is not stored exactly.")
+            else:
+                v_type = "float" if type(value) == float else "int"
+                first, first_bound = numpy.array([value]), abs(value)
+            if v_type == "float":
+                first = first.astype(numpy.float64)
+                values = values.astype(numpy.float64)
+            elif values.dtype.kind != "i" or first_bound + values.shape[1] * bound >= VectorKernel.max_int:
+                raise ValueError("The sum of the integers could overflow.")
+            # Accumulating adds the values one by one in iteration order, which rounds like the loops do
+            sums = numpy.add.accumulate(numpy.concatenate([first.reshape(rows, 1), values], axis=1), axis=1)[:, -1]
+            if not accumulator.endswith("a"):
+                return results + sums.tolist()
+            writes = zip(targets.tolist(), sums.tolist())
+        for address, value in writes:
+            typespace.values[address - typespace.initial_address] = value
+        return results
+
+    @staticmethod
+    def check_bounds(numpy, args, starts: list[int], counts: list[int]):
+        """
+        Check that the indexes of the bounds checks are inside their dimension in every iteration.
+
+        Parameters:
+            numpy (module): The numpy module.
+            args (iterator): The operands that are left, which are the bounds checks.
+            starts (list[int]): The start of each loop.
+            counts (list[int]): The number of iterations of each loop.
+        """
+        end = object()
+        item = next(args, end)
+        while item is not end:
+            indexes, _ = VectorKernel.read_affine(numpy, itertools.chain([item], args), starts, counts)
+            size = next(args)
+            if int(indexes.min()) < 0 or int(indexes.max()) >= size:
+                raise ValueError("An index is out of bounds.")
+            item = next(args, end)
+
+    @staticmethod
+    def read_affine(numpy, args, starts: list[int], counts: list[int]) -> tuple:
+        """
+        Read an affine value and compute it for every iteration.
+
+        Parameters:
+            numpy (module): The numpy module.
+            args (iterator): The operands, which continue with the affine value.
+            starts (list[int]): The start of each loop.
+            counts (list[int]): The number of iterations of each loop.
+
+        Returns:
+            tuple: The integers with one dimension for each loop, which is only as long as its loop when they change with it, and the coefficient of each loop variable.
+        """
+        constant = next(args)
+        terms = [(next(args), next(args)) for _ in range(next(args))]
+        strides = [next(args) for _ in counts]
+        if any(type(number) != int for number in [constant] + strides + [number for term in terms for number in term]):
+            raise ValueError("An affine value is not an integer.")
+        base = constant + sum(value * coefficient for value, coefficient in terms) + sum(stride * start for stride, start in zip(strides, starts))
+        if abs(base) + sum(abs(stride) * count for stride, count in zip(strides, counts)) >= VectorKernel.max_int // 2:
+            raise ValueError("An affine value is too large.")
+        values = numpy.full([1] * len(counts), base, dtype=numpy.int64)
+        for level, (stride, count) in enumerate(zip(strides, counts)):
+            if stride != 0:
+                values = values + stride * numpy.arange(count, dtype=numpy.int64).reshape([count if other == level else 1 for other in range(len(counts))])
+        return (values, strides)
+
+    @staticmethod
+    def locate(virtual_machine, addresses) -> tuple:
+        """
+        Get the type space that stores the elements at an array of addresses.
+
+        Parameters:
+            virtual_machine (VirtualMachine): The virtual machine whose memory has the arrays.
+            addresses (ndarray): The addresses of the elements.
+
+        Returns:
+            tuple: The type space and the type of the elements, which must be integers or floats.
+        """
+        low, high = int(addresses.min()), int(addresses.max())
+        memory = virtual_machine.get_memory_manager_type(low)
+        typespace = memory.get_typespace_from_address(low)
+        v_type = memory.get_type_from_address(low)
+        if (memory is not virtual_machine.get_memory_manager_type(high) or v_type not in ["int", "float"] or
+                low < typespace.initial_address or high >= typespace.initial_address + len(typespace.values)):
+            raise ValueError("The elements are not in the same array of numbers.")
+        return (typespace, v_type)
+
+    @staticmethod
+    def gather(virtual_machine, numpy, addresses) -> tuple:
+        """
+        Read the values of the elements at an array of addresses.
+
+        Parameters:
+            virtual_machine (VirtualMachine): The virtual machine whose memory has the arrays.
+            numpy (module): The numpy module.
+            addresses (ndarray): The addresses of the elements.
+
+        Returns:
+            tuple: The values with the same shape as the addresses and the largest magnitude of the integers, or None for floats.
+        """
+        typespace, v_type = VectorKernel.locate(virtual_machine, addresses)
+        low = int(addresses.min())
+        elements = numpy.array(typespace.values[low - typespace.initial_address:int(addresses.max()) - typespace.initial_address + 1], dtype=object)[addresses - low]
+        # Only the elements that are read must be initialized
+        if numpy.equal(elements, None).any():
+            raise ValueError("An element is not initialized.")
+        # An integer that does not fit in 64 bits raises an OverflowError
+        values = elements.astype(numpy.int64 if v_type == "int" else numpy.float64)
+        return (values, max(abs(int(values.min())), abs(int(values.max()))) if v_type == "int" else None)
+
+    @staticmethod
+    def evaluate(virtual_machine, numpy, form: str, args, starts: list[int], counts: list[int]) -> tuple:
+        """
+        Compute the values of a form in postfix for every iteration.
+
+        Parameters:
+            virtual_machine (VirtualMachine): The virtual machine whose memory has the arrays.
+            numpy (module): The numpy module.
+            form (str): The form in postfix.
+            args (iterator): The operands, which continue with the ones of the form.
+            starts (list[int]): The start of each loop.
+            counts (list[int]): The number of iterations of each loop.
+
+        Returns:
+            tuple: The values and the largest magnitude they can have if they are integers, or None for floats.
+        """
+        stack = []
+        for token in form:
+            if token == "a":
+                addresses, _ = VectorKernel.read_affine(numpy, args, starts, counts)
+                stack.append(VectorKernel.gather(virtual_machine, numpy, addresses))
+            elif token == "v":
+                values, _ = VectorKernel.read_affine(numpy, args, starts, counts)
+                stack.append((values, max(abs(int(values.min())), abs(int(values.max())))))
+            elif token == "s":
+                value = next(args)
+                if type(value) not in [int, float]:
+                    raise ValueError("The value is not a number.")
+                stack.append((numpy.array(value, dtype=numpy.int64 if type(value) == int else numpy.float64), abs(value) if type(value) == int else None))
+            else:
+                right = stack.pop()
+                stack.append(VectorKernel.combine(numpy, token, stack.pop(), right))
+        return stack.pop()
+
+    @staticmethod
+    def combine(numpy, operator: str, left: tuple, right: tuple) -> tuple:
+        """
+        Apply an arithmetic operator to two values like the virtual machine does.
+
+        Parameters:
+            numpy (module): The numpy module.
+            operator (str): The arithmetic operator.
+            left (tuple): The left values and the largest magnitude of their integers.
+            right (tuple): The right values and the largest magnitude of their integers.
+
+        Returns:
+            tuple: The result and the largest magnitude it can have if it is an integer, or None for floats.
+        """
+        (left_values, left_bound), (right_values, right_bound) = left, right
+        integers = left_bound is not None and right_bound is not None
+        if operator == "+":
+            values, bound = left_values + right_values, left_bound + right_bound if integers else None
+        elif operator == "-":
+            values, bound = left_values - right_values, left_bound + right_bound if integers else None
+        elif operator == "*":
+            values, bound = left_values * right_values, left_bound * right_bound if integers else None
+        else:
+            if numpy.any(right_values == 0):
+                raise ValueError("A divisor is zero.")
+            values, bound = left_values / right_values, None
+            # The quotient of two integers is stored in an integer, which cuts its decimals
+            if integers:
+                if max(left_bound, right_bound) > VectorKernel.max_exact:
+                    raise ValueError("The integers are not exact as floats.")
+                values, bound = numpy.trunc(values).astype(numpy.int64), left_bound
+        if bound is not None and bound >= VectorKernel.max_int:
+            raise ValueError("The integers could overflow.")
+        return (values, bound)
+
+    @staticmethod
+    def get_numpy():
+        """
+        Import NumPy, which the vector operations run with when it is installed.
+
+        Returns:
+            module | None: The numpy module, or None if it is not installed.
+        """
+        try:
+            import numpy
+        except ImportError:
+            return None
+        return numpy
@@ -1,10 +1,16 @@
-import ast, codecs, re
+import ast, bisect, re, sys
+from array_file import ArrayFile
+from collections import OrderedDict
 from data_helper import DataHelper
 from function_directory import FunctionDirectoryVM
-from memory_manager import MemoryManager, SIZE
+from input_reader import InputReader
+from memory_manager import MemoryManager, SIZE, TypeSpace
+from parallel_loop import ParallelLoop
+from profile_data import ProfileData
 from program_error import raise_program_error, ProgramErrorType
-from quadruples import Quadruples
+from quadruples import IndexedAddress, Quad, Quadruples
 from typing import Tuple
+from vector_kernel import VectorKernel
 
 START_CONSTANT_MEMORY = SIZE * 5
 START_FUNCTION_MEMORY = START_CONSTANT_MEMORY * 2
@@ -19,11 +25,23 @@ class VirtualMachine:
         temporal_memory_manager (MemoryManager | None): The memory manager for the temporal memory, or None if not initialized.
         function_directory (FunctionDirectoryVM): The function directory.
         quadruples (Quadruples): The collection of quadruples.
-        function_memory_stack (list): A stack that stores the instruction pointer and function memory manager during function calls.
+        function_memory_stack (list): A stack that stores the instruction pointer, function memory manager and pending results of pure calls during function calls.
         return_value (int | float | str | bool | None): The return value of a function.
+        memo_size (int): The maximum number of results of pure calls that are kept, where 0 turns off the memoization.
+        memo_cache (OrderedDict): The results of the pure calls for each function name and arguments, from the least to the most recently used.
+        quad_counts (list[int] | None): The number of times each quadruple was executed, or None if the execution is not profiled.
+        taken_counts (list[int] | None): The number of times each quadruple jumped, or None if the execution is not profiled.
+        output_limit (int): The number of pending characters of output that makes the virtual machine write them.
+        output_buffer (list[str]): The text printed since the output was last written.
+        output_size (int): The number of characters in the output buffer.
+        input_reader (InputReader | None): The reader of the lines stored by READ, or None until the first READ reads the standard input.
+        vector_args (list): The values collected by the VARG quadruples for the next vector operation.
+        vector_results (list): The values the last vector operation left for the VOUT quadruples after it, which is empty if it did not run.
+        workers (int): The number of worker processes that run the iterations of a parallel loop, where 1 runs them one by one.
+        parallel_pool (ProcessPoolExecutor | None): The pool of worker processes, or None until the first parallel loop runs.
 
     Methods:
-        __init__():
+        __init__(memo_size: int, profile: bool, input_reader: InputReader | None, workers: int):
             Initialize a new instance of the VirtualMachine class.
         process_section_data(section_data: dict) -> None:
             Process the sections of data and populate memory, function directory, and quadruples.
@@ -31,13 +49,33 @@ class VirtualMachine:
             Get the memory manager type based on the address.
         check_variable_initialized(memory: list[Tuple[int, int | float | str | bool]]) -> None:
             Check if variables in the memory list have been initialized.
-        check_valid_ptr(curr_address: int, past_address: int, memory: MemoryManager) -> bool:
-            Check if the current address corresponds to a valid pointer.
+        parse_operand(operand: str) -> int | IndexedAddress | None:
+            Parse an operand of a quadruple in the object file.
+        resolve_operand(operand: int | IndexedAddress | None) -> int | None:
+            Get the address an operand names at the current point of the execution.
+        get_array(base_address: int) -> tuple[TypeSpace, int, str]:
+            Get the type space that stores an array, the position of its first element and the type of its elements.
+        read_array(base_address: int, size: int) -> list:
+            Get the values of the elements of an array.
+        call_function(f_name: str, is_tail_call: bool) -> bool:
+            Start the execution of a function or reuse the result of an earlier call with the same arguments.
+        end_function() -> bool:
+            Return to the function that made the last call and save the results of its pure calls.
         start_execution() -> int:
             Start executing the quadruples.
+        write_output(text: str):
+            Add text to the output, which is written once enough of it is pending.
+        flush_output():
+            Write the pending output.
+        execute_quad(quad: Quad) -> bool:
+            Execute a single quadruple, where the instruction pointer already points to the next one.
+        get_profile() -> ProfileData:
+            Get the execution counts of the quadruples grouped by function.
     """
 
-    def __init__(self):
+    output_limit = 8192
+
+    def __init__(self, memo_size: int = 1024, profile: bool = False, input_reader: InputReader | None = None, workers: int = 1):
         self.global_memory_manager = MemoryManager(0)
         self.constant_memory_manager = MemoryManager(START_CONSTANT_MEMORY)
         self.function_memory_manager = MemoryManager(START_FUNCTION_MEMORY)
@@ -46,6 +84,17 @@ class VirtualMachine:
         self.quadruples = Quadruples()
         self.function_memory_stack = []
         self.return_value = None
+        self.memo_size = memo_size
+        self.memo_cache = OrderedDict()
+        self.quad_counts = [] if profile else None
+        self.taken_counts = [] if profile else None
+        self.output_buffer = []
+        self.output_size = 0
+        self.input_reader = input_reader
+        self.vector_args = []
+        self.vector_results = []
+        self.workers = workers
+        self.parallel_pool = None
 
     def process_section_data(self, section_data):
         """
@@ -54,41 +103,71 @@ class VirtualMachine:
          Parameters:
             section_data (dict): A dictionary containing the section names as keys and their data as values.
         """
-        sections = ["--Global Memory--", "--Constants--", "--Functions--", "--Quadruples--"]
+        sections = ["--Global Memory--", "--Constants--", "--Functions--", "--Data--", "--Quadruples--"]
         for section, data in section_data.items():
             # Global memory
             if section == sections[0]:
                 for elem in data:
                     v = re.findall(r'(\d+).*?-(.*)', elem)[0]
                     v_type = self.global_memory_manager.get_type_from_address(int(v[0]))
-                    if v[1] == "None":
-                        self.global_memory_manager.reserve_space(v_type)
-                    else:
-                        v_value = DataHelper.change_to_type(v_type, v[1])
-                        self.global_memory_manager.find_memory_address(v_value)
+                    # Each value keeps its position, since the compiler can store the same initial value in several variables
+                    v_address = self.global_memory_manager.reserve_space(v_type)
+                    if v[1] != "None":
+                        self.global_memory_manager[v_address] = DataHelper.change_to_type(v_type, v[1])
             # Constant memory
             elif section == sections[1]:
                 for elem in data:
                     c = re.findall(r'(\d+).*?-(.*)', elem)[0]
                     c_type = self.constant_memory_manager.get_type_from_address(int(c[0]))
                     c_value = DataHelper.change_to_type(c_type, c[1])
-                    self.constant_memory_manager.find_memory_address(c_value)
+                    # Each constant keeps its position, since two strings can be the same once their escape sequences are decoded
+                    self.constant_memory_manager.add_value_to_typespace(self.constant_memory_manager.get_typespace_from_type(c_type), c_value)
             # Functions
             elif section == sections[2]:
                 for elem in data:
                     f = re.findall(r'\([^)]*\)|[^,]+', elem)
                     f_resources = ast.literal_eval(f[2])
-                    self.function_directory.add_function_to_directory(f[0], int(f[3]), f_resources)
-            # Quadruples
+                    f_return_address = int(f[4]) if len(f) > 4 and f[4] != "None" else None
+                    f_pure = len(f) > 5 and f[5] == "True"
+                    self.function_directory.add_function_to_directory(f[0], int(f[3]), f_resources, f_return_address, f_pure)
+            # Initial values of local arrays
             elif section == sections[3]:
+                frames = {}
+                for elem in data:
+                    d = re.findall(r'([^,]+),(\d+)-(.*)', elem)[0]
+                    if d[0] not in frames:
+                        frames[d[0]] = MemoryManager(START_FUNCTION_MEMORY, self.function_directory.get_function_from_directory(d[0]).resources)
+                    d_type = frames[d[0]].get_type_from_address(int(d[1]))
+                    frames[d[0]][int(d[1])] = DataHelper.change_to_type(d_type, d[2])
+                # Each function keeps the values its memory starts with, so a call copies them all at once
+                for f_name, frame in frames.items():
+                    self.function_directory.get_function_from_directory(f_name).data = frame.get_values()
+            # Quadruples
+            elif section == sections[4]:
                 for elem in data:
                     q = elem[1:-1].split(',')
                     operator = q[0]
-                    v1 = int(q[1]) if q[1] != 'None' else None
-                    v2 = int(q[2]) if q[2] != 'None' else None
-                    v3 = int(q[3]) if q[3] != 'None' else None
+                    v1, v2, v3 = [self.parse_operand(operand) for operand in q[1:4]]
                     self.quadruples.add_quad(operator, v1, v2, v3)
 
+    def parse_operand(self, operand: str) -> int | IndexedAddress | None:
+        """
+        Parse an operand of a quadruple in the object file.
+
+        Parameters:
+            operand (str): The operand as it is written in the object file.
+
+        Returns:
+            int | IndexedAddress | None: The address, the indexed operand, or None if the field is empty.
+        """
+        if operand == 'None':
+            return None
+        # The base is negative when the constant part of the index is below the start of the array
+        indexed = re.fullmatch(r'(-?\d+)\[(\d+)\]', operand)
+        if indexed:
+            return IndexedAddress(int(indexed[1]), int(indexed[2]))
+        return int(operand)
+
     def get_memory_manager_type(self, address: int | None) -> MemoryManager:
         """
         Get the memory manager type based on the address.
@@ -117,18 +196,105 @@ class VirtualMachine:
             if v_value is None:
                 raise_program_error(ProgramErrorType.VARIABLE_NOT_INITIALIZED, None, f"The variable at address '{v_address}' was not initialized")
                 
-    def check_valid_ptr(self, curr_address: int, past_address: int, memory: MemoryManager) -> bool:
+    def resolve_operand(self, operand: int | IndexedAddress | None) -> int | None:
+        """
+        Get the address an operand names at the current point of the execution.
+
+        Parameters:
+            operand (int | IndexedAddress | None): The operand of a quadruple.
+
+        Returns:
+            int | None: The address of the operand, which for an indexed operand is its base plus the value of its index.
+        """
+        if not isinstance(operand, IndexedAddress):
+            return operand
+        index_memory = self.get_memory_manager_type(operand.index)
+        self.check_variable_initialized([(operand.index, index_memory[operand.index])])
+        return operand.base + index_memory[operand.index]
+
+    def get_array(self, base_address: int) -> tuple[TypeSpace, int, str]:
+        """
+        Get the type space that stores an array, the position of its first element and the type of its elements.
+
+        Parameters:
+            base_address (int): The address of the first element of the array.
+
+        Returns:
+            tuple[TypeSpace, int, str]: The type space, the position of the first element in its values and the type of the elements.
+        """
+        memory = self.get_memory_manager_type(base_address)
+        typespace = memory.get_typespace_from_address(base_address)
+        return (typespace, base_address - typespace.initial_address, memory.get_type_from_address(base_address))
+
+    def read_array(self, base_address: int, size: int) -> list:
+        """
+        Get the values of the elements of an array.
+
+        Parameters:
+            base_address (int): The address of the first element of the array.
+            size (int): The number of elements of the array.
+
+        Returns:
+            list: A copy of the values, where a program error is raised if an element was not initialized.
+        """
+        typespace, start, _ = self.get_array(base_address)
+        values = typespace.values[start:start + size]
+        if None in values:
+            raise_program_error(ProgramErrorType.VARIABLE_NOT_INITIALIZED, None, f"The array at address '{base_address}' has elements that were not initialized")
+        return values
+
+    def call_function(self, f_name: str, is_tail_call: bool) -> bool:
         """
-        Check if the current address corresponds to a valid pointer.
-        
+        Start the execution of a function or reuse the result of an earlier call with the same arguments.
+
         Parameters:
-            curr_address (int): The current quad address, which would change from the original if there a pointer there.
-            past_address (int): The original quad address, which will remain the same for the whole execution.
-        
+            f_name (str): The name of the called function.
+            is_tail_call (bool): Indicates if the called function takes the place of the current one.
+
+        Returns:
+            bool: True or False depending on if the call ended the program.
+        """
+        function = self.function_directory.get_function_from_directory(f_name)
+        results = []
+        if function.pure and self.memo_size > 0:
+            # The memory of the called function only has the arguments before it starts
+            key = (f_name, self.temporal_memory_manager.get_values())
+            if key in self.memo_cache:
+                self.memo_cache.move_to_end(key)
+                self.global_memory_manager[function.return_address] = self.memo_cache[key]
+                # The result of a tail call is also the result of the current function
+                return self.end_function() if is_tail_call else False
+            results.append((key, function.return_address))
+        if is_tail_call:
+            # The called function returns to the same caller with the same result
+            self.function_memory_stack[-1][2].extend(results)
+        else:
+            self.function_memory_stack.append((self.quadruples.instr_ptr, self.function_memory_manager, results))
+        self.function_memory_manager = self.temporal_memory_manager
+        # Set instruction pointer to the start of the function
+        self.quadruples.instr_ptr = function.initial_quad_address
+        return False
+
+    def end_function(self) -> bool:
+        """
+        Return to the function that made the last call and save the results of its pure calls.
+
         Returns:
-            bool: True or False depending on if the current address is a valid pointer.
+            bool: True or False depending on if the program ended.
         """
-        return curr_address is not None and memory.get_type_from_address(past_address) == "ptr"
+        # Clear temporal memory
+        self.temporal_memory_manager.clear_memory_values()
+        # Get previously stored function memory or use global memory
+        self.quadruples.instr_ptr, self.function_memory_manager, results = self.function_memory_stack.pop()
+        for key, return_address in results:
+            value = self.global_memory_manager[return_address]
+            if value is not None:
+                self.memo_cache[key] = value
+                self.memo_cache.move_to_end(key)
+                # Forget the least recently used result when the cache is full
+                if len(self.memo_cache) > self.memo_size:
+                    self.memo_cache.popitem(last=False)
+        return len(self.function_memory_stack) == 0
 
     def start_execution(self) -> int:
         """
@@ -137,108 +303,223 @@ class VirtualMachine:
         Returns:
             int: The return value of the program.
         """
-        for quad in self.quadruples:
-            left_address = quad.left_address
-            right_address = quad.right_address
-            return_address = quad.return_address
-            # Get the type of memory manager for each address
-            left_memory = self.get_memory_manager_type(left_address)
-            right_memory = self.get_memory_manager_type(right_address)
-            return_memory = self.get_memory_manager_type(return_address)
-            # Update address and memory if there is a pointer
-            if self.check_valid_ptr(left_address, quad.left_address, left_memory):
-                memory = self.get_memory_manager_type(left_memory[left_address])
-                left_address = left_memory[left_address]
-                left_memory = memory
-            if self.check_valid_ptr(right_address, quad.right_address, right_memory):
-                memory = self.get_memory_manager_type(right_memory[right_address])
-                right_address = right_memory[right_address]
-                right_memory = memory
-            if self.check_valid_ptr(return_address, quad.return_address, return_memory) and quad.operator != "PTR":
-                memory = self.get_memory_manager_type(return_memory[return_address])
-                return_address = return_memory[return_address]
-                return_memory = memory
-
-            # Perform quad operations
-            if quad.operator == "=":
+        if self.quad_counts is not None:
+            self.quad_counts = [0] * len(self.quadruples.quadruples)
+            self.taken_counts = [0] * len(self.quadruples.quadruples)
+        try:
+            for quad in self.quadruples:
+                if self.quad_counts is not None:
+                    self.quad_counts[self.quadruples.instr_ptr - 1] += 1
+                if self.execute_quad(quad):
+                    return self.return_value
+        finally:
+            # The output printed before the end of the program or an error is always shown
+            self.flush_output()
+            if self.parallel_pool is not None:
+                self.parallel_pool.shutdown(cancel_futures=True)
+
+    def write_output(self, text: str):
+        """
+        Add text to the output, which is written once enough of it is pending.
+
+        Parameters:
+            text (str): The text to print.
+        """
+        self.output_buffer.append(text)
+        self.output_size += len(text)
+        if self.output_size >= self.output_limit:
+            self.flush_output()
+
+    def flush_output(self):
+        """
+        Write the pending output.
+        """
+        if self.output_buffer:
+            sys.stdout.write("".join(self.output_buffer))
+            self.output_buffer = []
+            self.output_size = 0
+
+    def execute_quad(self, quad: Quad) -> bool:
+        """
+        Execute a single quadruple, where the instruction pointer already points to the next one.
+
+        Parameters:
+            quad (Quad): The quadruple to execute.
+
+        Returns:
+            bool: True or False depending on if the program ended.
+        """
+        # Add the value of the index to the base of the indexed operands
+        left_address = self.resolve_operand(quad.left_address)
+        right_address = self.resolve_operand(quad.right_address)
+        return_address = self.resolve_operand(quad.return_address)
+        # Get the type of memory manager for each address
+        left_memory = self.get_memory_manager_type(left_address)
+        right_memory = self.get_memory_manager_type(right_address)
+        return_memory = self.get_memory_manager_type(return_address)
+
+        # Perform quad operations
+        if quad.operator == "=":
+            self.check_variable_initialized([(left_address, left_memory[left_address])])
+            return_memory[return_address] = left_memory[left_address]
+            # In case the value assignment is for a return
+            self.return_value = left_memory[left_address]
+        elif quad.operator in ["+", "-", "*", "/"]:
+            self.check_variable_initialized([(left_address, left_memory[left_address]), (right_address, right_memory[right_address])])
+            if quad.operator == "+":
+                return_memory[return_address] = left_memory[left_address] + right_memory[right_address]
+            elif quad.operator == "-":
+                return_memory[return_address] = left_memory[left_address] - right_memory[right_address]
+            elif quad.operator == "*":
+                return_memory[return_address] = left_memory[left_address] * right_memory[right_address]
+            elif quad.operator == "/":
+                if right_memory[right_address] == 0:
+                    raise_program_error(ProgramErrorType.ARITHMETIC_EXCEPTION, None, "Cannot divide a number by zero")
+                return_memory[return_address] = left_memory[left_address] / right_memory[right_address]
+        elif quad.operator in [">", ">=", "<", "<=", "==", "!="]:
+            self.check_variable_initialized([(left_address, left_memory[left_address]), (right_address, right_memory[right_address])])
+            if quad.operator == ">":
+                return_memory[return_address] = left_memory[left_address] > right_memory[right_address]
+            elif quad.operator == ">=":
+                return_memory[return_address] = left_memory[left_address] >= right_memory[right_address]
+            elif quad.operator == "<":
+                return_memory[return_address] = left_memory[left_address] < right_memory[right_address]
+            elif quad.operator == "<=":
+                return_memory[return_address] = left_memory[left_address] <= right_memory[right_address]
+            elif quad.operator == "==":
+                return_memory[return_address] = left_memory[left_address] == right_memory[right_address]
+            elif quad.operator == "!=":
+                return_memory[return_address] = left_memory[left_address] != right_memory[right_address]
+        elif quad.operator in ["||", "&&"]:
+            self.check_variable_initialized([(left_address, left_memory[left_address]), (right_address, right_memory[right_address])])
+            if quad.operator == "||":
+                return_memory[return_address] = left_memory[left_address] or right_memory[right_address]
+            elif quad.operator == "&&":
+                return_memory[return_address] = left_memory[left_address] and right_memory[right_address]
+        elif quad.operator == "PRINT":
+            # The arguments of a print fill the operands from the right, so a single argument is in the return address
+            for address, memory in [(left_address, left_memory), (right_address, right_memory), (return_address, return_memory)]:
+                if address is not None:
+                    self.check_variable_initialized([(address, memory[address])])
+                    self.write_output(str(memory[address]))
+        elif quad.operator == "READ":
+            # The pending output is shown before the program waits for the input
+            self.flush_output()
+            if self.input_reader is None:
+                self.input_reader = InputReader()
+            try:
+                # The line is parsed as the type of the variable that stores it
+                return_memory[return_address] = self.input_reader.read_value(return_memory.get_type_from_address(return_address))
+            except ValueError:
+                raise_program_error(ProgramErrorType.INPUT_TYPE_MISMATCH, None, f"The input cannot be stored in the variable because it is not of the same type")
+        elif quad.operator in ["READARRAY", "WRITEARRAY"]:
+            self.check_variable_initialized([(left_address, left_memory[left_address])])
+            # The elements of the array are copied with its type space in one slice
+            base_address = int(return_memory[return_address])
+            size = int(right_memory[right_address])
+            typespace, start, v_type = self.get_array(base_address)
+            if quad.operator == "READARRAY":
+                typespace.values[start:start + size] = ArrayFile.read(left_memory[left_address], v_type, size)
+            else:
+                values = self.read_array(base_address, size)
+                # The pending output is written first in case the file is the output of the program
+                self.flush_output()
+                ArrayFile.write(left_memory[left_address], v_type, values)
+        elif quad.operator in ["SORT", "FILL", "COPY"]:
+            base_address = int(return_memory[return_address])
+            size = int(right_memory[right_address])
+            typespace, start, v_type = self.get_array(base_address)
+            if quad.operator == "SORT":
+                typespace.values[start:start + size] = sorted(self.read_array(base_address, size))
+            elif quad.operator == "FILL":
                 self.check_variable_initialized([(left_address, left_memory[left_address])])
-                return_memory[return_address] = left_memory[left_address]
-                # In case the value assignment is for a return
-                self.return_value = left_memory[left_address]
-            elif quad.operator in ["+", "-", "*", "/"]:
-                self.check_variable_initialized([(left_address, left_memory[left_address]), (right_address, right_memory[right_address])])
-                if quad.operator == "+":
-                    return_memory[return_address] = left_memory[left_address] + right_memory[right_address]
-                elif quad.operator == "-":
-                    return_memory[return_address] = left_memory[left_address] - right_memory[right_address]
-                elif quad.operator == "*":
-                    return_memory[return_address] = left_memory[left_address] * right_memory[right_address]
-                elif quad.operator == "/":
-                    if right_memory[right_address] == 0:
-                        raise_program_error(ProgramErrorType.ARITHMETIC_EXCEPTION, None, "Cannot divide a number by zero")
-                    return_memory[return_address] = left_memory[left_address] / right_memory[right_address]
-            elif quad.operator in [">", ">=", "<", "<=", "==", "!="]:
-                self.check_variable_initialized([(left_address, left_memory[left_address]), (right_address, right_memory[right_address])])
-                if quad.operator == ">":
-                    return_memory[return_address] = left_memory[left_address] > right_memory[right_address]
-                elif quad.operator == ">=":
-                    return_memory[return_address] = left_memory[left_address] >= right_memory[right_address]
-                elif quad.operator == "<":
-                    return_memory[return_address] = left_memory[left_address] < right_memory[right_address]
-                elif quad.operator == "<=":
-                    return_memory[return_address] = left_memory[left_address] <= right_memory[right_address]
-                elif quad.operator == "==":
-                    return_memory[return_address] = left_memory[left_address] == right_memory[right_address]
-                elif quad.operator == "!=":
-                    return_memory[return_address] = left_memory[left_address] != right_memory[right_address]
-            elif quad.operator in ["||", "&&"]:
-                self.check_variable_initialized([(left_address, left_memory[left_address]), (right_address, right_memory[right_address])])
-                if quad.operator == "||":
-                    return_memory[return_address] = left_memory[left_address] or right_memory[right_address]
-                elif quad.operator == "&&":
-                    return_memory[return_address] = left_memory[left_address] and right_memory[right_address]
-            elif quad.operator == "PRINT":
-                self.check_variable_initialized([(return_address, return_memory[return_address])])
-                value = codecs.decode(str(return_memory[return_address]), "unicode_escape")
-                print(value, end="")
-            elif quad.operator == "READ":
-                try:
-                    return_memory[return_address] = input()
-                except ValueError:
-                    raise_program_error(ProgramErrorType.INPUT_TYPE_MISMATCH, None, f"The input cannot be stored in the variable because it is not of the same type")
-            elif quad.operator == "GOTO":
-                self.check_variable_initialized([(return_address, return_memory[return_address])])
+                value = left_memory[left_address]
+                typespace.values[start:start + size] = [float(value) if v_type == "float" else value] * size
+            else:
+                typespace.values[start:start + size] = self.read_array(int(left_memory[left_address]), size)
+        elif quad.operator in ["SUM", "MIN", "MAX"]:
+            values = self.read_array(int(left_memory[left_address]), int(right_memory[right_address]))
+            if quad.operator == "SUM":
+                return_memory[return_address] = sum(values)
+            elif quad.operator == "MIN":
+                return_memory[return_address] = min(values)
+            else:
+                return_memory[return_address] = max(values)
+        elif quad.operator == "BSEARCH":
+            self.check_variable_initialized([(left_address, left_memory[left_address]), (return_address, return_memory[return_address])])
+            # The result starts with the size of the array and ends with the position of the value, or -1 if it is not found
+            values = self.read_array(int(right_memory[right_address]), return_memory[return_address])
+            position = bisect.bisect_left(values, left_memory[left_address])
+            return_memory[return_address] = position if position < len(values) and values[position] == left_memory[left_address] else -1
+        elif quad.operator == "VARG":
+            # The operands are checked by the vector operation, which leaves the errors to the loop when one is not initialized
+            for address, memory in [(left_address, left_memory), (right_address, right_memory), (return_address, return_memory)]:
+                if address is not None:
+                    self.vector_args.append(memory[address])
+        elif quad.operator in ["VMAP", "VREDUCE"]:
+            accumulator = right_memory[right_address] if right_address is not None else None
+            self.vector_results = VectorKernel.run(self, quad.operator, left_memory[left_address], accumulator, self.vector_args)
+            self.vector_args = []
+        elif quad.operator == "VOUT":
+            # The loop after a vector operation that did not run still assigns its variables
+            if self.vector_results:
+                return_memory[return_address] = self.vector_results.pop(0)
+        elif quad.operator == "PARALLEL":
+            # The profile counts every quadruple, so a profiled execution runs the iterations one by one
+            if self.workers > 1 and self.quad_counts is None:
+                ParallelLoop.run(self, left_address, right_address, return_address)
+        elif quad.operator == "GOTO":
+            self.check_variable_initialized([(return_address, return_memory[return_address])])
+            self.quadruples.instr_ptr = int(return_memory[return_address])
+        elif quad.operator == "GOTOF":
+            self.check_variable_initialized([(left_address, left_memory[left_address]), (return_address, return_memory[return_address])])
+            if not left_memory[left_address]:
+                if self.taken_counts is not None:
+                    self.taken_counts[self.quadruples.instr_ptr - 1] += 1
                 self.quadruples.instr_ptr = int(return_memory[return_address])
-            elif quad.operator == "GOTOF":
-                self.check_variable_initialized([(left_address, left_memory[left_address]), (return_address, return_memory[return_address])])
-                if not left_memory[left_address]:
-                    self.quadruples.instr_ptr = int(return_memory[return_address])
-            elif quad.operator == "VER":
-                self.check_variable_initialized([(left_address, left_memory[left_address]), (right_address, right_memory[right_address]), (return_address, return_memory[return_address])])
-                if left_memory[left_address] < right_memory[right_address] or left_memory[left_address] >= return_memory[return_address]:
-                    raise_program_error(ProgramErrorType.ARRAY_INDEX_OUT_OF_BOUNDS, None, f"The index '{left_memory[left_address]}' is outside of the valid range")
-            elif quad.operator == "PTR":
-                self.check_variable_initialized([(left_address, left_memory[left_address])])
-                return_memory.add_ptr(return_address, left_memory[left_address])
-            elif quad.operator == "ERA":
-                # Get resources from function directory and initialize temporal memory
-                f_name = self.global_memory_manager[return_address]
-                f_resources = self.function_directory.get_function_from_directory(f_name).resources
-                self.temporal_memory_manager = MemoryManager(START_FUNCTION_MEMORY, f_resources)
-            elif quad.operator == "PARAM":
-                self.check_variable_initialized([(left_address, left_memory[left_address])])
-                # Add parameters to temporal memory
-                self.temporal_memory_manager[return_address] = left_memory[left_address]
-            elif quad.operator == "GOSUB":
-                self.function_memory_stack.append((self.quadruples.instr_ptr, self.function_memory_manager))
-                self.function_memory_manager = self.temporal_memory_manager
-                # Set instruction pointer to the start of the function
-                f_name = self.global_memory_manager[return_address]
-                self.quadruples.instr_ptr = self.function_directory.get_function_from_directory(f_name).initial_quad_address
-            elif quad.operator == "ENDFUNC" or quad.operator == "ENDPROG":
-                # Clear temporal memory
-                self.temporal_memory_manager.clear_memory_values()
-                # Get previously stored function memory or use global memory
-                self.quadruples.instr_ptr, self.function_memory_manager = self.function_memory_stack.pop()
-                if len(self.function_memory_stack) == 0:
-                    return self.return_value
\ No newline at end of file
+        elif quad.operator == "GOTOT":
+            self.check_variable_initialized([(left_address, left_memory[left_address]), (return_address, return_memory[return_address])])
+            if left_memory[left_address]:
+                if self.taken_counts is not None:
+                    self.taken_counts[self.quadruples.instr_ptr - 1] += 1
+                self.quadruples.instr_ptr = int(return_memory[return_address])
+        elif quad.operator == "SWITCH":
+            self.check_variable_initialized([(left_address, left_memory[left_address])])
+            # Skip the GOTO of the default branch and jump to the GOTO of the value in the table
+            offset = left_memory[left_address] - right_memory[right_address]
+            if 0 <= offset < return_memory[return_address]:
+                self.quadruples.instr_ptr += offset + 1
+        elif quad.operator == "VER":
+            self.check_variable_initialized([(left_address, left_memory[left_address]), (right_address, right_memory[right_address]), (return_address, return_memory[return_address])])
+            if left_memory[left_address] < right_memory[right_address] or left_memory[left_address] >= return_memory[return_address]:
+                raise_program_error(ProgramErrorType.ARRAY_INDEX_OUT_OF_BOUNDS, None, f"The index '{left_memory[left_address]}' is outside of the valid range")
+        elif quad.operator == "ERA":
+            # Get resources from function directory and initialize temporal memory
+            f_name = self.global_memory_manager[return_address]
+            function = self.function_directory.get_function_from_directory(f_name)
+            self.temporal_memory_manager = MemoryManager(START_FUNCTION_MEMORY, function.resources, function.data)
+        elif quad.operator == "PARAM":
+            self.check_variable_initialized([(left_address, left_memory[left_address])])
+            # Add parameters to temporal memory
+            self.temporal_memory_manager[return_address] = left_memory[left_address]
+        elif quad.operator in ["GOSUB", "TAILCALL"]:
+            # A tail call runs the called function in place of the current one, so it returns to the same caller
+            f_name = self.global_memory_manager[return_address]
+            if self.call_function(f_name, quad.operator == "TAILCALL"):
+                return True
+        elif quad.operator == "ENDFUNC" or quad.operator == "ENDPROG":
+            if self.end_function():
+                return True
+        return False
+
+    def get_profile(self) -> ProfileData:
+        """
+        Get the execution counts of the quadruples grouped by function.
+
+        Returns:
+            ProfileData: The profile of the execution.
+        """
+        function_starts = {f_name: function.initial_quad_address for f_name, function in self.function_directory.functions.items()}
+        return ProfileData.from_execution(self.quadruples.quadruples, function_starts, self.quad_counts, self.taken_counts,
+                                          lambda quad: int(self.constant_memory_manager[quad.return_address]),
+                                          lambda quad: self.global_memory_manager[quad.return_address])